@@ -0,0 +1,57 @@
+"""Summary read and daily append cost against history length
+
+Run from the repository root:
+
+    python benchmarks/bench_aggregates.py
+
+Reads come from the rolling aggregates, so both columns should stay flat as
+the history grows from two weeks to five years.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.store import MetricsStore  # noqa: E402
+
+HISTORY_DAYS = (14, 90, 365, 5 * 365)
+N_CHANNELS = 100
+REPEATS = 200
+
+
+def build_store(days: int, seed: int = 0) -> MetricsStore:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2020-01-01', periods=days, freq='D')
+    store = MetricsStore(start_date=dates[0], channel_capacity=N_CHANNELS, day_capacity=days * 2)
+    for i in range(N_CHANNELS):
+        store.load_series(f'channel_{i}', dates, *rng.integers(100, 5000, (4, days)))
+    return store
+
+
+def per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for i in range(REPEATS):
+        fn(i)
+    return (time.perf_counter() - start) / REPEATS * 1e6
+
+
+def main():
+    print(f"{'history':>8} {'summary(7d)':>12} {'summary(90d)':>13} {'append day':>11}")
+    for days in HISTORY_DAYS:
+        store = build_store(days)
+        next_day = np.datetime64('2020-01-01') + days
+
+        read_7 = per_call_us(lambda i: store.summary(f'channel_{i % N_CHANNELS}', 7))
+        read_90 = per_call_us(lambda i: store.summary(f'channel_{i % N_CHANNELS}', 90))
+        append = per_call_us(lambda i: store.append(
+            f'channel_{i % N_CHANNELS}', next_day + i // N_CHANNELS, 1000, 50, 5000, 900))
+        print(f"{days:>7}d {read_7:>9.1f} us {read_90:>10.1f} us {append:>8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Analytics engine latency for thousands of channel/campaign series
+
+Run from the repository root:
+
+    python benchmarks/bench_analytics.py
+
+Times a full ChannelAnalytics report (trend slopes, seasonal z-score
+anomalies, pairwise correlations) over a year of daily history, plus the
+cached re-read when the data has not changed.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.analytics import ChannelAnalytics  # noqa: E402
+from channelpulse.store import MetricsStore  # noqa: E402
+
+SERIES_COUNTS = (100, 1000, 3000)
+DAYS = 365
+
+
+def build_store(n_series: int, seed: int = 0) -> MetricsStore:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2023-06-01', periods=DAYS, freq='D')
+    weekly = 1 + 0.2 * np.sin(np.arange(DAYS) * 2 * np.pi / 7)
+    trend = np.linspace(1, rng.uniform(0.7, 1.5, (n_series, 1)), DAYS, axis=1)[..., 0]
+    revenue = rng.integers(1000, 10000, (n_series, 1)) * weekly * trend * rng.normal(1, 0.1, (n_series, DAYS))
+    store = MetricsStore(start_date=dates[0], channel_capacity=n_series, day_capacity=DAYS)
+    for i in range(n_series):
+        store.load_series(f'campaign_{i}', dates, revenue[i] / 20, revenue[i] / 80, revenue[i], revenue[i] / 4)
+    return store
+
+
+def main():
+    print(f"{'series':>7} {'report':>10} {'cached':>10} {'anomalies':>10}")
+    for n_series in SERIES_COUNTS:
+        analytics = ChannelAnalytics(build_store(n_series))
+        started = time.perf_counter()
+        report = analytics.report('revenue')
+        cold_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        analytics.report('revenue')
+        cached_ms = (time.perf_counter() - started) * 1000
+        print(f"{n_series:>7} {cold_ms:>7.0f} ms {cached_ms:>7.3f} ms {len(report['anomalies']):>10}")
+
+
+if __name__ == '__main__':
+    main()
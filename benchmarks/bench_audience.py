@@ -0,0 +1,87 @@
+"""Audience sketches and multi-touch attribution: throughput, latency, accuracy
+
+Run from the repository root:
+
+    python benchmarks/bench_audience.py [--users 1000000] [--touches 1000000]
+
+Feeds ``--users`` synthetic users into channel pairs whose audiences share a
+known fraction of users, then compares the sketch estimates of reach and
+overlap with exact set counts, and the sketches' fixed memory with the
+exact sets'. It then times journey building and every attribution model on
+``--touches`` generated events.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from channelpulse.attribution import MODELS, attribute, build_journeys  # noqa: E402
+from channelpulse.audience import AudienceSketches, user_hashes  # noqa: E402
+from channelpulse.eventgen import generate_frames  # noqa: E402
+
+OVERLAPS = (0.01, 0.1, 0.5, 0.9)
+
+
+def sketch_accuracy(users: int, seed: int = 0):
+    """Sketches, a (share, true overlap, estimate, reach error, query seconds) row per pair, and updates/s"""
+    rng = np.random.default_rng(seed)
+    sketches = AudienceSketches()
+    rows, added, seconds = [], 0, 0.0
+    for i, share in enumerate(OVERLAPS):
+        ids = rng.permutation(users * 2) + i * users * 4
+        shared = int(users * share)
+        a, b = ids[:users], np.concatenate([ids[:shared], ids[users:users * 2 - shared]])
+        for channel, audience in ((f'a{i}', a), (f'b{i}', b)):
+            touches = np.repeat(audience, 2)  # every user touches twice
+            hashes = user_hashes(touches)
+            started = time.perf_counter()
+            sketches.add_hashes(np.full(len(touches), channel, dtype=object), hashes)
+            seconds += time.perf_counter() - started
+            added += len(touches)
+        started = time.perf_counter()
+        estimate = sketches.overlap(f'a{i}', f'b{i}')
+        latency = time.perf_counter() - started
+        reach_error = abs(estimate['reach'][0] - users) / users
+        rows.append((share, shared, estimate['overlap'], reach_error, latency))
+    return sketches, rows, added / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=1_000_000, help='users per channel in the accuracy pairs')
+    parser.add_argument('--touches', type=int, default=1_000_000, help='generated events for attribution')
+    args = parser.parse_args()
+
+    sketches, rows, rate = sketch_accuracy(args.users)
+    exact_bytes = args.users * 8  # a bare int64 per user, before any hash set overhead
+    per_channel = sketches.nbytes / len(sketches.channels)
+    print(f"sketch updates: {rate / 1e6:.1f} M touches/s; {per_channel / 1024:.0f} KB per channel "
+          f"vs. >= {exact_bytes / 1e6:.0f} MB for an exact set of {args.users:,} users\n")
+    print(f"{'overlap':>8} {'true':>10} {'estimate':>10} {'error %':>8} {'reach err %':>12} {'query ms':>9}")
+    for share, true, estimate, reach_error, latency in rows:
+        print(f"{share:>8.2f} {true:>10,} {estimate:>10,.0f} {abs(estimate - true) / max(true, 1) * 100:>8.1f} "
+              f"{reach_error * 100:>12.2f} {latency * 1000:>9.2f}")
+
+    frames = list(generate_frames(args.touches, users=max(args.touches // 5, 1), seed=0))
+    columns = {name: np.concatenate([frame[name].to_numpy() for frame in frames])
+               for name in ('user', 'channel', 'event', 'timestamp', 'value')}
+    started = time.perf_counter()
+    journeys = build_journeys(columns['user'], columns['channel'], columns['event'], columns['timestamp'],
+                              columns['value'])
+    print(f"\n{args.touches:,} events -> {len(journeys.converted):,} journeys, "
+          f"{len(journeys.touch_channels):,} touches in {time.perf_counter() - started:.2f} s")
+    touched = journeys.values[journeys.touch_counts > 0].sum()  # conversions with no touch go uncredited
+    for model in MODELS:
+        started = time.perf_counter()
+        credit = attribute(journeys, model)
+        print(f"{model:>10}: {(time.perf_counter() - started) * 1000:>7.1f} ms, "
+              f"credited {sum(credit.values()):,.0f} of {touched:,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Channel metadata and story templates: nested dicts vs. column storage
+
+Run from the repository root:
+
+    python benchmarks/bench_catalog.py
+
+Metadata is built the way it arrives from a config file or API, as fresh
+strings per channel, then held either as ``{key: {field: value}}`` dicts or
+in a ChannelCatalog; templates as a list of dicts with per-channel lists of
+ids and weights (the previous StoryIndex layout) or in a StoryIndex.
+Reports traced allocation size and the cost of the lookups the formatting
+code makes (a name by key, a full record, a name by integer id).
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.catalog import ChannelCatalog  # noqa: E402
+from channelpulse.stories import StoryIndex  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+LOOKUPS = 200_000
+ICONS = ('📱', '🔗', '📝', '🔍', '📡')
+AUDIENCES = ('Gen Z & Millennials', 'C-Suite & Professionals', 'Industry Experts', 'High-Intent Buyers')
+
+
+def channel_dicts(n: int, rng: random.Random):
+    return {f'channel_{i}': {
+        'name': f'Channel {i}',
+        'icon': ''.join([rng.choice(ICONS)]),
+        'color': f'#{rng.randrange(16):X}{rng.randrange(16):X}6{rng.randrange(4)}F1',
+        'primary_metric': ''.join(['traf', 'fic']),
+        'audience': ''.join([rng.choice(AUDIENCES)]),
+        'conversion_rate': rng.uniform(0.01, 0.1),
+        'avg_cost_per_click': rng.uniform(0, 4),
+    } for i in range(n)}
+
+
+def story_dicts(n: int, channels, rng: random.Random):
+    return [{
+        'title': f'Story {i}',
+        'content': f'Insight text for story {i} ' * 4,
+        'action': ''.join([rng.choice(('Reallocate Budget', 'Create Webinar Series', 'Setup Retargeting'))]),
+        'impact': f'+{rng.randrange(5, 60)}% conversions',
+        'channels': rng.sample(channels, rng.randint(1, 3)),
+    } for i in range(n)]
+
+
+def dict_index(stories):
+    """Templates as dicts plus per-channel id and weight lists"""
+    by_channel, weights = {}, {}
+    for story_id, story in enumerate(stories):
+        for channel in story['channels']:
+            by_channel.setdefault(channel, []).append(story_id)
+            weights.setdefault(channel, []).append(1.0 / len(story['channels']))
+    return stories, by_channel, weights
+
+
+def traced(build):
+    """Bytes still allocated by ``build()``'s result, and the result"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def per_lookup_ns(fn, keys) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - started) / len(keys) * 1e9
+
+
+def main():
+    print(f"{'channels':>9} {'dicts MB':>9} {'catalog MB':>11} {'templates MB':>13} {'index MB':>9} "
+          f"{'dict name ns':>13} {'name ns':>8} {'id name ns':>11} {'record ns':>10}")
+    for n in SIZES:
+        rng = random.Random(n)
+        dict_bytes, dicts = traced(lambda: channel_dicts(n, random.Random(n)))
+        catalog_bytes, catalog = traced(lambda: ChannelCatalog(channel_dicts(n, random.Random(n))))
+        keys = list(dicts)
+        story_bytes, _ = traced(lambda: dict_index(story_dicts(n, keys, random.Random(n))))
+        index_bytes, _ = traced(lambda: StoryIndex(story_dicts(n, keys, random.Random(n))))
+
+        sample = [rng.choice(keys) for _ in range(LOOKUPS)]
+        ids = catalog.ids(sample)
+        names = catalog.column('name')
+        dict_ns = per_lookup_ns(lambda key: dicts[key]['name'], sample)
+        name_ns = per_lookup_ns(catalog.name, sample)
+        id_ns = per_lookup_ns(names.__getitem__, ids)
+        record_ns = per_lookup_ns(catalog.info, sample)
+        print(f"{n:>9,} {dict_bytes / 1e6:9.2f} {catalog_bytes / 1e6:11.2f} {story_bytes / 1e6:13.2f} "
+              f"{index_bytes / 1e6:9.2f} {dict_ns:13.0f} {name_ns:8.0f} {id_ns:11.0f} {record_ns:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
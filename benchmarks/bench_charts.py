@@ -0,0 +1,66 @@
+"""Performance chart: payload size and build time vs. selected range
+
+Run from the repository root (needs plotly):
+
+    python benchmarks/bench_charts.py
+
+One channel holds 30 years of daily rows. For every range the chart is built
+once plotting every point (the old behaviour) and once from the resolution
+tiers with LTTB downsampling to CHART_POINTS; the downsampled payload and
+build time should stay flat while the full ones grow with the range.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.store import MetricsStore  # noqa: E402
+from channelpulse.workspace import CHART_POINTS, ChannelPulseAI  # noqa: E402
+
+YEARS = 30
+RANGES = {'30d': 30, '90d': 90, '1y': 365, '5y': 5 * 365, 'all': None}
+REPEATS = 5
+
+
+def build(workspace, days, max_points, method='lttb'):
+    """Median build-and-serialize time (s) and payload bytes, bypassing the figure cache"""
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        payload = workspace._build_performance_chart('instagram', 'revenue', days, max_points, method).to_json()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings)), len(payload)
+
+
+def main():
+    n_days = YEARS * 365
+    rng = np.random.default_rng(0)
+    trend = np.linspace(2000, 9000, n_days) * (1 + 0.2 * np.sin(np.arange(n_days) * 2 * np.pi / 7))
+    revenue = np.maximum(trend + rng.normal(0, 600, n_days), 0).astype(np.int64)
+    store = MetricsStore(day_capacity=n_days)
+    store.load_series('instagram', pd.date_range(end='2025-01-01', periods=n_days, freq='D'),
+                      revenue // 10, revenue // 100, revenue, revenue // 4)
+
+    workspace = ChannelPulseAI()
+    workspace._attach_store(store)
+    build(workspace, 30, CHART_POINTS)  # import plotly, sync tiers
+
+    print(f"{YEARS} years of daily rows, downsampled to {CHART_POINTS} points\n")
+    print(f"{'range':>6} {'full ms':>8} {'full KB':>8} {'lttb ms':>8} {'lttb KB':>8} "
+          f"{'minmax ms':>10} {'minmax KB':>10} {'resolution':>11}")
+    for label, days in RANGES.items():
+        full_seconds, full_bytes = build(workspace, days, None)
+        lttb_seconds, lttb_bytes = build(workspace, days, CHART_POINTS)
+        minmax_seconds, minmax_bytes = build(workspace, days, CHART_POINTS, 'minmax')
+        resolution = workspace.chart_series('instagram', 'revenue', days)[2]
+        print(f"{label:>6} {full_seconds * 1000:8.1f} {full_bytes / 1024:8.1f} {lttb_seconds * 1000:8.1f} "
+              f"{lttb_bytes / 1024:8.1f} {minmax_seconds * 1000:10.1f} {minmax_bytes / 1024:10.1f} {resolution:>11}")
+
+
+if __name__ == '__main__':
+    main()
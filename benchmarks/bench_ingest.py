@@ -0,0 +1,58 @@
+"""Ingestion throughput: raw events/sec from file or memory into the store
+
+Run from the repository root:
+
+    python benchmarks/bench_ingest.py [--events 1000000]
+
+Writes a seeded CSV and JSONL stream to a temporary directory, then measures
+end-to-end throughput (parse + group-by + store update) and the applier alone.
+The target is at least 100k events/sec on one core.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.eventgen import generate_events, write_events  # noqa: E402
+from channelpulse.ingest import IngestionPipeline  # noqa: E402
+from channelpulse.store import MetricsStore  # noqa: E402
+
+CHANNELS = [f'channel_{i}' for i in range(100)]
+
+
+def run(label: str, source, n_events: int):
+    pipeline = IngestionPipeline(MetricsStore()).start()
+    started = time.perf_counter()
+    source(pipeline)
+    pipeline.flush()
+    elapsed = time.perf_counter() - started
+    stats = pipeline.stats()
+    pipeline.stop()
+    print(f"{label:<16} {n_events / elapsed:>12,.0f} events/s  "
+          f"(applier alone {stats['events_per_second']:,.0f} events/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=1_000_000)
+    args = parser.parse_args()
+    options = dict(channels=CHANNELS, days=7, seed=7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'events.csv')
+        jsonl_path = os.path.join(tmp, 'events.jsonl')
+        write_events(csv_path, args.events, **options)
+        write_events(jsonl_path, args.events, **options)
+
+        batches = list(generate_events(args.events, **options))
+        run('in-memory', lambda p: p.ingest(batches), args.events)
+        run('csv file', lambda p: p.ingest_file(csv_path), args.events)
+        run('jsonl file', lambda p: p.ingest_file(jsonl_path), args.events)
+
+
+if __name__ == '__main__':
+    main()
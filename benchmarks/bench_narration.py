@@ -0,0 +1,58 @@
+"""Voice narration: time to first audio and total time, cold vs. cached
+
+Run from the repository root:
+
+    python benchmarks/bench_narration.py [--realtime-factor 0.3]
+
+Narrates every default story template three ways: synthesizing the whole
+script before anything can play, streamed sentence by sentence into an
+empty audio cache, and again from that (temporary) disk cache.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.narration import AudioCache, Narrator, ToneSynthesizer  # noqa: E402
+from channelpulse.workspace import ChannelPulseAI  # noqa: E402
+
+
+def narrate(narrator: Narrator, insight) -> tuple:
+    """(seconds to the first chunk, seconds to the last, seconds of audio)"""
+    started = time.perf_counter()
+    first, samples = None, 0
+    for chunk in narrator.stream(insight):
+        if first is None:
+            first = time.perf_counter() - started
+        samples += len(chunk)
+    return first, time.perf_counter() - started, samples / narrator.sample_rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--realtime-factor', type=float, default=0.3)
+    args = parser.parse_args()
+
+    workspace = ChannelPulseAI(seed=0)
+    with tempfile.TemporaryDirectory() as directory:
+        synthesizer = ToneSynthesizer(realtime_factor=args.realtime_factor)
+        narrator = Narrator(synthesizer, AudioCache(directory))
+        print(f"{'story':<36} {'audio s':>8} {'whole ms':>9} {'cold first ms':>14} {'cold total ms':>14} "
+              f"{'cached first ms':>16} {'cached total ms':>16}")
+        for insight in workspace.ai_stories:
+            started = time.perf_counter()
+            synthesizer.synthesize(workspace.get_voice_script(insight))
+            whole = time.perf_counter() - started
+            cold_first, cold_total, audio = narrate(narrator, insight)
+            warm_first, warm_total, _ = narrate(narrator, insight)
+            print(f"{insight['title'][:36]:<36} {audio:>8.1f} {whole * 1000:>9.0f} {cold_first * 1000:>14.1f} "
+                  f"{cold_total * 1000:>14.0f} {warm_first * 1000:>16.2f} {warm_total * 1000:>16.2f}")
+        print(f"\naudio cache: {narrator.cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Budget optimizer: curve fitting and allocation time by channel count
+
+Run from the repository root:
+
+    python benchmarks/bench_optimizer.py [--channels 100 1000 5000] [--days 120]
+
+Fills a workspace with synthetic channels and times ``optimize_budget``
+(trailing-window reads, curve fits and the allocation) end to end, then
+checks the result: the recommended spend sums to the budget, stays within
+the per-channel bounds, and channels not held at a bound share one marginal
+ROI.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from channelpulse.datagen import populate_store  # noqa: E402
+from channelpulse.optimizer import DEFAULT_MAX_CHANGE, fit_response_curves, marginal_roi  # noqa: E402
+from channelpulse.workspace import ChannelPulseAI  # noqa: E402
+
+REPEATS = 7
+
+
+def check(workspace: ChannelPulseAI, plan) -> float:
+    """Largest relative spread of the marginal ROI among unconstrained channels"""
+    assert abs(plan.recommended.sum() - plan.current.sum()) <= 1e-6 * plan.current.sum()
+    lower, upper = plan.current * (1 - DEFAULT_MAX_CHANGE), plan.current * (1 + DEFAULT_MAX_CHANGE)
+    assert np.all(plan.recommended >= lower - 1e-9) and np.all(plan.recommended <= upper + 1e-9)
+    _, cost = workspace.store.trailing('cost', 90)
+    _, revenue = workspace.store.trailing('revenue', 90)
+    scale, elasticity, spend, _ = fit_response_curves(cost, revenue)
+    paid = spend > 0
+    marginal = marginal_roi(scale[paid], elasticity[paid], plan.recommended)
+    free = (plan.recommended > lower * (1 + 1e-6)) & (plan.recommended < upper * (1 - 1e-6))
+    if not free.any():
+        return 0.0
+    return float(np.ptp(marginal[free]) / plan.marginal_roi)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--channels', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--days', type=int, default=120)
+    args = parser.parse_args()
+
+    print(f"{'channels':>9} {'median ms':>10} {'best ms':>8} {'uplift/day':>11} {'mROI spread':>12}")
+    for channels in args.channels:
+        workspace = ChannelPulseAI()
+        workspace._attach_store(populate_store(channels, args.days, seed=3))
+        timings = []
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            plan = workspace.optimize_budget()
+            timings.append((time.perf_counter() - started) * 1000)
+        spread = check(workspace, plan)
+        print(f'{channels:>9} {statistics.median(timings):>10.1f} {min(timings):>8.1f} '
+              f'{plan.daily_uplift:>11,.0f} {spread:>12.2e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Open dashboards polling for updates: full re-render vs. change-feed diffs
+
+Run from the repository root:
+
+    python benchmarks/bench_refresh.py [--sessions 50] [--ticks 10]
+
+Every session refreshes once per tick, the way the dashboard timer does,
+while a writer appends a row to one channel on a given share of ticks.
+The full mode rebuilds and re-sends all four components every time; the diff
+mode asks ``stale_components`` and re-sends only what the writes touched. It
+reports CPU seconds and the bytes that would go over the wire (figure JSON
+and Markdown) for write rates from idle to every tick.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from channelpulse import dashboard as app  # noqa: E402
+from channelpulse.workspace import SAMPLE_DAYS, SAMPLE_START  # noqa: E402
+
+WRITE_SHARES = (0.0, 0.1, 0.5, 1.0)
+
+
+def payload_bytes(outputs) -> int:
+    total = 0
+    for output in outputs:
+        if output is None:
+            continue
+        total += len(output if isinstance(output, str) else output.to_json())
+    return total
+
+
+async def run(sessions: int, ticks: int, write_share: float, diff: bool, seed: int = 0):
+    workspace = app.pulse_ai
+    workspace.generate_sample_data()
+    workspace.insight_provider.latency = 0.0
+    rng = random.Random(seed)
+    channels = list(workspace.store.channels)
+    sources = [rng.choice(channels) for _ in range(sessions)]
+    rendered = [None] * sessions
+    next_day = np.datetime64(SAMPLE_START) + np.timedelta64(SAMPLE_DAYS, 'D')
+
+    started, sent = time.process_time(), 0
+    for tick in range(ticks):
+        if rng.random() < write_share:
+            workspace.store.append(rng.choice(channels), next_day + tick, traffic=rng.randint(1000, 5000),
+                                   conversions=100, revenue=rng.randint(5000, 20000), cost=2000)
+        for i, source in enumerate(sources):
+            if diff:
+                rendered[i], stale = app.stale_components(workspace, rendered[i], source, '30d')
+            else:
+                stale = app.DASHBOARD_COMPONENTS
+            if stale:
+                sent += payload_bytes(await app.create_dashboard_interface(source, workspace, '30d', stale))
+    return time.process_time() - started, sent
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--ticks', type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run(2, 1, 1.0, False))  # import plotly, warm the pools
+    print(f"{args.sessions} sessions x {args.ticks} ticks\n")
+    print(f"{'writes/tick':>11} {'full CPU s':>11} {'full MB':>8} {'diff CPU s':>11} {'diff MB':>8}")
+    for share in WRITE_SHARES:
+        full_cpu, full_bytes = asyncio.run(run(args.sessions, args.ticks, share, diff=False))
+        diff_cpu, diff_bytes = asyncio.run(run(args.sessions, args.ticks, share, diff=True))
+        print(f"{share:>11.1f} {full_cpu:>11.2f} {full_bytes / 1e6:>8.1f} {diff_cpu:>11.2f} {diff_bytes / 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
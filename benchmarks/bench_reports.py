@@ -0,0 +1,82 @@
+"""Batch report export: throughput and memory for growing batches
+
+Run from the repository root:
+
+    python benchmarks/bench_reports.py [--workers N] [--formats md,csv,pdf]
+
+Simulates several tenants, each with its own snapshot of 500 channels, and
+renders one report per channel. Reports/sec should hold steady as the batch
+grows and peak RSS of the parent should not grow with the batch size.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.reports import BatchReportEngine, ReportJob  # noqa: E402
+from channelpulse.snapshot import save_snapshot  # noqa: E402
+from channelpulse.store import MetricsStore  # noqa: E402
+
+N_CHANNELS = 500
+HISTORY_DAYS = 365
+TENANTS = (1, 2, 4, 8)
+
+INSIGHT = {
+    'content': 'Revenue per visitor is up week over week across paid channels.',
+    'action': 'Shift budget to the best ROI channel',
+    'impact': '+12% revenue',
+}
+
+
+def build_snapshot(path: str, seed: int):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end='2025-01-01', periods=HISTORY_DAYS, freq='D')
+    store = MetricsStore(start_date=dates[0], channel_capacity=N_CHANNELS, day_capacity=HISTORY_DAYS)
+    for i in range(N_CHANNELS):
+        store.load_series(f'channel_{i}', dates, *rng.integers(100, 5000, (4, HISTORY_DAYS)))
+    save_snapshot(store, path)
+
+
+def jobs(sources, output_dir, formats):
+    for tenant, source in enumerate(sources):
+        for i in range(N_CHANNELS):
+            yield ReportJob(source, f'channel_{i}', f'Channel {i}', INSIGHT,
+                            os.path.join(output_dir, f'tenant_{tenant}', f'channel_{i}'),
+                            formats, 7, '2025-01-01 00:00:00')
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--formats', default='md,csv,pdf')
+    args = parser.parse_args()
+    formats = tuple(args.formats.split(','))
+
+    with tempfile.TemporaryDirectory() as root:
+        sources = [os.path.join(root, f'snapshot_{t}') for t in range(max(TENANTS))]
+        for seed, source in enumerate(sources):
+            build_snapshot(source, seed)
+
+        engine = BatchReportEngine(args.workers)
+        print(f"{'reports':>8} {'seconds':>8} {'reports/s':>10} {'MB written':>11} {'parent RSS MB':>14}")
+        for tenants in TENANTS:
+            output_dir = os.path.join(root, f'out_{tenants}')
+            stats = engine.run(jobs(sources[:tenants], output_dir, formats),
+                               manifest_path=os.path.join(root, f'manifest_{tenants}.csv'))
+            print(f"{stats['reports']:>8} {stats['seconds']:>8.2f} {stats['reports_per_second']:>10.0f} "
+                  f"{stats['bytes'] / 1e6:>11.1f} {peak_rss_mb():>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Cold-start cost: regenerate vs. open a memory-mapped snapshot
+
+Run from the repository root:
+
+    python benchmarks/bench_snapshot.py
+
+For growing history lengths it times building the store in memory, saving a
+snapshot, and opening that snapshot plus serving the first summary. The last
+column should stay roughly constant however long the history is.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.snapshot import load_snapshot, save_snapshot  # noqa: E402
+from channelpulse.store import MetricsStore  # noqa: E402
+
+N_CHANNELS = 1000
+HISTORY_DAYS = (90, 365, 3 * 365, 10 * 365)
+
+
+def build_store(days: int, seed: int = 0) -> MetricsStore:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2015-01-01', periods=days, freq='D')
+    store = MetricsStore(start_date=dates[0], channel_capacity=N_CHANNELS, day_capacity=days)
+    for i in range(N_CHANNELS):
+        store.load_series(f'channel_{i}', dates, *rng.integers(100, 5000, (4, days)))
+    return store
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    print(f"{'history':>8} {'size':>9} {'build':>11} {'save':>10} {'open+summary':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for days in HISTORY_DAYS:
+            path = os.path.join(tmp, f'snapshot_{days}')
+            store, build_ms = timed(lambda: build_store(days))
+            _, save_ms = timed(lambda: save_snapshot(store, path))
+            size_mb = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1e6
+
+            _, open_ms = timed(lambda: load_snapshot(path).summary('channel_0', 7))
+            print(f"{days:>7}d {size_mb:>6.0f} MB {build_ms:>8.0f} ms {save_ms:>7.0f} ms {open_ms:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
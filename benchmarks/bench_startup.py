@@ -0,0 +1,61 @@
+"""Start-up cost of each entry point, measured in fresh interpreters
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py [--runs 5]
+
+Every row is the median wall time of a new ``python`` process doing one
+thing. Headless paths (package import, a CLI summary or report from a
+snapshot) should not pay for Gradio, Plotly or building the sample data;
+only ``serve``-style UI start-up should.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ('import channelpulse', ['-c', 'import channelpulse']),
+    ('import workspace', ['-c', 'import channelpulse.workspace']),
+    ('cli summary (snapshot)', ['-m', 'channelpulse.cli', 'summary', 'instagram', '--snapshot', '{snapshot}']),
+    ('cli report (snapshot)', ['-m', 'channelpulse.cli', 'report', '--snapshot', '{snapshot}',
+                               '--output', '{output}', '--workers', '0']),
+    ('import dashboard (UI)', ['-c', 'import channelpulse.dashboard']),
+    ('UI + data (old import)', ['-c', 'import channelpulse.dashboard as d; d.pulse_ai.store']),
+]
+
+
+def run(args, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = {'snapshot': os.path.join(scratch, 'snapshot'), 'output': os.path.join(scratch, 'reports')}
+        subprocess.run([sys.executable, '-m', 'channelpulse.cli', 'snapshot', paths['snapshot']],
+                       cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+        print(f"{'entry point':<26} {'median s':>9}")
+        for name, case in CASES:
+            seconds = run([part.format(**paths) for part in case], args.runs)
+            print(f"{name:<26} {seconds:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Per-request latency: dict of per-channel DataFrames vs. the columnar MetricsStore
+
+Run from the repository root:
+
+    python benchmarks/bench_store.py
+
+For 4, 100 and 1,000 channels it times the three cross-channel requests the
+dashboard makes (all summaries, comparison table, ROI ranking) through the
+legacy per-channel pandas loop and through one vectorized store pass.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.store import MetricsStore  # noqa: E402
+
+CHANNEL_COUNTS = (4, 100, 1000)
+DATES = pd.date_range(start='2024-01-01', end='2024-05-23', freq='D')
+REPEATS = 5
+
+
+def build_data(n_channels: int, seed: int = 0):
+    """Same synthetic history loaded into both representations"""
+    rng = np.random.default_rng(seed)
+    frames = {}
+    store = MetricsStore(start_date=DATES[0], channel_capacity=n_channels, day_capacity=len(DATES))
+    for i in range(n_channels):
+        traffic = rng.integers(1000, 5000) * (1 + rng.normal(0, 0.1, len(DATES)))
+        conversions = traffic * rng.uniform(0.04, 0.09, len(DATES))
+        revenue = conversions * rng.integers(50, 200)
+        cost = traffic * rng.uniform(0.5, 3.5, len(DATES))
+        roi = (revenue / np.maximum(cost, 1)).round(2)
+        columns = {
+            'traffic': traffic.astype(int),
+            'conversions': conversions.astype(int),
+            'revenue': revenue.astype(int),
+            'cost': cost.astype(int),
+            'roi': roi,
+        }
+        frames[f'channel_{i}'] = pd.DataFrame({'date': DATES, **columns})
+        store.load_series(f'channel_{i}', DATES, **columns)
+    return frames, store
+
+
+def legacy_summary(df: pd.DataFrame):
+    """The original get_channel_summary body, kept for comparison"""
+    latest_week = df.tail(7)
+    previous_week = df.tail(14).head(7)
+    current = {m: int(latest_week[m].sum()) for m in ('traffic', 'conversions', 'revenue', 'cost')}
+    previous = {m: int(previous_week[m].sum()) for m in ('traffic', 'conversions', 'revenue', 'cost')}
+    current['roi'] = round(latest_week['roi'].mean(), 2)
+    previous['roi'] = round(previous_week['roi'].mean(), 2)
+    changes = {
+        key: round(0 if previous[key] == 0 else (current[key] - previous[key]) / previous[key] * 100, 1)
+        for key in current
+    }
+    return {'current': current, 'changes': changes}
+
+
+def legacy_requests(frames):
+    summaries = {ch: legacy_summary(df) for ch, df in frames.items()}
+    comparison = pd.DataFrame([
+        {'Channel': ch, 'Revenue': s['current']['revenue'], 'ROI': s['current']['roi']}
+        for ch, s in summaries.items()
+    ])
+    roi = {ch: s['current']['roi'] for ch, s in summaries.items()}
+    ranking = sorted(roi, key=roi.get, reverse=True)
+    return comparison, ranking
+
+
+def store_requests(store: MetricsStore):
+    batch = store.summaries(window=7)
+    comparison = pd.DataFrame({
+        'Channel': batch['channels'],
+        'Revenue': batch['current']['revenue'],
+        'ROI': batch['current']['roi'],
+    })
+    ranking = store.roi_ranking(window=7)
+    return comparison, ranking
+
+
+def best_of(fn, *args) -> float:
+    """Best wall time in milliseconds over REPEATS runs"""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    print(f"{'channels':>9} {'dict of DataFrames':>20} {'MetricsStore':>14} {'speedup':>9}")
+    for n_channels in CHANNEL_COUNTS:
+        frames, store = build_data(n_channels)
+        legacy_ms = best_of(legacy_requests, frames)
+        store_ms = best_of(store_requests, store)
+        print(f"{n_channels:>9} {legacy_ms:>17.2f} ms {store_ms:>11.2f} ms {legacy_ms / store_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Story template selection at 10k templates: linear scan vs. StoryIndex
+
+Run from the repository root:
+
+    python benchmarks/bench_stories.py
+
+The linear scan is the original selection path (with its channel check
+fixed): filter every template by channel, then ``random.choice``.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.stories import StoryIndex  # noqa: E402
+
+N_TEMPLATES = 10_000
+N_CHANNELS = 200
+N_LOOKUPS = 10_000
+
+
+def make_templates(seed: int = 0):
+    rng = random.Random(seed)
+    channels = [f'channel_{i}' for i in range(N_CHANNELS)]
+    return [{
+        'title': f'Story {i}',
+        'content': '...',
+        'action': '...',
+        'impact': '...',
+        'channels': rng.sample(channels, rng.randint(1, 3)),
+        'weight': rng.uniform(0.5, 2.0),
+    } for i in range(N_TEMPLATES)], channels
+
+
+def linear_choice(stories, channel):
+    matching = [s for s in stories if channel in s.get('channels', [])]
+    return random.choice(matching or stories)
+
+
+def per_lookup_us(fn, channels) -> float:
+    started = time.perf_counter()
+    for i in range(N_LOOKUPS):
+        fn(channels[i % len(channels)])
+    return (time.perf_counter() - started) / N_LOOKUPS * 1e6
+
+
+def main():
+    stories, channels = make_templates()
+
+    started = time.perf_counter()
+    index = StoryIndex(stories)
+    for channel in channels:
+        index.choose(channel)  # build every alias table
+    build_ms = (time.perf_counter() - started) * 1000
+
+    linear_us = per_lookup_us(lambda ch: linear_choice(stories, ch), channels)
+    indexed_us = per_lookup_us(index.choose, channels)
+
+    started = time.perf_counter()
+    index.add({'title': 'New', 'content': '', 'action': '', 'impact': '', 'channels': [channels[0]]})
+    index.choose(channels[0])
+    add_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{N_TEMPLATES:,} templates over {N_CHANNELS} channels")
+    print(f"index build (all tables)   {build_ms:8.1f} ms")
+    print(f"linear scan per lookup     {linear_us:8.1f} us")
+    print(f"StoryIndex per lookup      {indexed_us:8.2f} us")
+    print(f"add template + first pick  {add_ms:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Tenant registry: session lookup cost and resident memory vs. total tenants
+
+Run from the repository root:
+
+    python benchmarks/bench_tenants.py
+
+Sessions are spread over a growing number of tenants, each backed by a small
+MetricsStore, while only a fixed set of them is active. Session lookups for
+resident tenants should cost the same at any scale, and resident bytes should
+stay under the budget however many tenants exist.
+"""
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse.store import MetricsStore  # noqa: E402
+from channelpulse.tenants import TenantRegistry  # noqa: E402
+
+TOTAL_TENANTS = (100, 1_000, 10_000)
+ACTIVE_TENANTS = 50
+DAYS = 90
+BUDGET = 64 * 1024 * 1024
+LOOKUPS = 200_000
+
+DATES = pd.date_range(end='2025-01-01', periods=DAYS, freq='D')
+
+
+class Workspace:
+    def __init__(self, tenant: str):
+        rng = np.random.default_rng(abs(hash(tenant)) % 2**32)
+        self.store = MetricsStore(start_date=DATES[0], day_capacity=DAYS)
+        for channel in ('instagram', 'linkedin', 'blog', 'google'):
+            self.store.load_series(channel, DATES, *rng.integers(100, 5000, (4, DAYS)))
+
+    def memory_usage(self) -> int:
+        return self.store.nbytes
+
+
+def main():
+    print(f"{'tenants':>8} {'loads':>7} {'evictions':>10} {'resident':>9} {'resident MB':>12} {'lookup ns':>10}")
+    for total in TOTAL_TENANTS:
+        registry = TenantRegistry(Workspace, memory_budget=BUDGET)
+        for session in range(total):
+            registry.bind(session, f'tenant-{session}')
+        # Every tenant is opened once, then traffic concentrates on the active set
+        for session in range(total):
+            registry.for_session(session)
+        active = random.sample(range(total), min(ACTIVE_TENANTS, total))
+        for session in active:
+            registry.for_session(session)
+
+        sessions = [random.choice(active) for _ in range(LOOKUPS)]
+        started = time.perf_counter()
+        for session in sessions:
+            registry.for_session(session)
+        per_lookup = (time.perf_counter() - started) / LOOKUPS
+
+        stats = registry.stats()
+        print(f"{total:>8} {stats['loads']:>7} {stats['evictions']:>10} {stats['resident']:>9} "
+              f"{stats['resident_bytes'] / 1e6:>12.1f} {per_lookup * 1e9:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
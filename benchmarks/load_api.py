@@ -0,0 +1,141 @@
+"""Load test: sustained requests/sec against the JSON API
+
+Run from the repository root (needs uvicorn):
+
+    python benchmarks/load_api.py [--connections 64] [--seconds 10] [--revalidate 0.5]
+
+Starts the API in-process on a free port and drives it over keep-alive
+HTTP/1.1 connections with a mix of summary, series, comparison, analytics,
+insight and chart requests, all accepting gzip. ``--revalidate`` is the
+share of requests sent with the last ETag seen for that URL; a background
+writer appends a day of data every second so some of them miss. Reports
+throughput, latency percentiles and the status/encoding mix.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn  # noqa: E402
+
+from channelpulse.api import DashboardAPI  # noqa: E402
+from channelpulse.workspace import ChannelPulseAI  # noqa: E402
+
+CHANNELS = ('instagram', 'linkedin', 'blog', 'google')
+
+
+def request_paths():
+    paths = ['/v1/channels', '/v1/comparison?window=7', '/v1/comparison?window=28',
+             '/v1/analytics?metric=revenue', '/v1/charts/comparison']
+    for channel in CHANNELS:
+        paths += [f'/v1/summary/{channel}', f'/v1/summary/{channel}?window=28',
+                  f'/v1/series/{channel}?metric=revenue&days=90', f'/v1/insight/{channel}',
+                  f'/v1/charts/performance/{channel}']
+    return paths
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def fetch(reader, writer, path: str, etag: str = None):
+    headers = f'GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept-Encoding: gzip\r\n'
+    if etag:
+        headers += f'If-None-Match: {etag}\r\n'
+    writer.write((headers + '\r\n').encode())
+    await writer.drain()
+
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    fields = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            fields[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(fields.get('content-length', 0)))
+    return status, fields, len(body)
+
+
+async def connection(port: int, deadline: float, revalidate: float, etags: dict, samples: list, mix: Counter):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    paths = request_paths()
+    while time.perf_counter() < deadline:
+        path = random.choice(paths)
+        etag = etags.get(path) if random.random() < revalidate else None
+        started = time.perf_counter()
+        status, fields, size = await fetch(reader, writer, path, etag)
+        samples.append(time.perf_counter() - started)
+        mix[status] += 1
+        mix['gzip' if fields.get('content-encoding') == 'gzip' else 'identity'] += 1
+        mix['bytes'] += size
+        if 'etag' in fields:
+            etags[path] = fields['etag']
+    writer.close()
+
+
+def writer_thread(workspace: ChannelPulseAI, stop: threading.Event):
+    """Append a new day every second so cached responses keep going stale"""
+    day = workspace.store.dates('instagram')[-1]
+    while not stop.wait(1.0):
+        day = day + 1
+        for channel in CHANNELS:
+            workspace.store.append(channel, day, 3000, 150, 15000, 3500)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--revalidate', type=float, default=0.5)
+    args = parser.parse_args()
+
+    workspace = ChannelPulseAI()
+    workspace.insight_provider.latency = 0.05
+    workspace.store
+    port = free_port()
+    app = DashboardAPI(workspace)
+    server = start_server(app, port)
+    stop = threading.Event()
+    threading.Thread(target=writer_thread, args=(workspace, stop), daemon=True).start()
+
+    samples, mix, etags = [], Counter(), {}
+    deadline = time.perf_counter() + args.seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(connection(port, deadline, args.revalidate, etags, samples, mix)
+                           for _ in range(args.connections)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    server.should_exit = True
+
+    ordered = sorted(samples)
+    print(f"{len(samples):,} requests over {args.connections} connections in {elapsed:.1f} s "
+          f"-> {len(samples) / elapsed:,.0f} req/s")
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(f"p50 {statistics.median(ordered) * 1000:.2f} ms | p95 {p95 * 1000:.2f} ms | max {ordered[-1] * 1000:.2f} ms")
+    print(f"200: {mix[200]:,}  304: {mix[304]:,}  gzip: {mix['gzip']:,}  "
+          f"avg body {mix['bytes'] / len(samples):,.0f} B")
+    print(f"response cache: {app.responses.stats()}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
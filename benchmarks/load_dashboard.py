@@ -0,0 +1,96 @@
+"""Load test: concurrent users assembling the dashboard
+
+Run from the repository root:
+
+    python benchmarks/load_dashboard.py [--users 200] [--requests 5] [--insight-latency 0.5]
+
+Each simulated user repeatedly builds the full dashboard for a random channel
+while a background writer appends new rows so caches keep being invalidated.
+The local insight backend takes ``--insight-latency`` seconds per model call.
+Dashboard p95 should track the slowest component (the insight), not the sum
+of all four, and the insight engine should answer repeat prompts from cache.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from channelpulse import dashboard as app  # noqa: E402
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def timed(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+async def component_latencies(channel: str):
+    """Each dashboard step alone, with caches cold"""
+    app.pulse_ai.figure_cache.clear()
+    app.pulse_ai.insight_engine.clear()
+    return {
+        'summary': await timed(app._run_blocking(app.pulse_ai.get_channel_summary, channel)),
+        'performance chart': await timed(app._run_blocking(app.pulse_ai.create_performance_chart, channel)),
+        'comparison chart': await timed(app._run_blocking(app.pulse_ai.create_channel_comparison_chart)),
+        'insight': await timed(app.fetch_ai_insight(channel)),
+    }
+
+
+async def user(n_requests: int, samples: list):
+    for _ in range(n_requests):
+        channel = random.choice(list(app.pulse_ai.channels))
+        samples.append(await timed(app.create_dashboard_interface(channel)))
+
+
+async def writer(stop: asyncio.Event):
+    """Append a new day every second so cached figures keep going stale"""
+    day = app.pulse_ai.store.dates('instagram')[-1]
+    while not stop.is_set():
+        day = day + 1
+        for channel in app.pulse_ai.channels:
+            app.pulse_ai.store.append(channel, day, 3000, 150, 15000, 3500)
+        await asyncio.sleep(1.0)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=5)
+    parser.add_argument('--insight-latency', type=float, default=0.5)
+    args = parser.parse_args()
+
+    app.pulse_ai.insight_provider.latency = args.insight_latency
+    components = await component_latencies('instagram')
+    for name, seconds in components.items():
+        print(f"{name:<18} {seconds * 1000:8.1f} ms")
+    print(f"{'sum of components':<18} {sum(components.values()) * 1000:8.1f} ms")
+
+    samples, stop = [], asyncio.Event()
+    background = asyncio.create_task(writer(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(user(args.requests, samples) for _ in range(args.users)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await background
+
+    print(f"\n{args.users} users x {args.requests} dashboards in {elapsed:.1f} s "
+          f"({len(samples) / elapsed:.0f} dashboards/s)")
+    print(f"p50 {statistics.median(samples) * 1000:.1f} ms | "
+          f"p95 {percentile(samples, 0.95) * 1000:.1f} ms | max {max(samples) * 1000:.1f} ms")
+    print(f"figure cache: {app.pulse_ai.figure_cache.stats()}")
+    print(f"insight engine: {app.pulse_ai.insight_engine.stats()}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
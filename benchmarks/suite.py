@@ -0,0 +1,203 @@
+"""Benchmark suite over the public ChannelPulseAI paths, with JSON results and a regression gate
+
+Run from the repository root:
+
+    python benchmarks/suite.py [--channels 4 100 1000] [--days 90 365 1825]
+                               [--output results.json] [--baseline old.json] [--threshold 0.25]
+
+Every case runs on a grid of channel count x history length against a fresh
+workspace filled by ``generate_sample_data``. Caches (figures, insights,
+prompts, analytics) are cleared before each timed call, so the numbers are
+cold-path costs; the workspace is seeded and its story picks are re-seeded
+per call, so every repeat does the same work. The simulated insight round
+trip is set to zero and nothing touches the network. Cases whose optional
+dependency (plotly, gradio) is missing are skipped.
+
+Results are written as JSON (min/median/mean/max seconds per case and grid
+point, plus the environment). With ``--baseline`` each median is compared
+with the baseline's minimum, its least noisy figure: a case is a regression
+when it is slower than that by more than ``--threshold`` plus the baseline's
+own spread (median over minimum), and by more than the ``--min-delta`` noise
+floor. Regressions make the run exit with status 1.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from channelpulse.workspace import ChannelPulseAI  # noqa: E402
+
+CHANNEL_COUNTS = (4, 100, 1000)
+HISTORY_DAYS = (90, 365, 1825)
+REPEATS = 11
+DEFAULT_THRESHOLD = 0.25
+# Medians closer than this (seconds) are never reported as regressions
+DEFAULT_MIN_DELTA = 0.002
+CHANNEL = 'instagram'
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[ChannelPulseAI, int, int], object]
+    requires: Tuple[str, ...] = ()
+
+
+def _generate_sample_data(workspace: ChannelPulseAI, channels: int, days: int):
+    workspace.generate_sample_data(days=days, n_channels=channels)
+
+
+def _export_report(workspace: ChannelPulseAI, channels: int, days: int):
+    from channelpulse.dashboard import export_report
+    return export_report(CHANNEL, workspace)
+
+
+def _dashboard(workspace: ChannelPulseAI, channels: int, days: int):
+    from channelpulse.dashboard import create_dashboard_interface
+    return asyncio.run(create_dashboard_interface(CHANNEL, workspace, 'all'))
+
+
+CASES = [
+    Case('generate_sample_data', _generate_sample_data),
+    Case('get_channel_summary', lambda workspace, channels, days: workspace.get_channel_summary(CHANNEL)),
+    Case('create_performance_chart',
+         lambda workspace, channels, days: workspace.create_performance_chart(CHANNEL, 'revenue', None),
+         ('plotly',)),
+    Case('create_channel_comparison_chart',
+         lambda workspace, channels, days: workspace.create_channel_comparison_chart(), ('plotly',)),
+    Case('generate_ai_insight', lambda workspace, channels, days: workspace.generate_ai_insight(CHANNEL)),
+    Case('export_report', _export_report, ('gradio',)),
+    Case('create_dashboard_interface', _dashboard, ('gradio', 'plotly')),
+]
+
+
+def drop_caches(workspace: ChannelPulseAI):
+    """Forget everything derived from the data so the next call recomputes it
+
+    Rolling aggregates are maintained on write rather than cached, so they
+    stay; the store's version is left alone so nothing looks like new data.
+    """
+    workspace.clear_caches()
+    workspace.story_rng.seed(workspace.seed)
+
+
+def prepared_workspace(channels: int, days: int) -> ChannelPulseAI:
+    workspace = ChannelPulseAI(seed=0)
+    workspace.insight_provider.latency = 0.0
+    workspace.generate_sample_data(days=days, n_channels=channels)
+    return workspace
+
+
+def measure(case: Case, channels: int, days: int, repeats: int) -> Dict:
+    workspace = prepared_workspace(channels, days)
+    case.run(workspace, channels, days)  # warm-up: imports, lazy tiers
+    timings = []
+    for _ in range(repeats):
+        drop_caches(workspace)
+        started = time.perf_counter()
+        case.run(workspace, channels, days)
+        timings.append(time.perf_counter() - started)
+    return {
+        'name': case.name, 'channels': channels, 'days': days, 'repeats': repeats,
+        'min': min(timings), 'median': statistics.median(timings),
+        'mean': statistics.fmean(timings), 'max': max(timings),
+    }
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float, min_delta: float) -> List[Dict]:
+    """Results whose median regressed past the noise-adjusted threshold against the baseline's minimum"""
+    previous = {(row['name'], row['channels'], row['days']): row for row in baseline['results']}
+    regressions = []
+    for row in results:
+        before = previous.get((row['name'], row['channels'], row['days']))
+        if before is None:
+            continue
+        best = before['min']
+        row['baseline'] = best
+        row['change'] = row['median'] / best - 1 if best else 0.0
+        # A noisy baseline (median well above its minimum) earns a wider margin
+        row['tolerance'] = threshold + (before['median'] / best - 1 if best else 0.0)
+        if row['change'] > row['tolerance'] and row['median'] - best > min_delta:
+            regressions.append(row)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--channels', type=int, nargs='+', default=list(CHANNEL_COUNTS))
+    parser.add_argument('--days', type=int, nargs='+', default=list(HISTORY_DAYS))
+    parser.add_argument('--cases', nargs='+', choices=[case.name for case in CASES],
+                        default=[case.name for case in CASES])
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed fractional slowdown of the median against the baseline's minimum, "
+                             "before adding the baseline's spread (default 0.25)")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA)
+    args = parser.parse_args(argv)
+
+    results, skipped = [], []
+    print(f"{'case':<32} {'channels':>8} {'days':>6} {'median ms':>10} {'min ms':>8}")
+    for case in CASES:
+        if case.name not in args.cases:
+            continue
+        missing = [module for module in case.requires if importlib.util.find_spec(module) is None]
+        if missing:
+            skipped.append({'name': case.name, 'missing': missing})
+            print(f"{case.name:<32} skipped (needs {', '.join(missing)})")
+            continue
+        for channels in args.channels:
+            for days in args.days:
+                row = measure(case, channels, days, args.repeats)
+                results.append(row)
+                print(f"{case.name:<32} {channels:>8} {days:>6} {row['median'] * 1000:>10.2f} "
+                      f"{row['min'] * 1000:>8.2f}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta)
+        print(f"\n{len(regressions)} regression(s) beyond +{args.threshold:.0%} against {args.baseline}")
+        for row in regressions:
+            print(f"  {row['name']} [{row['channels']} channels, {row['days']} days]: "
+                  f"{row['baseline'] * 1000:.2f} -> {row['median'] * 1000:.2f} ms ({row['change']:+.0%}, "
+                  f"allowed {row['tolerance']:+.0%})")
+
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'threshold': args.threshold, 'results': results,
+                   'skipped': skipped, 'regressions': regressions}, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
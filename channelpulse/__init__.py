@@ -0,0 +1,58 @@
+"""ChannelPulse AI building blocks shared by the dashboard and batch tools
+
+Names are imported from their submodules on first access, so ``import
+channelpulse`` stays cheap and pandas, Plotly and Gradio load only when a
+feature that needs them is used.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'AudienceSketches': 'channelpulse.audience',
+    'AudioCache': 'channelpulse.narration',
+    'BatchReportEngine': 'channelpulse.reports',
+    'BudgetPlan': 'channelpulse.optimizer',
+    'ChannelAnalytics': 'channelpulse.analytics',
+    'ChannelCatalog': 'channelpulse.catalog',
+    'ChannelFrames': 'channelpulse.store',
+    'ChannelIds': 'channelpulse.catalog',
+    'ChannelInfo': 'channelpulse.catalog',
+    'ChannelPulseAI': 'channelpulse.workspace',
+    'DashboardAPI': 'channelpulse.api',
+    'EventBatch': 'channelpulse.ingest',
+    'FigureCache': 'channelpulse.figcache',
+    'HTTPInsightProvider': 'channelpulse.insights',
+    'IngestionPipeline': 'channelpulse.ingest',
+    'InsightEngine': 'channelpulse.insights',
+    'InsightProvider': 'channelpulse.insights',
+    'LocalInsightProvider': 'channelpulse.insights',
+    'MetricsStore': 'channelpulse.store',
+    'Narrator': 'channelpulse.narration',
+    'Registry': 'channelpulse.telemetry',
+    'ReportJob': 'channelpulse.reports',
+    'RollingAggregates': 'channelpulse.aggregates',
+    'SUMMARY_WINDOWS': 'channelpulse.aggregates',
+    'SlowRequestProfiler': 'channelpulse.telemetry',
+    'StoryIndex': 'channelpulse.stories',
+    'TenantRegistry': 'channelpulse.tenants',
+    'attribute': 'channelpulse.attribution',
+    'build_journeys': 'channelpulse.attribution',
+    'load_snapshot': 'channelpulse.snapshot',
+    'plan_budget': 'channelpulse.optimizer',
+    'save_snapshot': 'channelpulse.snapshot',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'channelpulse' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,180 @@
+"""Incrementally maintained rolling-window aggregates
+
+For each configured window the layer keeps, per channel, the sums of every
+column over the current window and the window before it. Appending a day
+slides those sums forward in O(1) instead of re-reading the history, so
+summary reads cost the same for a week of data as for several years.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+SUMMARY_WINDOWS = (7, 14, 28, 90)
+
+
+class RollingAggregates:
+    """Current and previous window sums per (window, channel, column)"""
+
+    def __init__(self, store, windows=SUMMARY_WINDOWS):
+        self._store = store
+        self.windows = tuple(sorted(set(int(w) for w in windows)))
+        if not self.windows or self.windows[0] < 1:
+            raise ValueError("windows must be positive day counts")
+        self._index = {w: i for i, w in enumerate(self.windows)}
+        self._spans = np.array(self.windows, dtype=np.int64)
+
+        shape = (len(self.windows), store.channel_capacity, store.n_columns)
+        self._current = np.zeros(shape, dtype=np.float64)
+        self._previous = np.zeros(shape, dtype=np.float64)
+
+    def __contains__(self, window) -> bool:
+        return window in self._index
+
+    @property
+    def nbytes(self) -> int:
+        return self._current.nbytes + self._previous.nbytes
+
+    def reserve(self, channel_capacity: int):
+        """Grow the per-channel axis to match the store"""
+        n_windows, capacity, n_columns = self._current.shape
+        if channel_capacity <= capacity:
+            return
+        pad = np.zeros((n_windows, channel_capacity - capacity, n_columns))
+        self._current = np.concatenate([self._current, pad], axis=1)
+        self._previous = np.concatenate([self._previous, pad], axis=1)
+
+    def export_state(self, n_channels: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self._current[:, :n_channels], self._previous[:, :n_channels]
+
+    def restore(self, current: np.ndarray, previous: np.ndarray):
+        """Adopt previously exported sums for the same windows"""
+        if current.shape[0] != len(self.windows) or current.shape != previous.shape:
+            raise ValueError("rolling state does not match the configured windows")
+        self._current, self._previous = current, previous
+
+    def rebuild(self, code: int):
+        """Recompute one channel's windows from the store (O(window))"""
+        ids = np.array([code])
+        for i, window in enumerate(self.windows):
+            self._current[i, code] = self._store.window_sums(window, 0, ids)[0][:, 0]
+            self._previous[i, code] = self._store.window_sums(window, window, ids)[0][:, 0]
+
+    def on_write(self, code: int, day: int, delta: np.ndarray, first: int, last: int):
+        """Fold a row written at ``day`` into the windows
+
+        ``delta`` is new-minus-old for the row and ``first``/``last`` is the
+        channel's day range before the write.
+        """
+        if first < 0 or day < first or day - last > self.windows[-1]:
+            # New channel, back-filled history or a long gap: cheaper to rebuild
+            self.rebuild(code)
+            return
+
+        if day <= last:
+            # In-place correction of an existing day
+            age = last - day
+            self._current[:, code][age < self._spans] += delta
+            self._previous[:, code][(age >= self._spans) & (age < 2 * self._spans)] += delta
+            return
+
+        # Slide every window forward one day at a time up to the new row
+        for t in range(last + 1, day + 1):
+            entering = self._store.row_values(code, np.array([t]), first)
+            leaving = self._store.row_values(code, t - self._spans, first)
+            expiring = self._store.row_values(code, t - 2 * self._spans, first)
+            self._current[:, code] += entering - leaving
+            self._previous[:, code] += leaving - expiring
+
+    def totals(self, window: int, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached (current, previous) column sums shaped (n_columns, len(ids))"""
+        i = self._index[window]
+        return self._current[i, ids].T, self._previous[i, ids].T
+
+
+# Coarser resolutions kept next to the daily rows, finest first: name -> days per bucket
+RESOLUTION_TIERS = (('weekly', 7), ('4-weekly', 28))
+# Day 0 of the epoch (1970-01-01) is a Thursday; shifting by 3 starts buckets on Mondays
+_EPOCH_MONDAY = 3
+
+
+class ResolutionTiers:
+    """Per-channel column sums over fixed calendar buckets (weeks by default)
+
+    Buckets are aligned to Mondays so they do not move as data is appended.
+    Appends fold their delta into one bucket per tier; bulk loads and origin
+    shifts only mark channels stale, and a stale channel is re-bucketed the
+    next time it is read.
+    """
+
+    def __init__(self, store, tiers=RESOLUTION_TIERS):
+        self._store = store
+        self.tiers = dict(tiers)
+        if any(days < 2 for days in self.tiers.values()):
+            raise ValueError("tiers must bucket at least two days")
+        self._stale = np.ones(store.channel_capacity, dtype=bool)
+        self.realign()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(sums.nbytes for sums in self._sums.values()) + self._stale.nbytes
+
+    def realign(self):
+        """Re-anchor buckets after the store's first day changes; every channel goes stale"""
+        start = self._store.start_date
+        epoch_day = 0 if start is None else int(start.astype(np.int64))
+        self._phase = {name: (epoch_day + _EPOCH_MONDAY) % days for name, days in self.tiers.items()}
+        self._sums = {name: self._allocate(name, self._store.channel_capacity, self._store.day_capacity)
+                      for name in self.tiers}
+        self._stale[:] = True
+
+    def _allocate(self, name: str, channels: int, days: int) -> np.ndarray:
+        n_buckets = (days + self._phase[name]) // self.tiers[name] + 1
+        return np.zeros((self._store.n_columns, channels, n_buckets), dtype=np.float64)
+
+    def reserve(self, channel_capacity: int, day_capacity: int):
+        """Grow to match the store's backing arrays"""
+        for name, sums in self._sums.items():
+            grown = self._allocate(name, channel_capacity, day_capacity)
+            grown[:, :sums.shape[1], :sums.shape[2]] = sums
+            self._sums[name] = grown
+        if channel_capacity > len(self._stale):
+            self._stale = np.concatenate([self._stale, np.ones(channel_capacity - len(self._stale), dtype=bool)])
+
+    def mark_stale(self, code: int):
+        self._stale[code] = True
+
+    def on_write(self, code: int, day: int, delta: np.ndarray):
+        """Fold a single-row change into each tier's bucket"""
+        if self._stale[code]:
+            return
+        for name, days in self.tiers.items():
+            self._sums[name][:, code, (day + self._phase[name]) // days] += delta
+
+    def _sync(self, code: int):
+        first, last = self._store.day_range(code)
+        days = np.arange(first, last + 1)
+        rows = self._store.row_values(code, days, first).T
+        for name, bucket_days in self.tiers.items():
+            sums = self._sums[name]
+            buckets = (days + self._phase[name]) // bucket_days
+            sums[:, code] = 0
+            for column, values in enumerate(rows):
+                sums[column, code] = np.bincount(buckets, weights=values, minlength=sums.shape[2])
+        self._stale[code] = False
+
+    def series(self, code: int, tier: str, column: int, first: int, last: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Buckets overlapping days ``first..last``: (first day of each, per-day mean)
+
+        Means are taken over the days of the bucket the channel has data for,
+        so coarse points stay on the same scale as daily values.
+        """
+        if self._stale[code]:
+            self._sync(code)
+        days, phase = self.tiers[tier], self._phase[tier]
+        lo, hi = (first + phase) // days, (last + phase) // days
+        starts = np.arange(lo, hi + 1) * days - phase
+        channel_first, channel_last = self._store.day_range(code)
+        bucket_first = np.maximum(starts, channel_first)
+        counts = np.minimum(starts + days - 1, channel_last) - bucket_first + 1
+        return np.maximum(bucket_first, first), self._sums[tier][column, code, lo:hi + 1] / counts
@@ -0,0 +1,210 @@
+"""Vectorized cross-channel analytics over the full metrics history
+
+Every function works on a (channels, days) float matrix with NaN where a
+channel has no data, so trend slopes, anomaly scores and pairwise
+correlations for thousands of series are a handful of NumPy passes.
+``ChannelAnalytics`` pulls that matrix from a MetricsStore and caches each
+report by the store's data version.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_ANOMALY_WINDOW = 28
+DEFAULT_Z_THRESHOLD = 3.0
+
+
+def trend_slopes(matrix: np.ndarray) -> np.ndarray:
+    """Least-squares slope per row (units per day), ignoring NaNs"""
+    valid = ~np.isnan(matrix)
+    x = np.broadcast_to(np.arange(matrix.shape[1], dtype=np.float64), matrix.shape)
+    y = np.where(valid, matrix, 0.0)
+    n = valid.sum(axis=1)
+
+    sum_x = np.where(valid, x, 0.0).sum(axis=1)
+    sum_y = y.sum(axis=1)
+    sum_xx = np.where(valid, x * x, 0.0).sum(axis=1)
+    sum_xy = (np.where(valid, x, 0.0) * y).sum(axis=1)
+
+    denominator = n * sum_xx - sum_x ** 2
+    return np.divide(n * sum_xy - sum_x * sum_y, denominator,
+                     out=np.zeros(len(matrix)), where=denominator > 0)
+
+
+def seasonal_residuals(matrix: np.ndarray, period: int = 7) -> np.ndarray:
+    """Remove each row's mean profile over a ``period``-day cycle (day of week)"""
+    n_rows, n_days = matrix.shape
+    phase = np.arange(n_days) % period
+
+    # Pad to whole cycles and reduce a (rows, cycles, period) view for all rows at once
+    padded = np.full((n_rows, -(-n_days // period) * period), np.nan)
+    padded[:, :n_days] = matrix
+    cycles = padded.reshape(n_rows, -1, period)
+    valid = ~np.isnan(cycles)
+    sums = np.where(valid, cycles, 0.0).sum(axis=1)
+    counts = valid.sum(axis=1)
+    profile = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    profile -= np.nanmean(np.where(counts > 0, profile, np.nan), axis=1, keepdims=True)
+
+    return matrix - profile[:, phase]
+
+
+def rolling_zscores(matrix: np.ndarray, window: int = DEFAULT_ANOMALY_WINDOW) -> np.ndarray:
+    """Z-score of each point against the trailing ``window`` days before it
+
+    NaN where fewer than half the window has data.
+    """
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    pad = np.zeros((matrix.shape[0], 1))
+    csum = np.concatenate([pad, np.cumsum(values, axis=1)], axis=1)
+    csum_sq = np.concatenate([pad, np.cumsum(values * values, axis=1)], axis=1)
+    ccount = np.concatenate([pad, np.cumsum(valid, axis=1)], axis=1)
+
+    # Trailing window [t - window, t) for every t
+    end = np.arange(matrix.shape[1])
+    start = np.maximum(end - window, 0)
+    count = ccount[:, end] - ccount[:, start]
+    total = csum[:, end] - csum[:, start]
+    total_sq = csum_sq[:, end] - csum_sq[:, start]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        variance = np.maximum(total_sq / count - mean ** 2, 0.0)
+        z = (matrix - mean) / np.sqrt(variance)
+    z[(count < max(window // 2, 2)) | (variance == 0) | ~valid] = np.nan
+    return z
+
+
+def correlation_matrix(matrix: np.ndarray, min_overlap: int = 7) -> np.ndarray:
+    """Pairwise Pearson correlation over the days both rows have data"""
+    missing = np.isnan(matrix)
+    if not missing.any():
+        # Every pair overlaps on every day: one matrix product of standardized rows
+        if matrix.shape[1] < min_overlap:
+            return np.full((len(matrix), len(matrix)), np.nan)
+        centered = matrix - matrix.mean(axis=1, keepdims=True)
+        norms = np.sqrt((centered * centered).sum(axis=1, keepdims=True))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            standardized = centered / norms
+        corr = standardized @ standardized.T
+        corr[~np.isfinite(corr)] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    valid = (~missing).astype(np.float64)
+    x = np.where(valid > 0, matrix, 0.0)
+    x2 = x * x
+
+    n = valid @ valid.T
+    sum_x = x @ valid.T          # sum of row i over days shared with row j
+    sum_y = sum_x.T
+    sum_xx = x2 @ valid.T
+    sum_yy = sum_xx.T
+    sum_xy = x @ x.T
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        numerator = n * sum_xy - sum_x * sum_y
+        denominator = np.sqrt((n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2))
+        corr = numerator / denominator
+    corr[(n < min_overlap) | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def top_pairs(corr: np.ndarray, k: int = 5) -> List[tuple]:
+    """Indices and values of the ``k`` strongest off-diagonal correlations"""
+    n = len(corr)
+    upper = np.triu(np.ones((n, n), dtype=bool), k=1) & ~np.isnan(corr)
+    strength = np.where(upper, np.abs(corr), -1.0).ravel()
+    k = min(k, int(upper.sum()))
+    if k == 0:
+        return []
+    candidates = np.argpartition(-strength, k - 1)[:k]
+    candidates = candidates[np.argsort(-strength[candidates])]
+    rows, cols = np.divmod(candidates, n)
+    return [(int(i), int(j), float(corr[i, j])) for i, j in zip(rows, cols)]
+
+
+class ChannelAnalytics:
+    """Trend, anomaly and correlation reports over a MetricsStore"""
+
+    def __init__(self, store, window: int = DEFAULT_ANOMALY_WINDOW,
+                 threshold: float = DEFAULT_Z_THRESHOLD, seasonal: bool = True):
+        self.store = store
+        self.window = window
+        self.threshold = threshold
+        self.seasonal = seasonal
+        self._lock = threading.Lock()
+        self._reports: Dict[str, tuple] = {}
+
+    def report(self, column: str = 'revenue', recent_days: int = 7, top_k: int = 5) -> Dict:
+        """Analytics for one column, recomputed only when the store changes"""
+        version = self.store.version
+        with self._lock:
+            cached = self._reports.get(column)
+            if cached is not None and cached[0] == (version, recent_days, top_k):
+                return cached[1]
+
+        report = self._compute(column, recent_days, top_k)
+        with self._lock:
+            self._reports[column] = ((version, recent_days, top_k), report)
+        return report
+
+    def clear(self):
+        with self._lock:
+            self._reports.clear()
+
+    def _compute(self, column: str, recent_days: int, top_k: int) -> Dict:
+        channels, start, matrix = self.store.aligned(column)
+        if not channels:
+            return {'channels': [], 'rising': None, 'falling': None, 'slopes': {},
+                    'trend_pct_per_day': {}, 'anomalies': [], 'correlations': []}
+
+        slopes = trend_slopes(matrix)
+        means = np.nanmean(matrix, axis=1)
+        relative = np.divide(slopes, np.abs(means), out=np.zeros_like(slopes), where=means != 0) * 100
+
+        residuals = seasonal_residuals(matrix) if self.seasonal else matrix
+        z = rolling_zscores(residuals, self.window)
+        flagged = np.abs(np.nan_to_num(z)) >= self.threshold
+        flagged[:, :max(matrix.shape[1] - recent_days, 0)] = False
+        rows, days = np.nonzero(flagged)
+        order = np.argsort(-np.abs(z[rows, days]))
+        anomalies = [{
+            'channel': channels[rows[i]],
+            'date': str(start + int(days[i])),
+            'value': float(matrix[rows[i], days[i]]),
+            'zscore': round(float(z[rows[i], days[i]]), 2),
+        } for i in order]
+
+        # Correlate day-over-day changes so shared growth trends do not dominate
+        correlations = [{
+            'channels': (channels[i], channels[j]),
+            'correlation': round(value, 3),
+        } for i, j, value in top_pairs(correlation_matrix(np.diff(matrix, axis=1)), top_k)]
+
+        return {
+            'channels': channels,
+            'rising': channels[int(np.argmax(relative))],
+            'falling': channels[int(np.argmin(relative))],
+            'slopes': dict(zip(channels, slopes.round(3).tolist())),
+            'trend_pct_per_day': dict(zip(channels, relative.round(3).tolist())),
+            'anomalies': anomalies,
+            'correlations': correlations,
+        }
+
+    def signals(self, column: str = 'revenue') -> Optional[Dict]:
+        """Compact headline signals for insight prompts"""
+        report = self.report(column)
+        if not report['channels']:
+            return None
+        trends = report['trend_pct_per_day']
+        rising, falling = report['rising'], report['falling']
+        return {
+            'metric': column,
+            'rising': [rising, trends[rising]],
+            'falling': [falling, trends[falling]],
+            'anomalies': report['anomalies'][:3],
+            'top_correlation': report['correlations'][0] if report['correlations'] else None,
+        }
@@ -0,0 +1,303 @@
+"""Headless JSON API over a ChannelPulseAI workspace (plain ASGI, no framework)
+
+Routes (all ``GET``, optional ``?tenant=<id>`` when a TenantRegistry is given):
+
+    /v1/channels                         channel keys and metadata
+    /v1/summary/<channel>?window=7       current window and % change
+    /v1/series/<channel>?metric=revenue&days=30&points=&method=lttb
+    /v1/comparison?window=7              every channel side by side, ROI ranking
+    /v1/analytics?metric=revenue         trends, anomalies, correlations
+    /v1/budget?budget=&window=90&max_change=0.5&limit=
+                                         recommended daily spend per paid channel
+    /v1/audience?channels=a,b            unique reach and pairwise audience overlap
+    /v1/insight/<channel>                AI insight through the insight engine
+    /v1/charts/performance/<channel>?range=30d&points=400
+                                         Plotly figure JSON (needs plotly)
+    /v1/charts/comparison                Plotly figure JSON (needs plotly)
+    /healthz, /metrics                   liveness and Prometheus text
+
+``days`` may be replaced by ``range`` (30d, 90d, 1y or all). With ``points``
+set, long series are read from a coarser resolution tier and downsampled.
+
+Every response carries an ETag derived from the data version it was computed
+from (the channel's version for per-channel routes, the store's otherwise).
+A matching ``If-None-Match`` is answered with 304 before any work is done.
+Encoded bodies, and their gzip form when the client accepts it, are kept in
+an LRU keyed by route and data version, so repeated requests cost a lookup.
+Insights are awaited on the server's event loop, so run the API in its own
+process (``channelpulse api``) rather than next to the Gradio app.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from channelpulse import telemetry
+from channelpulse.figcache import FigureCache
+from channelpulse.downsample import METHODS
+from channelpulse.optimizer import DEFAULT_FIT_WINDOW, DEFAULT_MAX_CHANGE
+from channelpulse.store import COLUMNS
+from channelpulse.workspace import CHART_POINTS, CHART_RANGES
+
+GZIP_MIN_BYTES = 512
+# Distinguishes ETags issued before a restart, when sample data is regenerated
+BOOT_ID = os.urandom(4).hex()
+
+
+class APIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Body:
+    __slots__ = ('raw', 'gzipped')
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.gzipped = None
+
+    def encoded(self, accept_gzip: bool) -> Tuple[bytes, bool]:
+        if not accept_gzip or len(self.raw) < GZIP_MIN_BYTES:
+            return self.raw, False
+        if self.gzipped is None:
+            self.gzipped = gzip.compress(self.raw, compresslevel=6)
+        return self.gzipped, True
+
+
+def _int_param(query: Dict[str, str], name: str, default: int, low: int = 1, high: int = 3650) -> int:
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise APIError(400, f"{name} must be an integer")
+    if not low <= value <= high:
+        raise APIError(400, f"{name} must be between {low} and {high}")
+    return value
+
+
+def _float_param(query: Dict[str, str], name: str, default: Optional[float], low: float,
+                 high: float) -> Optional[float]:
+    if name not in query:
+        return default
+    try:
+        value = float(query[name])
+    except ValueError:
+        raise APIError(400, f"{name} must be a number")
+    if not low <= value <= high:
+        raise APIError(400, f"{name} must be between {low:g} and {high:g}")
+    return value
+
+
+def _metric_param(query: Dict[str, str]) -> str:
+    metric = query.get('metric', 'revenue')
+    if metric not in COLUMNS:
+        raise APIError(400, f"metric must be one of {', '.join(COLUMNS)}")
+    return metric
+
+
+def _days_param(query: Dict[str, str], default: int = 30) -> Optional[int]:
+    """Trailing day count from ``range`` (None for all history) or ``days``"""
+    if 'range' in query:
+        if query['range'] not in CHART_RANGES:
+            raise APIError(400, f"range must be one of {', '.join(CHART_RANGES)}")
+        return CHART_RANGES[query['range']]
+    return _int_param(query, 'days', default, high=100_000)
+
+
+def _method_param(query: Dict[str, str]) -> str:
+    method = query.get('method', 'lttb')
+    if method not in METHODS:
+        raise APIError(400, f"method must be one of {', '.join(METHODS)}")
+    return method
+
+
+class DashboardAPI:
+    """ASGI application serving dashboard data as cached, conditional JSON"""
+
+    def __init__(self, workspace, tenants=None, cache_size: int = 4096):
+        self.workspace = workspace
+        self.tenants = tenants
+        self.responses = FigureCache(max_entries=cache_size)
+        self._routes: List[Tuple[re.Pattern, str, Callable, bool]] = [
+            # (pattern, name, handler, per-channel version)
+            (re.compile(r'^/v1/channels$'), 'channels', self._channels, False),
+            (re.compile(r'^/v1/summary/(?P<channel>[^/]+)$'), 'summary', self._summary, True),
+            (re.compile(r'^/v1/series/(?P<channel>[^/]+)$'), 'series', self._series, True),
+            (re.compile(r'^/v1/comparison$'), 'comparison', self._comparison, False),
+            (re.compile(r'^/v1/analytics$'), 'analytics', self._analytics, False),
+            (re.compile(r'^/v1/budget$'), 'budget', self._budget, False),
+            (re.compile(r'^/v1/audience$'), 'audience', self._audience, False),
+            (re.compile(r'^/v1/insight/(?P<channel>[^/]+)$'), 'insight', None, False),
+            (re.compile(r'^/v1/charts/performance/(?P<channel>[^/]+)$'), 'performance_chart',
+             self._performance_chart, True),
+            (re.compile(r'^/v1/charts/comparison$'), 'comparison_chart', self._comparison_chart, False),
+        ]
+
+    # ------------------------------------------------------------------
+    # ASGI
+    # ------------------------------------------------------------------
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        started = time.perf_counter()
+        route = 'unknown'
+        try:
+            if scope['method'] not in ('GET', 'HEAD'):
+                raise APIError(405, "Only GET is supported")
+            route, status, headers, body = await self._handle(scope)
+        except APIError as error:
+            status, headers, body = error.status, [], json.dumps({'error': str(error)}).encode()
+            headers.append((b'content-type', b'application/json'))
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': headers + [(b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+        telemetry.REGISTRY.handler_seconds.observe(time.perf_counter() - started, handler=f'api_{route}')
+
+    async def _handle(self, scope) -> Tuple[str, int, List[tuple], bytes]:
+        path = scope['path']
+        if path == '/healthz':
+            return 'healthz', 200, [(b'content-type', b'application/json')], b'{"status":"ok"}'
+        if path == '/metrics':
+            return 'metrics', 200, [(b'content-type', b'text/plain; version=0.0.4; charset=utf-8')], \
+                telemetry.REGISTRY.render().encode()
+
+        for pattern, name, handler, per_channel in self._routes:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            raise APIError(404, f"No route for {path}")
+
+        query = {key: values[-1] for key, values in parse_qs(scope['query_string'].decode()).items()}
+        request_headers = dict(scope['headers'])
+        tenant = query.pop('tenant', None)
+        workspace = await self._workspace(tenant)
+        channel = match.groupdict().get('channel')
+
+        store = workspace.store
+        if channel is not None and not store.has_data(channel):
+            raise APIError(404, f"Unknown channel: {channel}")
+        version = (workspace.generation, store.channel_version(channel) if per_channel else store.version)
+
+        canonical = '&'.join(f'{key}={value}' for key, value in sorted(query.items()))
+        etag = '"' + hashlib.sha1(
+            f'{BOOT_ID}|{tenant}|{version}|{path}?{canonical}'.encode()).hexdigest()[:24] + '"'
+        headers = [(b'etag', etag.encode()), (b'cache-control', b'no-cache'), (b'vary', b'accept-encoding')]
+
+        if_none_match = request_headers.get(b'if-none-match', b'').decode()
+        if etag in (tag.strip() for tag in if_none_match.split(',')) or if_none_match.strip() == '*':
+            return name, 304, headers, b''
+
+        key = (tenant, path, canonical)
+        if handler is None:
+            body = await self._insight_body(workspace, key, version, channel)
+        else:
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(
+                None, self.responses.get, key, version,
+                lambda: _Body(self._encode(handler(workspace, channel, query))))
+
+        accept_gzip = b'gzip' in request_headers.get(b'accept-encoding', b'')
+        payload, gzipped = body.encoded(accept_gzip)
+        headers.append((b'content-type', b'application/json'))
+        if gzipped:
+            headers.append((b'content-encoding', b'gzip'))
+        return name, 200, headers, payload
+
+    async def _workspace(self, tenant: Optional[str]):
+        if tenant is None:
+            workspace = self.workspace
+        elif self.tenants is None:
+            raise APIError(400, "This server has no tenants")
+        else:
+            try:
+                workspace = await asyncio.get_running_loop().run_in_executor(None, self.tenants.get, tenant)
+            except ValueError as error:
+                raise APIError(400, str(error))
+            except LookupError as error:
+                raise APIError(404, str(error))
+        if not workspace.loaded:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: workspace.store)
+        return workspace
+
+    async def _insight_body(self, workspace, key, version, channel) -> _Body:
+        # The insight engine caches by prompt; the body cache only saves re-encoding
+        insight = await workspace.generate_ai_insight_async(channel)
+        return self.responses.get(key, version, lambda: _Body(self._encode(insight)))
+
+    @staticmethod
+    def _encode(payload) -> bytes:
+        if isinstance(payload, str):  # already serialized, e.g. figure JSON
+            return payload.encode()
+        return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str).encode()
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+    def _channels(self, workspace, channel, query) -> Dict:
+        info = workspace.channels.info
+        return {'channels': [{'key': key, **info(key).to_dict()} for key in workspace.store.channels]}
+
+    def _summary(self, workspace, channel, query) -> Dict:
+        window = _int_param(query, 'window', 7)
+        summary = workspace.get_channel_summary(channel, window=window)
+        return {'channel': channel, 'window': window, **summary}
+
+    def _series(self, workspace, channel, query) -> Dict:
+        metric = _metric_param(query)
+        days = _days_param(query)
+        points = _int_param(query, 'points', 0, low=3, high=100_000) if 'points' in query else None
+        dates, values, resolution = workspace.chart_series(channel, metric, days, points, _method_param(query))
+        return {'channel': channel, 'metric': metric, 'resolution': resolution,
+                'dates': dates.astype(str).tolist(), 'values': values.tolist()}
+
+    def _comparison(self, workspace, channel, query) -> Dict:
+        window = _int_param(query, 'window', 7)
+        batch = workspace.store.summaries(window=window)
+        return {
+            'window': window,
+            'channels': batch['channels'],
+            'current': {column: values.tolist() for column, values in batch['current'].items()},
+            'changes': {column: values.tolist() for column, values in batch['changes'].items()},
+            'roi_ranking': workspace.store.roi_ranking(window),
+        }
+
+    def _analytics(self, workspace, channel, query) -> Dict:
+        return workspace.analytics.report(_metric_param(query))
+
+    def _budget(self, workspace, channel, query) -> Dict:
+        limit = _int_param(query, 'limit', 0, low=1, high=1_000_000) if 'limit' in query else None
+        try:
+            plan = workspace.optimize_budget(_float_param(query, 'budget', None, 0, float('inf')),
+                                             _int_param(query, 'window', DEFAULT_FIT_WINDOW),
+                                             _float_param(query, 'max_change', DEFAULT_MAX_CHANGE, 0, 1))
+        except ValueError as error:
+            raise APIError(400, str(error))
+        return plan.to_dict(limit)
+
+    def _audience(self, workspace, channel, query) -> Dict:
+        channels = query['channels'].split(',') if query.get('channels') else None
+        return workspace.audience_overlap(channels)
+
+    def _performance_chart(self, workspace, channel, query) -> str:
+        points = _int_param(query, 'points', CHART_POINTS, low=3, high=10_000)
+        return workspace.create_performance_chart(channel, _metric_param(query), _days_param(query), as_json=True,
+                                                  max_points=points, method=_method_param(query))
+
+    def _comparison_chart(self, workspace, channel, query) -> str:
+        return workspace.create_channel_comparison_chart(_int_param(query, 'window', 7), as_json=True)
@@ -0,0 +1,182 @@
+"""Per-channel unique reach and audience overlap from probabilistic sketches
+
+Each channel keeps two fixed-size sketches of the users who touched it,
+whatever the number of users:
+
+- a HyperLogLog (2 ** ``precision`` one-byte registers, 16 KB at the
+  default precision 14, about 0.8% standard error) for unique reach;
+- a one-permutation MinHash (``minhash_bins`` 64-bit minimums, 8 KB) for
+  the Jaccard similarity between two channels' audiences (standard error
+  about ``sqrt(J * (1 - J) / 1024)``).
+
+The overlap of two channels is ``J / (1 + J) * (reach_a + reach_b)``, which
+follows from ``J = |A & B| / |A | B|``; it stays accurate for small overlaps,
+where HyperLogLog inclusion-exclusion would drown in the two reach errors.
+Updates hash a whole batch of user ids at once and fold it into the
+registers with ``np.maximum.at`` / ``np.minimum.at``; a pair query reads
+about 50 KB and answers in well under a millisecond.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+HLL_PRECISION = 14
+MINHASH_BINS = 1024
+_EMPTY = np.iinfo(np.uint64).max
+
+
+def user_hashes(users) -> np.ndarray:
+    """Uniform 64-bit hashes of user ids (strings or integers)"""
+    import pandas as pd
+
+    users = np.asarray(users)
+    if users.dtype.kind not in 'iu':
+        users = users.astype(object)
+    return pd.util.hash_array(users, categorize=False)
+
+
+def _hll_alpha(m: int) -> float:
+    return 0.7213 / (1 + 1.079 / m)
+
+
+class AudienceSketches:
+    """HyperLogLog and MinHash sketches of each channel's users"""
+
+    def __init__(self, precision: int = HLL_PRECISION, minhash_bins: int = MINHASH_BINS,
+                 channel_capacity: int = 4):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        if minhash_bins < 2 or minhash_bins & (minhash_bins - 1):
+            raise ValueError("minhash_bins must be a power of two")
+        self.precision = precision
+        self.minhash_bins = minhash_bins
+        self._codes: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._registers = np.zeros((channel_capacity, 1 << precision), dtype=np.uint8)
+        self._minhash = np.full((channel_capacity, minhash_bins), _EMPTY, dtype=np.uint64)
+        self._touches = np.zeros(channel_capacity, dtype=np.int64)
+        self.lock = threading.Lock()
+
+    @property
+    def channels(self) -> List[str]:
+        return list(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        return self._registers.nbytes + self._minhash.nbytes + self._touches.nbytes
+
+    def _code(self, channel: str) -> int:
+        code = self._codes.get(channel)
+        if code is None:
+            code = len(self._keys)
+            if code == len(self._registers):
+                grow = max(code, 4)
+                self._registers = np.concatenate([self._registers, np.zeros((grow, self._registers.shape[1]),
+                                                                            dtype=np.uint8)])
+                self._minhash = np.concatenate([self._minhash, np.full((grow, self.minhash_bins), _EMPTY,
+                                                                       dtype=np.uint64)])
+                self._touches = np.concatenate([self._touches, np.zeros(grow, dtype=np.int64)])
+            self._codes[channel] = code
+            self._keys.append(channel)
+        return code
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def add(self, channels, users):
+        """Record that each ``users[i]`` touched ``channels[i]``"""
+        self.add_hashes(channels, user_hashes(users))
+
+    def add_hashes(self, channels, hashes: np.ndarray):
+        import pandas as pd
+
+        channel_codes, channel_keys = pd.factorize(np.asarray(channels, dtype=object))
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        p, bins_bits = self.precision, self.minhash_bins.bit_length() - 1
+
+        # HyperLogLog: top p bits pick the register, the rank is 1 + leading zeros of the rest
+        register = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = (hashes & np.uint64((1 << (64 - p)) - 1)).astype(np.float64)
+        rank = (64 - p + 1 - np.frexp(rest)[1]).astype(np.uint8)
+        # MinHash: low bits pick the bin, the remaining bits are the value kept at its minimum
+        bucket = (hashes & np.uint64(self.minhash_bins - 1)).astype(np.int64)
+        value = hashes >> np.uint64(bins_bits)
+
+        with self.lock:
+            codes = np.array([self._code(key) for key in channel_keys], dtype=np.int64)[channel_codes]
+            np.maximum.at(self._registers.reshape(-1), codes * self._registers.shape[1] + register, rank)
+            np.minimum.at(self._minhash.reshape(-1), codes * self.minhash_bins + bucket, value)
+            self._touches += np.bincount(codes, minlength=len(self._touches))
+
+    # ------------------------------------------------------------------
+    # Estimates
+    # ------------------------------------------------------------------
+    def _estimate(self, registers: np.ndarray) -> np.ndarray:
+        """HyperLogLog cardinality for each row of ``registers``"""
+        m = registers.shape[-1]
+        raw = _hll_alpha(m) * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=-1)
+        zeros = (registers == 0).sum(axis=-1)
+        with np.errstate(divide='ignore'):
+            linear = m * np.log(m / np.maximum(zeros, 1))
+        return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+    def _jaccard(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """MinHash Jaccard estimate between rows of ``a`` and rows of ``b`` (broadcast)"""
+        filled = (a != _EMPTY) | (b != _EMPTY)
+        matches = ((a == b) & filled).sum(axis=-1)
+        with np.errstate(invalid='ignore'):
+            return np.nan_to_num(matches / filled.sum(axis=-1))
+
+    def reach(self, channel: str) -> float:
+        """Estimated unique users of one channel (0 if it has none)"""
+        with self.lock:
+            code = self._codes.get(channel)
+            return 0.0 if code is None else float(self._estimate(self._registers[code]))
+
+    def reaches(self) -> Dict[str, float]:
+        with self.lock:
+            estimates = self._estimate(self._registers[:len(self._keys)])
+            return dict(zip(self._keys, estimates.tolist()))
+
+    def overlap(self, a: str, b: str) -> Dict:
+        """Estimated reach of both channels, their union and their shared users"""
+        with self.lock:
+            codes = [self._codes.get(a), self._codes.get(b)]
+            if None in codes:
+                missing = a if codes[0] is None else b
+                raise KeyError(f"No audience data for channel {missing!r}")
+            registers = self._registers[codes]
+            jaccard = float(self._jaccard(self._minhash[codes[0]], self._minhash[codes[1]]))
+        reach_a, reach_b = self._estimate(registers).tolist()
+        union = float(self._estimate(registers.max(axis=0)))
+        shared = min(jaccard / (1 + jaccard) * (reach_a + reach_b), reach_a, reach_b)
+        return {
+            'channels': [a, b],
+            'reach': [reach_a, reach_b],
+            'union': union,
+            'overlap': shared,
+            'jaccard': jaccard,
+            # Share of the combined audience reached by both channels
+            'overlap_share': shared / union if union else 0.0,
+        }
+
+    def overlap_matrix(self, channels: Optional[Iterable[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """``(channels, matrix)`` of estimated shared users for every pair (reach on the diagonal)"""
+        with self.lock:
+            keys = list(self._keys) if channels is None else [key for key in channels if key in self._codes]
+            codes = [self._codes[key] for key in keys]
+            registers, minhash = self._registers[codes], self._minhash[codes]
+        reach = self._estimate(registers)
+        jaccard = np.empty((len(keys), len(keys)))
+        for row in range(len(keys)):  # one row at a time keeps memory at n * bins
+            jaccard[row] = self._jaccard(minhash[row], minhash)
+        matrix = np.minimum(jaccard / (1 + jaccard) * (reach[:, None] + reach[None, :]),
+                            np.minimum.outer(reach, reach))
+        np.fill_diagonal(matrix, reach)
+        return keys, matrix
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {'channels': len(self._keys), 'touches': int(self._touches.sum()), 'bytes': self.nbytes}
@@ -0,0 +1,242 @@
+"""Channel metadata as columns indexed by integer channel id
+
+``ChannelCatalog`` dictionary-encodes channel keys to dense ids (like the
+metrics store) and keeps each metadata field as one column: strings in a
+list with repeated values (icons, colors, audiences) shared through an
+intern table, and numbers in a packed ``array('d')``. Thousands of channels
+cost a few pointers each instead of a dict per channel, and hot paths that
+only need a name or a label index a list by id.
+
+``ChannelInfo`` is the per-channel record handed to formatting code. It is
+built on demand, and supports ``info['name']`` so call sites written
+against the old metadata dicts keep working.
+
+``ChannelIds`` is the key <-> id dictionary itself. A workspace creates one
+and hands it to its catalog, story index and metrics store, so a channel has
+the same integer id in all three and ids can index any of their columns.
+"""
+
+import bisect
+import threading
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+STRING_FIELDS = ('name', 'icon', 'color', 'primary_metric', 'audience')
+NUMBER_FIELDS = ('conversion_rate', 'avg_cost_per_click')
+FIELDS = STRING_FIELDS + NUMBER_FIELDS
+
+# Metadata for channels that only appear in ingested events
+DEFAULT_ICON = '📡'
+DEFAULT_COLOR = '#64748B'
+
+
+class ChannelInfo:
+    """One channel's metadata"""
+
+    __slots__ = ('key', 'id') + FIELDS
+
+    def __init__(self, key: str, id: Optional[int], name: str, icon: str, color: str, primary_metric: str,
+                 audience: str, conversion_rate: float, avg_cost_per_click: float):
+        self.key = key
+        self.id = id
+        self.name = name
+        self.icon = icon
+        self.color = color
+        self.primary_metric = primary_metric
+        self.audience = audience
+        self.conversion_rate = conversion_rate
+        self.avg_cost_per_click = avg_cost_per_click
+
+    @classmethod
+    def default(cls, key: str) -> 'ChannelInfo':
+        """Neutral metadata for a channel the catalog does not know"""
+        return cls(key, None, default_name(key), DEFAULT_ICON, DEFAULT_COLOR, 'traffic', 'Unknown', 0.0, 0.0)
+
+    @property
+    def label(self) -> str:
+        return f'{self.icon} {self.name}'
+
+    def __getitem__(self, field: str):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field: str, default=None):
+        return getattr(self, field) if field in FIELDS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return FIELDS
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self) -> str:
+        return f'ChannelInfo({self.key!r}, id={self.id})'
+
+
+def default_name(key: str) -> str:
+    return key.replace('_', ' ').title()
+
+
+class ChannelIds:
+    """Append-only channel key <-> dense integer id dictionary, shareable between components"""
+
+    def __init__(self, keys: Iterable[str] = ()):
+        # Live views for readers; only ``intern`` writes them
+        self.codes: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self._lock = threading.Lock()
+        for key in keys:
+            self.intern(key)
+
+    def intern(self, key: str) -> int:
+        """Id of ``key``, assigning the next one if it is new"""
+        code = self.codes.get(key)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(key)
+                if code is None:
+                    code = len(self.keys)
+                    self.keys.append(key)
+                    self.codes[key] = code
+        return code
+
+    def get(self, key: str) -> Optional[int]:
+        return self.codes.get(key)
+
+    def key(self, code: int) -> str:
+        return self.keys[code]
+
+    def __contains__(self, key) -> bool:
+        return key in self.codes
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class ChannelCatalog(Mapping):
+    """Read-mostly ``{key: ChannelInfo}`` mapping stored as per-field columns
+
+    Columns are indexed by the ids of ``ids`` (a private dictionary unless
+    one is shared). Ids of channels without metadata hold neutral defaults,
+    and only channels added here are members of the mapping.
+    """
+
+    def __init__(self, channels: Optional[Mapping] = None, ids: Optional[ChannelIds] = None):
+        self.channel_ids = ChannelIds() if ids is None else ids
+        # Ids of the channels with metadata here: by key, and in id order
+        self._codes: Dict[str, int] = {}
+        self._member_ids: List[int] = []
+        self._padded = 0
+        self._strings: Dict[str, List[str]] = {field: [] for field in STRING_FIELDS}
+        self._numbers: Dict[str, array] = {field: array('d') for field in NUMBER_FIELDS}
+        self._interned: Dict[str, str] = {}
+        for key, info in (channels or {}).items():
+            self.add(key, **info)
+
+    def add(self, key: str, name: Optional[str] = None, icon: str = DEFAULT_ICON, color: str = DEFAULT_COLOR,
+            primary_metric: str = 'traffic', audience: str = 'Unknown', conversion_rate: float = 0.0,
+            avg_cost_per_click: float = 0.0) -> int:
+        """Register (or overwrite) a channel's metadata and return its id"""
+        values = {'name': default_name(key) if name is None else name, 'icon': icon, 'color': color,
+                  'primary_metric': primary_metric, 'audience': audience}
+        code = self.channel_ids.intern(key)
+        self._pad()
+        if key not in self._codes:
+            self._codes[key] = code
+            bisect.insort(self._member_ids, code)
+        for field in STRING_FIELDS:
+            self._strings[field][code] = self._intern(values[field])
+        self._numbers['conversion_rate'][code] = conversion_rate
+        self._numbers['avg_cost_per_click'][code] = avg_cost_per_click
+        return code
+
+    def _pad(self):
+        """Extend the columns with defaults up to every id in the dictionary"""
+        missing = len(self.channel_ids) - self._padded
+        if missing <= 0:
+            return
+        for key in self.channel_ids.keys[self._padded:self._padded + missing]:
+            self._strings['name'].append(default_name(key))
+        for field, default in (('icon', DEFAULT_ICON), ('color', DEFAULT_COLOR), ('primary_metric', 'traffic'),
+                               ('audience', 'Unknown')):
+            self._strings[field].extend([self._intern(default)] * missing)
+        for field in NUMBER_FIELDS:
+            self._numbers[field].extend([0.0] * missing)
+        self._padded += missing
+
+    def _intern(self, value: str) -> str:
+        return self._interned.setdefault(value, value)
+
+    # ------------------------------------------------------------------
+    # Mapping
+    # ------------------------------------------------------------------
+    def __getitem__(self, key: str) -> ChannelInfo:
+        code = self._codes.get(key)
+        if code is None:
+            raise KeyError(key)
+        return self.record(code)
+
+    def __contains__(self, key) -> bool:
+        return self._codes.get(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self.channel_ids.keys
+        return (keys[code] for code in self._member_ids)
+
+    def __len__(self) -> int:
+        return len(self._member_ids)
+
+    # ------------------------------------------------------------------
+    # Id-based access
+    # ------------------------------------------------------------------
+    def id(self, key: str) -> int:
+        """Integer id of a channel with metadata, raising KeyError if unknown"""
+        code = self._codes.get(key)
+        if code is None:
+            raise KeyError(key)
+        return code
+
+    def get_id(self, key: str) -> Optional[int]:
+        return self._codes.get(key)
+
+    def ids(self, keys: Iterable[str]) -> List[Optional[int]]:
+        return [self._codes.get(key) for key in keys]
+
+    def key(self, code: int) -> str:
+        return self.channel_ids.keys[code]
+
+    def record(self, code: int) -> ChannelInfo:
+        strings, numbers = self._strings, self._numbers
+        return ChannelInfo(self.channel_ids.keys[code], code, strings['name'][code], strings['icon'][code],
+                           strings['color'][code], strings['primary_metric'][code], strings['audience'][code],
+                           numbers['conversion_rate'][code], numbers['avg_cost_per_click'][code])
+
+    def column(self, field: str):
+        """Every id's value of one field in id order, defaults where there is no metadata
+
+        A live column; do not modify.
+        """
+        self._pad()
+        return self._strings[field] if field in self._strings else self._numbers[field]
+
+    # ------------------------------------------------------------------
+    # Lookups with defaults for unknown channels
+    # ------------------------------------------------------------------
+    def info(self, key: str) -> ChannelInfo:
+        code = self._codes.get(key)
+        return ChannelInfo.default(key) if code is None else self.record(code)
+
+    def name(self, key: str) -> str:
+        code = self._codes.get(key)
+        return default_name(key) if code is None else self._strings['name'][code]
+
+    def labels(self, keys: Iterable[str]) -> List[str]:
+        """``"<icon> <name>"`` for each key, as shown on chart axes"""
+        names, icons = self._strings['name'], self._strings['icon']
+        labels = []
+        for key in keys:
+            code = self._codes.get(key)
+            labels.append(f'{DEFAULT_ICON} {default_name(key)}' if code is None else f'{icons[code]} {names[code]}')
+        return labels
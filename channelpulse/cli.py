@@ -0,0 +1,167 @@
+"""``channelpulse`` command line: serve the dashboard or run headless jobs
+
+Only ``serve`` imports Gradio. ``api`` serves the same data as JSON through
+uvicorn, and ``summary``, ``report`` (one snapshot, or every tenant's with
+``--tenant-root``) and ``snapshot`` load the metrics they need and nothing
+else, so they start in a fraction of the time the UI takes.
+``attribution`` is a batch job over a raw event file and loads no metrics.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+
+def _workspace(args):
+    from channelpulse.workspace import ChannelPulseAI
+
+    return ChannelPulseAI(snapshot_path=args.snapshot)
+
+
+def cmd_serve(args):
+    print("🚀 Initializing ChannelPulse AI...")
+    from channelpulse import dashboard, telemetry
+
+    # Optionally stream real events into the dashboard
+    if os.environ.get('CHANNELPULSE_EVENTS') or os.environ.get('CHANNELPULSE_INGEST_PORT'):
+        print("📥 Starting event ingestion...")
+        port = os.environ.get('CHANNELPULSE_INGEST_PORT')
+        dashboard.pulse_ai.start_ingestion(
+            path=os.environ.get('CHANNELPULSE_EVENTS'),
+            port=int(port) if port else None
+        )
+
+    # Optional Prometheus endpoint and slow-request flame-graph dumps
+    if os.environ.get('CHANNELPULSE_METRICS_PORT'):
+        telemetry.serve_metrics(port=int(os.environ['CHANNELPULSE_METRICS_PORT']))
+        print(f"📏 Metrics at http://0.0.0.0:{os.environ['CHANNELPULSE_METRICS_PORT']}/metrics")
+    if os.environ.get('CHANNELPULSE_PROFILE_SLOW_MS'):
+        telemetry.enable_profiler(float(os.environ['CHANNELPULSE_PROFILE_SLOW_MS']) / 1000,
+                                  output_dir=os.environ.get('CHANNELPULSE_PROFILE_DIR', 'profiles'))
+
+    app = dashboard.create_gradio_app()
+    print("✅ Dashboard ready!")
+    app.launch(
+        share=args.share,
+        server_name=args.host,
+        server_port=args.port,
+        show_error=True,
+        quiet=False
+    )
+
+
+def cmd_api(args):
+    import uvicorn
+
+    from channelpulse.api import DashboardAPI
+    from channelpulse.workspace import ChannelPulseAI, insight_provider_from_env, tenant_registry_from_env
+
+    workspace = ChannelPulseAI(snapshot_path=args.snapshot, insight_provider=insight_provider_from_env())
+    workspace.store  # load before accepting requests
+    app = DashboardAPI(workspace, tenants=tenant_registry_from_env(workspace.insight_provider))
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+def cmd_summary(args):
+    summary = _workspace(args).get_channel_summary(args.channel, window=args.window)
+    json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+def cmd_report(args):
+    channels = args.channels.split(',') if args.channels else None
+    formats = tuple(args.formats.split(','))
+    if args.tenant_root:
+        # One pool over every account's snapshot, reports under <output>/<tenant>
+        from channelpulse.workspace import export_tenant_reports
+
+        tenants = args.tenants.split(',') if args.tenants else None
+        stats = export_tenant_reports(args.tenant_root, args.output, tenants, channels, formats, args.workers)
+    else:
+        stats = _workspace(args).export_reports(args.output, channels=channels, formats=formats,
+                                                workers=args.workers)
+    print(f"Wrote {stats['reports']} reports ({stats['bytes'] / 1e6:.1f} MB) to {args.output} "
+          f"in {stats['seconds']:.2f} s ({stats['reports_per_second']:.0f} reports/s)")
+
+
+def cmd_snapshot(args):
+    from channelpulse.snapshot import save_snapshot
+
+    if args.channels:
+        # Synthetic channel_<i> data at scale, e.g. for benchmarking a large account
+        from channelpulse.datagen import populate_store
+
+        store = populate_store(args.channels, args.days, seed=args.seed)
+    else:
+        from channelpulse.workspace import ChannelPulseAI
+
+        workspace = ChannelPulseAI(seed=args.seed)
+        store = workspace.store
+    save_snapshot(store, args.path)
+    print(f"Saved {len(store)} channels to {args.path}")
+
+
+def cmd_attribution(args):
+    from channelpulse.attribution import attribute_events
+
+    result = attribute_events(args.events, models=args.models.split(','), half_life_days=args.half_life)
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog='channelpulse', description='ChannelPulse AI multi-channel insights')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='launch the Gradio dashboard')
+    serve.add_argument('--host', default='0.0.0.0')
+    serve.add_argument('--port', type=int, default=7860)
+    serve.add_argument('--share', action='store_true', help='create a public Gradio link')
+    serve.set_defaults(func=cmd_serve)
+
+    snapshot_help = 'metrics snapshot directory (created from sample data if missing)'
+    api = commands.add_parser('api', help='serve the dashboard data as a JSON API (needs uvicorn)')
+    api.add_argument('--host', default='0.0.0.0')
+    api.add_argument('--port', type=int, default=8000)
+    api.add_argument('--snapshot', default=os.environ.get('CHANNELPULSE_SNAPSHOT'), help=snapshot_help)
+    api.set_defaults(func=cmd_api)
+
+    summary = commands.add_parser('summary', help='print one channel summary as JSON')
+    summary.add_argument('channel')
+    summary.add_argument('--window', type=int, default=7)
+    summary.add_argument('--snapshot', default=os.environ.get('CHANNELPULSE_SNAPSHOT'), help=snapshot_help)
+    summary.set_defaults(func=cmd_summary)
+
+    report = commands.add_parser('report', help='export reports for every (or the given) channel')
+    report.add_argument('--output', default='reports')
+    report.add_argument('--channels', help='comma-separated channel keys')
+    report.add_argument('--formats', default='md,csv,pdf')
+    report.add_argument('--workers', type=int, default=None, help='process pool size, 0 to render in-process')
+    report.add_argument('--snapshot', default=os.environ.get('CHANNELPULSE_SNAPSHOT'), help=snapshot_help)
+    report.add_argument('--tenant-root', help='report on every tenant snapshot under this directory '
+                                              '(e.g. CHANNELPULSE_TENANT_ROOT) instead of --snapshot')
+    report.add_argument('--tenants', help='comma-separated tenant ids (default: all under --tenant-root)')
+    report.set_defaults(func=cmd_report)
+
+    snapshot = commands.add_parser('snapshot', help='write a snapshot of generated sample data')
+    snapshot.add_argument('path')
+    snapshot.add_argument('--seed', type=int, default=None, help='make the generated data reproducible')
+    snapshot.add_argument('--channels', type=int, default=0,
+                          help='number of synthetic channels (default: the four dashboard channels)')
+    snapshot.add_argument('--days', type=int, default=365, help='days of history with --channels')
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    attribution = commands.add_parser('attribution', help='credit conversion value to channels from user events')
+    attribution.add_argument('events', help='timestamp,channel,event,value,user file (.csv or .jsonl)')
+    attribution.add_argument('--models', default='linear,time_decay,markov')
+    attribution.add_argument('--half-life', type=float, default=7.0, help='days, for time_decay')
+    attribution.set_defaults(func=cmd_attribution)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,449 @@
+"""Gradio dashboard over the default workspace and per-tenant workspaces
+
+Importing this module pulls in Gradio; the CLI only does so for ``serve``.
+Workspaces are created here but load their data on first use.
+"""
+
+import asyncio
+import os
+import warnings
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import gradio as gr
+
+from channelpulse import telemetry
+from channelpulse.optimizer import DEFAULT_MAX_CHANGE as OPTIMIZER_MAX_CHANGE
+from channelpulse.reports import render_markdown
+from channelpulse.telemetry import instrument_handler, stage, timed_stage
+from channelpulse.narration import narration_script, wav_bytes
+from channelpulse.workspace import (CHART_RANGES, ChannelPulseAI, insight_provider_from_env, narrator_from_env,
+                                    tenant_registry_from_env)
+
+warnings.filterwarnings('ignore')
+
+
+# Initialize the ChannelPulse AI system
+# Set CHANNELPULSE_SNAPSHOT to a directory to persist metrics across restarts and
+# CHANNELPULSE_INSIGHT_URL to use an HTTP insight backend instead of the local stand-in
+pulse_ai = ChannelPulseAI(
+    snapshot_path=os.environ.get('CHANNELPULSE_SNAPSHOT'),
+    insight_provider=insight_provider_from_env()
+)
+telemetry.REGISTRY.register_collector(pulse_ai.telemetry_samples)
+
+# Dashboard outputs, in the order the interface returns them
+DASHBOARD_COMPONENTS = ('summary', 'performance_chart', 'comparison_chart', 'insight')
+# Open dashboards poll for data changes this often; unchanged components are not re-sent
+REFRESH_SECONDS = float(os.environ.get('CHANNELPULSE_REFRESH_SECONDS', 5))
+
+# Per-account workspaces: with CHANNELPULSE_TENANT_ROOT set, a session opened with
+# ?tenant=<id> is served by its own ChannelPulseAI persisted under <root>/<id>,
+# and idle tenants are dropped once CHANNELPULSE_TENANT_MEMORY_MB is exceeded
+tenants = tenant_registry_from_env(pulse_ai.insight_provider)
+
+# Voice assistant audio, cached on disk (CHANNELPULSE_AUDIO_CACHE) and shared by every workspace
+narrator = narrator_from_env()
+telemetry.REGISTRY.register_collector(
+    lambda: telemetry.stats_samples('channelpulse_audio_cache', 'Narration audio cache', narrator.cache.stats()))
+telemetry.REGISTRY.register_collector(
+    lambda: telemetry.stats_samples('channelpulse_narration', 'Narration synthesis', narrator.stats()))
+
+
+def workspace_for(request: gr.Request = None) -> ChannelPulseAI:
+    """Workspace serving a Gradio session: its tenant's, or the default one"""
+    if tenants is None or request is None:
+        return pulse_ai
+    tenant = tenants.tenant_for(request.session_hash)
+    if tenant is not None:
+        return tenants.get(tenant)
+    tenant = request.query_params.get('tenant')
+    if not tenant:
+        return pulse_ai
+    # Only known tenants are served (and bound), never created from the URL
+    try:
+        workspace = tenants.get(tenant)
+    except (LookupError, ValueError) as error:
+        raise gr.Error(str(error))
+    tenants.bind(request.session_hash, tenant)
+    return workspace
+
+
+def release_session(request: gr.Request):
+    """Forget a closed session's tenant binding"""
+    if tenants is not None and request is not None:
+        tenants.unbind(request.session_hash)
+
+
+async def _run_blocking(func, *args):
+    """Run a CPU-bound step on the default thread pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, telemetry.attributed(func), *args)
+
+
+async def fetch_ai_insight(source_channel: str, workspace: ChannelPulseAI = None, refresh: bool = False) -> Dict:
+    """Fetch an AI insight from the model backend without blocking the event loop"""
+    return await (workspace or pulse_ai).generate_ai_insight_async(source_channel, refresh=refresh)
+
+
+def format_summary_text(source_channel: str, summary: Dict, workspace: ChannelPulseAI = None) -> str:
+    """Render the channel summary card"""
+    channel_info = (workspace or pulse_ai).get_channel_info(source_channel)
+
+    if summary:
+        return f"""
+        ## {channel_info.label} Performance Summary
+
+        **This Week's Metrics:**
+        - 📈 Traffic: {summary['current']['traffic']:,} ({summary['changes']['traffic']:+.1f}%)
+        - 🎯 Conversions: {summary['current']['conversions']:,} ({summary['changes']['conversions']:+.1f}%)
+        - 💰 Revenue: ${summary['current']['revenue']:,} ({summary['changes']['revenue']:+.1f}%)
+        - 📊 ROI: {summary['current']['roi']}x ({summary['changes']['roi']:+.1f}%)
+
+        **Target Audience:** {channel_info.audience}
+        **Conversion Rate:** {channel_info.conversion_rate*100:.1f}%
+        """
+    return "No data available for this channel."
+
+
+def format_signals_text(dynamic_data: Dict, workspace: ChannelPulseAI = None) -> str:
+    """One-line digest of the analytics signals behind an insight"""
+    if 'rising_channel' not in dynamic_data:
+        return ""
+    signals = f"{dynamic_data['rising_channel']} revenue trending {dynamic_data['rising_trend']:+.2f}%/day"
+    anomalies = dynamic_data['anomalies']
+    if anomalies:
+        example = (workspace or pulse_ai).channels.name(anomalies[0]['channel'])
+        signals += f" · {len(anomalies)} unusual day(s) this week, e.g. {example} on {anomalies[0]['date']}"
+    return signals
+
+
+def format_insight_text(ai_insight: Dict, workspace: ChannelPulseAI = None) -> str:
+    """Render the AI insight card"""
+    text = f"""
+    ## {ai_insight['title']}
+
+    {ai_insight['content']}
+
+    **💡 Recommended Action:** {ai_insight['action']}
+    **📈 Projected Impact:** {ai_insight['impact']}
+    """
+    signals = format_signals_text(ai_insight.get('dynamic_data', {}), workspace)
+    if signals:
+        text += f"""**📡 Live Signals:** {signals}
+    """
+    return text
+
+
+async def create_dashboard_interface(source_channel: str = "instagram", workspace: ChannelPulseAI = None,
+                                     chart_range: str = '30d', components: Iterable[str] = DASHBOARD_COMPONENTS):
+    """Create the main dashboard interface
+
+    The summary, both charts and the AI insight are independent, so they run
+    concurrently and the dashboard takes as long as the slowest of them.
+    Only ``components`` are built; the others come back as None.
+    """
+    workspace = workspace or pulse_ai
+    steps = {
+        'summary': lambda: _run_blocking(timed_stage('summary', workspace.get_channel_summary), source_channel),
+        'performance_chart': lambda: _run_blocking(
+            timed_stage('performance_chart', workspace.create_performance_chart),
+            source_channel, 'revenue', CHART_RANGES[chart_range]),
+        'comparison_chart': lambda: _run_blocking(
+            timed_stage('comparison_chart', workspace.create_channel_comparison_chart)),
+        'insight': lambda: timed_stage('insight', fetch_ai_insight)(source_channel, workspace),
+    }
+    names = [name for name in DASHBOARD_COMPONENTS if name in components]
+    results = dict(zip(names, await asyncio.gather(*(steps[name]() for name in names))))
+
+    with stage('formatting'):
+        if 'summary' in results:
+            results['summary'] = format_summary_text(source_channel, results['summary'], workspace)
+        if 'insight' in results:
+            results['insight'] = format_insight_text(results['insight'], workspace)
+
+    return tuple(results.get(name) for name in DASHBOARD_COMPONENTS)
+
+
+def stale_components(workspace: ChannelPulseAI, rendered: Optional[Dict], source_channel: str,
+                     chart_range: str) -> Tuple[Dict, Set[str]]:
+    """Components a session must re-render, and the render state to remember afterwards
+
+    ``rendered`` is the state returned last time (None before the first
+    render). The source channel's summary and trend change only with that
+    channel's data; the comparison and the insight read every channel.
+    """
+    state = {'version': workspace.data_version(), 'source': source_channel, 'range': chart_range}
+    if rendered is None:
+        return state, set(DASHBOARD_COMPONENTS)
+    changed = workspace.changes_since(rendered['version'])
+    if changed is None:
+        return state, set(DASHBOARD_COMPONENTS)
+
+    stale = set()
+    if changed:
+        stale |= {'comparison_chart', 'insight'}
+    if source_channel in changed or source_channel != rendered['source']:
+        stale |= {'summary', 'performance_chart', 'insight'}
+    if chart_range != rendered['range']:
+        stale.add('performance_chart')
+    return state, stale
+
+
+async def generate_new_insight(source_channel: str, workspace: ChannelPulseAI = None):
+    """Generate a new AI insight, bypassing the cache the automatic refresh reads"""
+    ai_insight = await fetch_ai_insight(source_channel, workspace, refresh=True)
+    return format_insight_text(ai_insight, workspace)
+
+
+def implement_recommendation(insight_text: str, workspace: ChannelPulseAI = None, limit: int = 10):
+    """Budget reallocation plan behind the recommendation: the largest spend moves and their projected impact"""
+    workspace = workspace or pulse_ai
+    plan = workspace.optimize_budget()
+    if not plan.channels:
+        return "ℹ️ **No paid channels to reallocate.** Spend data is needed to recommend a budget split."
+    if plan.note:
+        return f"ℹ️ **Budget left unchanged:** {plan.note[0].upper()}{plan.note[1:]}."
+
+    rows = [
+        f"| {workspace.channels.name(move['channel'])} | ${move['current']:,.0f} | ${move['recommended']:,.0f} "
+        f"| {move['change_pct']:+.1f}% | {move['revenue_delta']:+,.0f} | {move['conversions_delta']:+,.1f} |"
+        for move in plan.moves(limit)
+    ]
+    shown = min(limit, len(plan.channels))
+    footer = f"\n\n_Top {shown} of {len(plan.channels)} moves shown._" if shown < len(plan.channels) else ""
+    return (
+        "🚀 **Budget Reallocation Plan**\n\n"
+        f"Same ${plan.recommended.sum():,.0f}/day budget across {len(plan.channels)} paid channels, "
+        f"each within ±{OPTIMIZER_MAX_CHANGE:.0%} of today's spend.\n"
+        f"**Projected revenue:** {plan.daily_uplift:+,.0f}/day ({plan.monthly_uplift:+,.0f}/month) "
+        f"at a marginal ROI of {plan.marginal_roi:.2f}x\n\n"
+        "| Channel | Daily spend | Recommended | Change | Revenue/day | Conversions/day |\n"
+        "|---|---|---|---|---|---|\n"
+        + "\n".join(rows) + footer
+    )
+
+
+def create_voice_narration(insight: Dict) -> str:
+    """Render the voice assistant's script"""
+    script = ' '.join(narration_script(insight))
+    return f"""
+    🎤 **Voice Assistant - Jatin AI:**
+
+    "{script}"
+    """
+
+
+async def stream_voice_narration(insight: Dict):
+    """WAV chunks of the narration, one sentence at a time, synthesized off the event loop"""
+    segments = narrator.stream(insight)
+    while True:
+        samples = await _run_blocking(next, segments, None)
+        if samples is None:
+            return
+        yield wav_bytes(samples, narrator.sample_rate)
+
+
+def export_report(source_channel: str, workspace: ChannelPulseAI = None):
+    """Generate and export a comprehensive report"""
+    workspace = workspace or pulse_ai
+    summary = workspace.get_channel_summary(source_channel)
+    ai_insight = workspace.generate_ai_insight(source_channel)
+
+    return render_markdown(workspace.channels.name(source_channel), summary, ai_insight,
+                           datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+# Create the Gradio interface
+def create_gradio_app():
+    with gr.Blocks(
+        theme=gr.themes.Soft(),
+        title="ChannelPulse AI - Dynamic Multi-Channel Insights",
+        css="""
+        .gradio-container {
+            max-width: 1200px !important;
+        }
+        .plot-container {
+            height: 500px !important;
+        }
+        """
+    ) as app:
+
+        gr.HTML("""
+        <div style="text-align: center; padding: 20px; margin-bottom: 20px; border-radius: 10px;
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">
+            <h1 style="color: white; margin: 0; font-size: 2.5em;">🚀 ChannelPulse AI</h1>
+            <p style="color: white; margin: 10px 0; font-size: 1.2em;">
+                Dynamic Multi-Channel Insights with AI-Driven Storytelling
+            </p>
+        </div>
+        """)
+
+        with gr.Row():
+            with gr.Column(scale=1):
+                source_selector = gr.Dropdown(
+                    choices=[
+                        ("📱 Instagram", "instagram"),
+                        ("🔗 LinkedIn", "linkedin"),
+                        ("📝 Blog/Content", "blog"),
+                        ("🔍 Google Ads", "google")
+                    ],
+                    value="instagram",
+                    label="🎯 Select Traffic Source",
+                    info="Choose your primary traffic source to see customized insights"
+                )
+
+                range_selector = gr.Radio(
+                    choices=list(CHART_RANGES),
+                    value='30d',
+                    label="📅 Trend Range"
+                )
+
+                refresh_btn = gr.Button("🔄 Refresh Dashboard", variant="primary")
+                generate_insight_btn = gr.Button("🤖 Generate New AI Insight", variant="secondary")
+                implement_btn = gr.Button("⚡ Implement Recommendation", variant="stop")
+                voice_btn = gr.Button("🎤 Voice Assistant", variant="huggingface")
+                export_btn = gr.Button("📊 Export Report")
+
+        with gr.Row():
+            with gr.Column(scale=2):
+                summary_display = gr.Markdown("Loading dashboard...")
+
+            with gr.Column(scale=1):
+                ai_insight_display = gr.Markdown("Generating AI insights...")
+
+        with gr.Row():
+            performance_plot = gr.Plot(label="📈 Channel Performance Trend")
+            comparison_plot = gr.Plot(label="📊 Cross-Channel Comparison")
+
+        with gr.Row():
+            with gr.Column():
+                voice_output = gr.Markdown(visible=False)
+                voice_audio = gr.Audio(streaming=True, autoplay=True, visible=False, label="🎧 Narration")
+                implementation_output = gr.Markdown(visible=False)
+                report_output = gr.Markdown(visible=False)
+
+        # What this session last rendered, and a poll that pushes components whose data changed
+        rendered_state = gr.State(None)
+        refresh_timer = gr.Timer(REFRESH_SECONDS)
+
+        # Event handlers (latency histograms at /metrics when CHANNELPULSE_METRICS_PORT is set)
+        @instrument_handler('update_dashboard')
+        async def update_dashboard(source, chart_range, rendered, request: gr.Request):
+            # Re-send only what the data, source or range change made stale; gr.skip() leaves the rest
+            workspace = await _run_blocking(workspace_for, request)
+            state, stale = await _run_blocking(stale_components, workspace, rendered, source, chart_range)
+            outputs = await create_dashboard_interface(source, workspace, chart_range, stale)
+            for name in DASHBOARD_COMPONENTS:
+                telemetry.REGISTRY.component_updates.inc(component=name,
+                                                         outcome='pushed' if name in stale else 'skipped')
+            if 'insight' in stale:
+                # The insight is now cached, so this prepares the narration the voice button will play
+                narrator.prepare(await fetch_ai_insight(source, workspace))
+            return (*(output if name in stale else gr.skip() for name, output in zip(DASHBOARD_COMPONENTS, outputs)),
+                    state)
+
+        @instrument_handler('generate_new_insight')
+        async def show_new_insight(source, request: gr.Request):
+            workspace = await _run_blocking(workspace_for, request)
+            insight_text = await generate_new_insight(source, workspace)
+            narrator.prepare(await fetch_ai_insight(source, workspace))
+            return insight_text
+
+        @instrument_handler('show_voice_output')
+        async def show_voice_output(source, request: gr.Request):
+            # Same prompt as the insight on screen, so this is answered from the insight cache
+            workspace = await _run_blocking(workspace_for, request)
+            insight = await fetch_ai_insight(source, workspace)
+            yield gr.update(value=create_voice_narration(insight), visible=True), gr.update(visible=True)
+            async for chunk in stream_voice_narration(insight):
+                yield gr.skip(), chunk
+
+        @instrument_handler('show_implementation')
+        def show_implementation(insight, request: gr.Request):
+            result = implement_recommendation(insight, workspace_for(request))
+            return gr.update(value=result, visible=True)
+
+        @instrument_handler('show_report')
+        def show_report(source, request: gr.Request):
+            report = export_report(source, workspace_for(request))
+            return gr.update(value=report, visible=True)
+
+        # Connect events
+        dashboard_inputs = [source_selector, range_selector, rendered_state]
+        dashboard_outputs = [summary_display, performance_plot, comparison_plot, ai_insight_display, rendered_state]
+
+        source_selector.change(
+            update_dashboard,
+            inputs=dashboard_inputs,
+            outputs=dashboard_outputs
+        )
+
+        refresh_btn.click(
+            update_dashboard,
+            inputs=dashboard_inputs,
+            outputs=dashboard_outputs
+        )
+
+        range_selector.change(
+            update_dashboard,
+            inputs=dashboard_inputs,
+            outputs=dashboard_outputs
+        )
+
+        refresh_timer.tick(
+            update_dashboard,
+            inputs=dashboard_inputs,
+            outputs=dashboard_outputs,
+            show_progress='hidden'
+        )
+
+        generate_insight_btn.click(
+            show_new_insight,
+            inputs=[source_selector],
+            outputs=[ai_insight_display]
+        )
+
+        voice_btn.click(
+            show_voice_output,
+            inputs=[source_selector],
+            outputs=[voice_output, voice_audio]
+        )
+
+        implement_btn.click(
+            show_implementation,
+            inputs=[ai_insight_display],
+            outputs=[implementation_output]
+        )
+
+        export_btn.click(
+            show_report,
+            inputs=[source_selector],
+            outputs=[report_output]
+        )
+
+        # Initialize dashboard on load
+        app.load(
+            update_dashboard,
+            inputs=dashboard_inputs,
+            outputs=dashboard_outputs
+        )
+        app.unload(release_session)
+
+        gr.HTML("""
+        <div style="text-align: center; padding: 20px; margin-top: 30px; border-top: 1px solid #e0e0e0;">
+            <h3>🌟 ChannelPulse AI Features</h3>
+            <p>
+                <strong>✅ Source-Driven UI Adaptation</strong> | <strong>✅ AI-Powered Insights</strong> |
+                <strong>✅ Voice Assistant</strong> | <strong>✅ Real-time Analytics</strong>
+            </p>
+            <p style="font-size: 0.9em; color: #666;">
+                Powered by Advanced AI • Real-world Actionable Insights • Cross-Channel Optimization
+            </p>
+        </div>
+        """)
+
+    # Async handlers only hold the event loop while awaiting, so let sessions overlap
+    app.queue(default_concurrency_limit=None)
+
+    return app
@@ -0,0 +1,243 @@
+"""Seeded, vectorized generator of channel metrics for scale testing
+
+Produces N channels x M days (or hours) of traffic, conversions, revenue,
+cost and ROI with a per-channel growth trend, weekly and yearly seasonality,
+a daily cycle for hourly data, and campaign spikes. Every value comes from a
+``numpy.random.Generator`` seeded from ``seed``, so a given seed, shape and
+``chunk_rows`` always yields the same data. Channels are generated a block
+at a time with at most ``chunk_rows`` rows in memory, and ``write_metrics``
+streams the blocks into ``.npy`` column files (or CSV), so 10^8 rows can be
+produced without holding them:
+
+    python -m channelpulse.datagen metrics/ --channels 10000 --days 10000 --seed 7
+    python -m channelpulse.datagen hourly.csv --channels 50 --days 365 --freq h
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from channelpulse.store import METRICS, MetricsStore, compute_roi
+
+# Periods per day for each supported frequency
+FREQUENCIES = {'D': 1, 'h': 24}
+ROW_COLUMNS = ('channel_id', 'timestamp') + METRICS + ('roi',)
+DEFAULT_CHUNK_ROWS = 2_000_000
+META_FILE = 'meta.json'
+
+# Campaigns: mean days between launches, duration range (days) and traffic lift range
+CAMPAIGN_EVERY_DAYS = 45
+CAMPAIGN_DAYS = (3, 15)
+CAMPAIGN_LIFT = (0.3, 2.5)
+# Share of channels with no paid spend (organic: blog, SEO, referrals)
+ORGANIC_SHARE = 0.2
+
+
+class MetricsChunk(NamedTuple):
+    """A block of whole channels: ids (k,), timestamps (periods,), (k, periods) columns"""
+    channel_ids: np.ndarray
+    timestamps: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.channel_ids) * len(self.timestamps)
+
+    def rows(self) -> Dict[str, np.ndarray]:
+        """The chunk as long-format columns, channel-major"""
+        k, periods = len(self.channel_ids), len(self.timestamps)
+        rows = {'channel_id': np.repeat(self.channel_ids, periods).astype(np.int32),
+                'timestamp': np.tile(self.timestamps, k)}
+        rows.update((name, values.ravel()) for name, values in self.columns.items())
+        return rows
+
+
+def channel_params(rng: np.random.Generator, n_channels: int, conversion_rate: Optional[Sequence[float]] = None,
+                   cost_per_click: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+    """Per-channel scale, growth, seasonality and economics, one array per parameter"""
+    organic = rng.random(n_channels) < ORGANIC_SHARE
+    params = {
+        'base_traffic': rng.lognormal(np.log(2500), 0.7, n_channels),
+        'growth_per_year': rng.normal(0.3, 0.4, n_channels),
+        'weekly_amplitude': rng.uniform(0.03, 0.25, n_channels),
+        'weekly_phase': rng.uniform(0, 2 * np.pi, n_channels),
+        'yearly_amplitude': rng.uniform(0.0, 0.3, n_channels),
+        'yearly_phase': rng.uniform(0, 2 * np.pi, n_channels),
+        'noise': rng.uniform(0.05, 0.15, n_channels),
+        'conversion_rate': rng.uniform(0.02, 0.09, n_channels),
+        'cost_per_click': np.where(organic, 0.0, rng.uniform(0.5, 4.0, n_channels)),
+        'order_value': rng.uniform(50, 200, n_channels),
+    }
+    # Given economics override the generated ones, except where they are NaN
+    for name, given in (('conversion_rate', conversion_rate), ('cost_per_click', cost_per_click)):
+        if given is not None:
+            given = np.asarray(given, dtype=np.float64)
+            params[name] = np.where(np.isnan(given), params[name], given)
+    return params
+
+
+def _campaign_lift(rng: np.random.Generator, k: int, n_days: int) -> np.ndarray:
+    """(k, n_days) traffic lift from randomly placed, overlapping campaigns"""
+    counts = rng.poisson(n_days / CAMPAIGN_EVERY_DAYS, k)
+    owners = np.repeat(np.arange(k), counts)
+    starts = rng.integers(0, max(n_days, 1), len(owners))
+    ends = np.minimum(starts + rng.integers(*CAMPAIGN_DAYS, len(owners)), n_days)
+    lifts = rng.uniform(*CAMPAIGN_LIFT, len(owners))
+    # +lift where a campaign starts, -lift where it ends; a running sum gives every active lift
+    steps = np.zeros((k, n_days + 1))
+    np.add.at(steps, (owners, starts), lifts)
+    np.add.at(steps, (owners, ends), -lifts)
+    return np.cumsum(steps[:, :-1], axis=1)
+
+
+def generate_chunks(n_channels: int, n_days: int, start: str = '2024-01-01', freq: str = 'D',
+                    seed: Optional[int] = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    conversion_rate: Optional[Sequence[float]] = None,
+                    cost_per_click: Optional[Sequence[float]] = None) -> Iterator[MetricsChunk]:
+    """Yield MetricsChunks covering channels 0..n_channels-1 over ``n_days`` at ``freq``
+
+    ``seed=None`` draws fresh entropy. ``conversion_rate`` and ``cost_per_click``
+    override the generated per-channel values (one entry per channel).
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"freq must be one of {', '.join(FREQUENCIES)}")
+    per_day = FREQUENCIES[freq]
+    periods = n_days * per_day
+    block = max(1, chunk_rows // max(periods, 1))
+    n_blocks = -(-n_channels // block)
+
+    params_seed, *block_seeds = np.random.SeedSequence(seed).spawn(n_blocks + 1)
+    params = channel_params(np.random.default_rng(params_seed), n_channels, conversion_rate, cost_per_click)
+
+    unit = 'D' if freq == 'D' else 'h'
+    timestamps = np.datetime64(start, unit) + np.arange(periods)
+    # Calendar position of every period, shared by all channels
+    t_days = np.arange(periods) / per_day
+    weekday = (np.datetime64(start, 'D').astype(np.int64) + 3 + t_days) % 7  # 0 = Monday
+    day_index = np.arange(periods) // per_day
+    if per_day > 1:
+        hour = np.arange(periods) % per_day
+        # Quiet nights, a daytime peak; averages to 1 over a day
+        daily_cycle = 1 + 0.8 * np.sin(2 * np.pi * (hour - 9) / 24)
+        daily_cycle /= daily_cycle.mean()
+    else:
+        daily_cycle = np.ones(1)
+
+    for i, block_seed in enumerate(block_seeds):
+        rng = np.random.default_rng(block_seed)
+        ids = np.arange(i * block, min((i + 1) * block, n_channels))
+        p = {name: values[ids][:, None] for name, values in params.items()}
+        k = len(ids)
+
+        lift = _campaign_lift(rng, k, n_days)[:, day_index]
+        level = (p['base_traffic'] / per_day
+                 * np.maximum(1 + p['growth_per_year'] * t_days / 365, 0.1)
+                 * (1 + p['weekly_amplitude'] * np.sin(2 * np.pi * weekday / 7 + p['weekly_phase']))
+                 * (1 + p['yearly_amplitude'] * np.sin(2 * np.pi * t_days / 365.25 + p['yearly_phase']))
+                 * daily_cycle
+                 * (1 + lift))
+        traffic = np.rint(level * rng.lognormal(0, p['noise'], (k, periods)))
+        # Campaign traffic converts a little worse and is paid at a premium
+        conversions = np.rint(traffic * p['conversion_rate'] / (1 + 0.2 * lift)
+                              * rng.lognormal(0, 0.1, (k, periods)))
+        revenue = np.rint(conversions * p['order_value'] * rng.lognormal(0, 0.05, (k, periods)))
+        cost = np.rint(traffic * p['cost_per_click'] * (1 + 0.3 * lift) * rng.uniform(0.9, 1.1, (k, periods)))
+
+        yield MetricsChunk(ids, timestamps, {
+            'traffic': traffic.astype(np.int64),
+            'conversions': conversions.astype(np.int64),
+            'revenue': revenue.astype(np.int64),
+            'cost': cost.astype(np.int64),
+            'roi': compute_roi(revenue, cost),
+        })
+
+
+def channel_keys(n_channels: int) -> List[str]:
+    return [f'channel_{i}' for i in range(n_channels)]
+
+
+def write_metrics(path: str, n_channels: int, n_days: int, freq: str = 'D', **kwargs) -> int:
+    """Stream generated rows to ``path`` and return the row count
+
+    A ``.csv`` path gets one long table. Any other path becomes a directory
+    of ``.npy`` columns (ROW_COLUMNS) appended to chunk by chunk, plus
+    ``meta.json``; open them memory-mapped with ``read_metrics``.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"freq must be one of {', '.join(FREQUENCIES)}")
+    total = n_channels * n_days * FREQUENCIES[freq]
+    chunks = generate_chunks(n_channels, n_days, freq=freq, **kwargs)
+    if path.endswith('.csv'):
+        import pandas as pd
+
+        with open(path, 'w', newline='') as handle:
+            for i, chunk in enumerate(chunks):
+                pd.DataFrame(chunk.rows()).to_csv(handle, header=i == 0, index=False)
+        return total
+
+    os.makedirs(path, exist_ok=True)
+    dtypes = {'channel_id': np.int32, 'timestamp': np.dtype(f'datetime64[{"D" if freq == "D" else "h"}]'),
+              'roi': np.float64}
+    handles = {name: open(os.path.join(path, f'{name}.npy'), 'wb') for name in ROW_COLUMNS}
+    try:
+        for name, handle in handles.items():
+            header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtypes.get(name, np.int64))),
+                      'fortran_order': False, 'shape': (total,)}
+            np.lib.format.write_array_header_2_0(handle, header)
+        # Chunks arrive channel-major, so every column file is written front to back
+        for chunk in chunks:
+            for name, values in chunk.rows().items():
+                values.astype(dtypes.get(name, np.int64), copy=False).tofile(handles[name])
+    finally:
+        for handle in handles.values():
+            handle.close()
+    meta = {'channels': n_channels, 'days': n_days, 'freq': freq, 'rows': total,
+            'seed': kwargs.get('seed', 0), 'start': kwargs.get('start', '2024-01-01')}
+    with open(os.path.join(path, META_FILE), 'w') as handle:
+        json.dump(meta, handle)
+    return total
+
+
+def read_metrics(path: str) -> Dict[str, np.ndarray]:
+    """Columns written by ``write_metrics``, memory-mapped read-only"""
+    return {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in ROW_COLUMNS}
+
+
+def populate_store(n_channels: int, n_days: int, keys: Optional[Sequence[str]] = None,
+                   store: Optional[MetricsStore] = None, **kwargs) -> MetricsStore:
+    """Load generated daily metrics into a MetricsStore (one bulk load per channel)"""
+    keys = channel_keys(n_channels) if keys is None else list(keys)
+    start = kwargs.get('start', '2024-01-01')
+    if store is None:
+        store = MetricsStore(start_date=start, channel_capacity=max(n_channels, 1), day_capacity=max(n_days, 1))
+    for chunk in generate_chunks(n_channels, n_days, freq='D', **kwargs):
+        columns = chunk.columns
+        for row, code in enumerate(chunk.channel_ids):
+            store.load_series(keys[code], chunk.timestamps, *(columns[name][row] for name in METRICS),
+                              roi=columns['roi'][row])
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='output directory of .npy columns, or a .csv file')
+    parser.add_argument('--channels', type=int, default=100)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--freq', choices=tuple(FREQUENCIES), default='D')
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = write_metrics(args.path, args.channels, args.days, freq=args.freq, start=args.start,
+                         seed=args.seed, chunk_rows=args.chunk_rows)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {rows:,} rows to {args.path} in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Point reduction for time-series charts
+
+Both reducers return the sorted indices of the points to keep, so callers
+can take the same subset of dates and values, and both always keep the
+first and last point. ``lttb`` (Largest-Triangle-Three-Buckets) preserves
+the visual shape of a line with ``target`` points; ``minmax`` keeps every
+bucket's extremes, so spikes and dips survive at the cost of a busier line.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+
+def lttb(y, target: int, x=None) -> np.ndarray:
+    """Indices of ``target`` points chosen by Largest-Triangle-Three-Buckets"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if target >= n or target < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # target - 2 buckets between the fixed first and last point
+    edges = (np.arange(target - 1) * ((n - 2) / (target - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sizes = np.diff(edges)
+    # Mean of every bucket, used as the third vertex for the bucket before it
+    x_means = np.add.reduceat(x[:n - 1], edges[:-1]) / sizes
+    y_means = np.add.reduceat(y[:n - 1], edges[:-1]) / sizes
+    x_next = np.append(x_means[1:], x[-1])
+    y_next = np.append(y_means[1:], y[-1])
+
+    keep = np.empty(target, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(target - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - x_next[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (y_next[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax(y, target: int) -> np.ndarray:
+    """Indices of each bucket's minimum and maximum, about ``target`` points in all"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    buckets = target // 2
+    if target >= n or buckets < 1:
+        return np.arange(n)
+
+    width = -(-n // buckets)
+    padded = np.full(buckets * width, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, width)
+    filled = ~np.isnan(padded).all(axis=1)
+    offsets = np.arange(buckets)[filled] * width
+    low = np.nanargmin(padded[filled], axis=1) + offsets
+    high = np.nanargmax(padded[filled], axis=1) + offsets
+    return np.unique(np.concatenate(([0, n - 1], low, high)))
+
+
+def downsample(y, target: Optional[int], method: str = 'lttb', x=None) -> np.ndarray:
+    """Indices to keep so about ``target`` points remain (all of them if None)"""
+    if target is None:
+        return np.arange(len(y))
+    if method == 'lttb':
+        return lttb(y, target, x)
+    if method == 'minmax':
+        return minmax(y, target)
+    raise ValueError(f"method must be one of {', '.join(METHODS)}")
@@ -0,0 +1,128 @@
+"""Replayable local generator of raw channel events
+
+Produces click/conversion/cost events in timestamp order from a seeded
+``numpy.random.Generator``, so the same seed always yields the same stream.
+Events can be written to CSV/JSONL for ``IngestionPipeline.ingest_file`` or
+replayed line by line into the pipeline's TCP socket:
+
+    python -m channelpulse.eventgen events.jsonl --events 1000000 --seed 7
+    python -m channelpulse.eventgen events.csv --events 1000000 --users 200000
+    python -m channelpulse.eventgen events.jsonl --replay 127.0.0.1:9009
+"""
+
+import argparse
+import socket
+import time
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from channelpulse.ingest import EVENT_TYPES, EventBatch
+
+DEFAULT_CHANNELS = ('instagram', 'linkedin', 'blog', 'google')
+# Share of events by type: mostly clicks, with conversions and spend updates
+EVENT_MIX = (0.85, 0.05, 0.10)
+
+
+def generate_frames(n_events: int, channels: Sequence[str] = DEFAULT_CHANNELS,
+                    start: str = '2024-05-24', days: int = 7, seed: int = 0,
+                    batch_size: int = 100_000, users: int = 0) -> Iterator[pd.DataFrame]:
+    """Yield ``timestamp, channel, event, value`` frames in timestamp order
+
+    With ``users`` > 0 each event also gets an integer ``user`` id drawn
+    from that many users, for audience overlap and attribution.
+    """
+    rng = np.random.default_rng(seed)
+    channels = np.asarray(channels, dtype=object)
+    weights = rng.uniform(0.5, 2.0, len(channels))
+    weights /= weights.sum()
+    origin = np.datetime64(start, 's')
+    span = days * 86_400
+
+    for offset in range(0, n_events, batch_size):
+        size = min(batch_size, n_events - offset)
+        position = offset + np.arange(size)
+        seconds = (position + rng.random(size)) * span / n_events
+        kinds = rng.choice(len(EVENT_TYPES), size=size, p=EVENT_MIX)
+        values = np.where(kinds == 1, rng.lognormal(4.5, 0.6, size),
+                          np.where(kinds == 2, rng.uniform(5, 50, size), 0.0))
+        frame = pd.DataFrame({
+            'timestamp': np.datetime_as_string(origin + seconds.astype('timedelta64[s]'), unit='s'),
+            'channel': channels[rng.choice(len(channels), size=size, p=weights)],
+            'event': np.asarray(EVENT_TYPES, dtype=object)[kinds],
+            'value': values.round(2),
+        })
+        if users:
+            frame['user'] = rng.integers(users, size=size)
+        yield frame
+
+
+def generate_events(n_events: int, **kwargs) -> Iterator[EventBatch]:
+    """Yield already-parsed EventBatches, skipping the file round trip"""
+    for frame in generate_frames(n_events, **kwargs):
+        yield EventBatch(
+            channels=frame['channel'].to_numpy(),
+            days=frame['timestamp'].to_numpy().astype('datetime64[D]'),
+            kinds=pd.Categorical(frame['event'], categories=EVENT_TYPES).codes.astype(np.int8),
+            values=frame['value'].to_numpy(),
+            users=frame['user'].to_numpy() if 'user' in frame else None,
+        )
+
+
+def write_events(path: str, n_events: int, **kwargs) -> int:
+    """Write a generated stream to ``path`` (.csv or .jsonl)"""
+    with open(path, 'w', newline='') as handle:
+        for i, frame in enumerate(generate_frames(n_events, **kwargs)):
+            if path.endswith('.csv'):
+                frame.to_csv(handle, header=i == 0, index=False)
+            else:
+                handle.write(frame.to_json(orient='records', lines=True))
+                handle.write('\n')
+    return n_events
+
+
+def replay(path: str, host: str, port: int, rate: Optional[float] = None) -> int:
+    """Send a JSONL event file to a pipeline socket, optionally at ``rate`` events/sec"""
+    sent, started = 0, time.monotonic()
+    with socket.create_connection((host, port)) as conn, open(path, 'rb') as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            conn.sendall(line if line.endswith(b'\n') else line + b'\n')
+            sent += 1
+            if rate:
+                ahead = sent / rate - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+    return sent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='output file (.csv or .jsonl), or input file with --replay')
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--channels', type=int, default=0,
+                        help='number of synthetic channels (default: the four dashboard channels)')
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--start', default='2024-05-24')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--users', type=int, default=0, help='add a user id column drawn from this many users')
+    parser.add_argument('--replay', metavar='HOST:PORT', help='stream an existing JSONL file to a socket')
+    parser.add_argument('--rate', type=float, help='events per second when replaying')
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        host, port = args.replay.rsplit(':', 1)
+        sent = replay(args.path, host, int(port), args.rate)
+        print(f"Replayed {sent:,} events to {args.replay}")
+        return
+
+    channels = [f'channel_{i}' for i in range(args.channels)] if args.channels else DEFAULT_CHANNELS
+    write_events(args.path, args.events, channels=channels, start=args.start,
+                 days=args.days, seed=args.seed, users=args.users)
+    print(f"Wrote {args.events:,} events to {args.path}")
+
+
+if __name__ == '__main__':
+    main()
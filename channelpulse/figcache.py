@@ -0,0 +1,113 @@
+"""LRU cache of built (and lazily serialized) Plotly figures
+
+Entries are keyed by what the figure shows, e.g. ``('performance', channel,
+metric, days)``, and remember the data version they were built from. A
+lookup with a newer version rebuilds the entry in place, so figures are
+invalidated automatically when their channel's data changes, and every
+session viewing the same unchanged chart shares one prebuilt figure.
+Concurrent misses for the same key and version wait for a single build.
+Cached figures are shared between callers and must be treated as read-only.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class _Entry:
+    __slots__ = ('version', 'figure', 'json')
+
+    def __init__(self, version, figure):
+        self.version = version
+        self.figure = figure
+        self.json = None
+
+
+class FigureCache:
+    """Size-bounded LRU of figures with hit/miss/eviction counters"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._building: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable, version: Hashable, build: Callable) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry
+            self._counters['misses'] += 1
+            if entry is not None:
+                self._counters['invalidations'] += 1
+            pending = self._building.get((key, version))
+            if pending is None:
+                pending = self._building[(key, version)] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        # Build outside the lock so slow figures do not serialize other sessions
+        try:
+            entry = _Entry(version, build())
+        except BaseException as error:
+            with self._lock:
+                del self._building[(key, version)]
+            pending.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._building[(key, version)]
+            current = self._entries.get(key)
+            # Never replace a figure built from newer data with an older one
+            if current is None or not self._is_newer(current, entry):
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+        pending.set_result(entry)
+        return entry
+
+    @staticmethod
+    def _is_newer(current: _Entry, candidate: _Entry) -> bool:
+        try:
+            return current.version > candidate.version
+        except TypeError:
+            return False
+
+    def get(self, key: Hashable, version: Hashable, build: Callable):
+        """Figure for ``key`` at ``version``, calling ``build()`` on a miss"""
+        return self._lookup(key, version, build).figure
+
+    def get_json(self, key: Hashable, version: Hashable, build: Callable) -> str:
+        """Serialized figure JSON for ``key`` at ``version``, built on demand"""
+        entry = self._lookup(key, version, build)
+        if entry.json is None:
+            entry.json = entry.figure.to_json()
+        return entry.json
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['max_entries'] = self.max_entries
+        return stats
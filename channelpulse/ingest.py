@@ -0,0 +1,319 @@
+"""Streaming ingestion of raw channel events into a MetricsStore
+
+Raw events are ``(timestamp, channel, event, value)`` records, optionally
+with a ``user`` id, where ``event`` is one of ``click``, ``conversion`` or
+``cost``:
+
+- ``click`` adds one visit to ``traffic``
+- ``conversion`` adds one to ``conversions`` and ``value`` to ``revenue``
+- ``cost`` adds ``value`` to ``cost``
+
+Sources (CSV/JSONL files, a local TCP socket) parse events into columnar
+micro-batches and hand them to an ``IngestionPipeline``. The pipeline queue is
+bounded, so a fast producer blocks until the applier catches up instead of
+buffering without limit. Each batch is reduced to per-(channel, day) totals
+with one vectorized group-by and folded into the store, which the dashboard
+reads directly, so new numbers show up on the next refresh. Events dated
+more than ``horizon_days`` outside the data's range are dropped, so one stray
+timestamp cannot stretch the store's dense day axis by decades. Given an
+``AudienceSketches``, the pipeline also folds each batch's user ids into the
+per-channel reach and overlap sketches.
+"""
+
+import json
+import queue
+import socketserver
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from channelpulse.audience import AudienceSketches
+from channelpulse.store import MetricsStore
+
+EVENT_TYPES = ('click', 'conversion', 'cost')
+CLICK, CONVERSION, COST = range(len(EVENT_TYPES))
+
+DEFAULT_BATCH_SIZE = 50_000
+# Days before the data's first date or after its latest one that an event may fall
+DEFAULT_HORIZON_DAYS = 366
+
+
+class EventBatch(NamedTuple):
+    """Columnar micro-batch of parsed events"""
+    channels: np.ndarray  # object array of channel keys
+    days: np.ndarray      # datetime64[D]
+    kinds: np.ndarray     # int8 codes into EVENT_TYPES, -1 if unknown
+    values: np.ndarray    # float64 amount (revenue or cost)
+    users: Optional[np.ndarray] = None  # object array of user ids, None if the source has none
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+def _to_days(timestamps) -> np.ndarray:
+    """ISO strings or epoch seconds to datetime64[D] (NaT where unparseable)"""
+    series = pd.Series(timestamps)
+    if pd.api.types.is_numeric_dtype(series):
+        # Out-of-range epochs overflow even with errors='coerce', so blank them first
+        seconds = series.astype(np.float64)
+        in_range = seconds.between(pd.Timestamp.min.timestamp(), pd.Timestamp.max.timestamp())
+        parsed = pd.to_datetime(seconds.where(in_range), unit='s', utc=True, errors='coerce')
+    else:
+        parsed = pd.to_datetime(series, format='ISO8601', utc=True, errors='coerce')
+    return parsed.dt.tz_localize(None).values.astype('datetime64[D]')
+
+
+def batch_from_columns(timestamps, channels, events, values, users=None) -> EventBatch:
+    """Build an EventBatch from parallel columns"""
+    kinds = pd.Categorical(events, categories=EVENT_TYPES).codes.astype(np.int8)
+    return EventBatch(
+        channels=np.asarray(channels, dtype=object),
+        days=_to_days(timestamps),
+        kinds=kinds,
+        values=pd.to_numeric(pd.Series(values), errors='coerce').fillna(0).to_numpy(np.float64),
+        users=None if users is None else np.asarray(users, dtype=object),
+    )
+
+
+def batch_from_records(records: List[Dict]) -> EventBatch:
+    """Build an EventBatch from decoded JSON objects"""
+    users = [r.get('user') for r in records]
+    return batch_from_columns(
+        [r.get('timestamp') for r in records],
+        [r.get('channel') for r in records],
+        [r.get('event') for r in records],
+        [r.get('value', 0) for r in records],
+        users if any(user is not None for user in users) else None,
+    )
+
+
+def read_csv_events(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[EventBatch]:
+    """Stream a ``timestamp,channel,event,value[,user]`` CSV file in micro-batches"""
+    for chunk in pd.read_csv(path, chunksize=batch_size):
+        yield batch_from_columns(chunk['timestamp'], chunk['channel'], chunk['event'],
+                                 chunk.get('value', 0), chunk.get('user'))
+
+
+def read_jsonl_events(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[EventBatch]:
+    """Stream a JSON-lines event file in micro-batches"""
+    for chunk in pd.read_json(path, lines=True, chunksize=batch_size, convert_dates=False):
+        values = chunk['value'] if 'value' in chunk else np.zeros(len(chunk))
+        yield batch_from_columns(chunk['timestamp'], chunk['channel'], chunk['event'], values,
+                                 chunk.get('user'))
+
+
+def read_events(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[EventBatch]:
+    """Pick the reader from the file extension (.csv or .jsonl/.json)"""
+    if path.endswith('.csv'):
+        return read_csv_events(path, batch_size)
+    return read_jsonl_events(path, batch_size)
+
+
+class IngestionPipeline:
+    """Bounded micro-batch pipeline that folds events into a MetricsStore"""
+
+    def __init__(self, store: MetricsStore, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_pending_batches: int = 8, retain_days: int = 2,
+                 audience: Optional[AudienceSketches] = None, horizon_days: int = DEFAULT_HORIZON_DAYS):
+        self.store = store
+        self.audience = audience
+        self.batch_size = batch_size
+        self.retain_days = retain_days
+        self.horizon_days = horizon_days
+        self._queue: 'queue.Queue[Optional[EventBatch]]' = queue.Queue(maxsize=max_pending_batches)
+        self._worker: Optional[threading.Thread] = None
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+        # Float running totals for recently touched (channel, day) cells, so
+        # fractional amounts are rounded once rather than once per batch
+        self._open: Dict[tuple, np.ndarray] = {}
+        self._latest_day: Optional[np.datetime64] = None
+        self._stats = {
+            'events_received': 0,
+            'events_applied': 0,
+            'events_dropped': 0,
+            'batches_applied': 0,
+            'batches_failed': 0,
+            'apply_seconds': 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> 'IngestionPipeline':
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='channelpulse-ingest', daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self):
+        """Drain pending batches and stop the applier and any socket server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def flush(self):
+        """Block until every submitted batch has been applied"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                self.apply(batch)
+            except Exception:
+                # A bad batch must not kill the applier, or producers block on the full queue
+                self._stats['batches_failed'] += 1
+                self._stats['events_dropped'] += len(batch)
+            finally:
+                self._queue.task_done()
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    def submit(self, batch: EventBatch, timeout: Optional[float] = None):
+        """Queue a batch for the applier, blocking while the queue is full"""
+        self._stats['events_received'] += len(batch)
+        if self._worker is None:
+            self.apply(batch)
+        else:
+            self._queue.put(batch, timeout=timeout)
+
+    def ingest(self, batches: Iterable[EventBatch]) -> int:
+        """Submit every batch from a source and return the event count"""
+        total = 0
+        for batch in batches:
+            self.submit(batch)
+            total += len(batch)
+        return total
+
+    def ingest_file(self, path: str) -> int:
+        return self.ingest(read_events(path, self.batch_size))
+
+    def serve_socket(self, host: str = '127.0.0.1', port: int = 0,
+                     flush_interval: float = 1.0) -> tuple:
+        """Accept newline-delimited JSON events on a local TCP socket
+
+        Each connection is read on its own thread and cut into micro-batches of
+        ``batch_size`` events or ``flush_interval`` seconds, whichever comes
+        first. A full queue stops the reader, which lets TCP flow control push
+        back on the sender. Returns the bound ``(host, port)``.
+        """
+        pipeline = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                records, started = [], time.monotonic()
+                for line in self.rfile:
+                    line = line.strip()
+                    if line:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            pipeline._stats['events_dropped'] += 1
+                    if len(records) >= pipeline.batch_size or (
+                            records and time.monotonic() - started >= flush_interval):
+                        pipeline.submit(batch_from_records(records))
+                        records, started = [], time.monotonic()
+                if records:
+                    pipeline.submit(batch_from_records(records))
+
+        self.start()
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='channelpulse-socket', daemon=True).start()
+        return self._server.server_address
+
+    # ------------------------------------------------------------------
+    # Applier
+    # ------------------------------------------------------------------
+    def apply(self, batch: EventBatch):
+        """Reduce a batch to per-(channel, day) totals and fold them into the store"""
+        started = time.perf_counter()
+        known = (batch.kinds >= 0) & ~pd.isna(batch.channels) & ~np.isnat(batch.days)
+        known &= self._in_horizon(batch.days, known)
+        dropped = int(len(batch) - known.sum())
+        if dropped:
+            batch = EventBatch(*(None if column is None else column[known] for column in batch))
+
+        channel_codes, channel_keys = pd.factorize(batch.channels)
+        day_codes, day_keys = pd.factorize(batch.days)
+        cells = channel_codes.astype(np.int64) * len(day_keys) + day_codes
+        n_cells = len(channel_keys) * len(day_keys)
+
+        is_conversion = batch.kinds == CONVERSION
+        totals = np.stack([
+            np.bincount(cells, weights=batch.kinds == CLICK, minlength=n_cells),
+            np.bincount(cells, weights=is_conversion, minlength=n_cells),
+            np.bincount(cells, weights=batch.values * is_conversion, minlength=n_cells),
+            np.bincount(cells, weights=batch.values * (batch.kinds == COST), minlength=n_cells),
+        ])
+        touched = np.flatnonzero(np.bincount(cells, minlength=n_cells))
+
+        # Users who clicked or converted (cost rows carry no audience), sketched
+        # before the store write so a reader of the new version sees them too
+        if self.audience is not None and batch.users is not None:
+            reached = (batch.kinds != COST) & ~pd.isna(batch.users)
+            if reached.any():
+                self.audience.add(batch.channels[reached], batch.users[reached])
+
+        with self.store.lock:
+            for cell in touched:
+                channel = channel_keys[cell // len(day_keys)]
+                day = np.datetime64(day_keys[cell % len(day_keys)], 'D')
+                running = self._open.get((channel, day))
+                if running is None:
+                    running = self.store.lookup(channel, day).astype(np.float64)
+                    self._open[(channel, day)] = running
+                running += totals[:, cell]
+                self.store.append(channel, day, *np.rint(running).astype(np.int64).tolist())
+
+        if len(day_keys):
+            latest = np.datetime64(np.max(day_keys), 'D')
+            if self._latest_day is None or latest > self._latest_day:
+                self._latest_day = latest
+                self._evict_closed_days()
+
+        self._stats['events_applied'] += len(batch)
+        self._stats['events_dropped'] += dropped
+        self._stats['batches_applied'] += 1
+        self._stats['apply_seconds'] += time.perf_counter() - started
+
+    def _in_horizon(self, days: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """Days within ``horizon_days`` of the store's range and the latest day seen
+
+        An empty store is anchored on the batch's median day instead.
+        """
+        first, last = self.store.start_date, self.store.end_date
+        if self._latest_day is not None:
+            first = self._latest_day if first is None else min(first, self._latest_day)
+            last = self._latest_day if last is None else max(last, self._latest_day)
+        if first is None or last is None:
+            if not valid.any():
+                return valid
+            first = last = np.sort(days[valid])[valid.sum() // 2]
+        return (days >= first - self.horizon_days) & (days <= last + self.horizon_days)
+
+    def _evict_closed_days(self):
+        """Drop running totals for days older than ``retain_days``"""
+        horizon = self._latest_day - self.retain_days
+        for key in [key for key in self._open if key[1] < horizon]:
+            del self._open[key]
+
+    def stats(self) -> Dict:
+        stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['open_cells'] = len(self._open)
+        seconds = stats['apply_seconds']
+        stats['events_per_second'] = stats['events_applied'] / seconds if seconds else 0.0
+        return stats
+
@@ -0,0 +1,235 @@
+"""Pluggable insight backends and the batching/caching engine in front of them
+
+An ``InsightProvider`` turns a batch of prompts (plain JSON-able dicts that
+carry the channel-performance snapshot) into insight dicts. Two providers
+ship here: ``LocalInsightProvider`` runs a compose function in-process with a
+simulated model latency, and ``HTTPInsightProvider`` posts batches to a
+Gemini-style endpoint such as the one started by ``serve_mock_backend``.
+
+``InsightEngine`` sits in front of a provider and makes sure a given prompt
+costs at most one model call: results are cached by a hash of the prompt
+(TTL plus LRU size bound), identical in-flight requests share one future, and
+distinct prompts arriving within ``batch_window`` seconds are sent to the
+backend together in one call.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from channelpulse import telemetry
+
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_BATCH_WINDOW = 0.02
+DEFAULT_CACHE_TTL = 3600.0
+DEFAULT_CACHE_SIZE = 1024
+
+
+class InsightProvider(ABC):
+    """Backend that turns insight prompts into insight dicts, one per prompt"""
+
+    @abstractmethod
+    async def generate_batch(self, prompts: List[Dict]) -> List[Dict]:
+        ...
+
+
+class LocalInsightProvider(InsightProvider):
+    """In-process model stand-in: ``compose(prompt)`` after a simulated round trip"""
+
+    def __init__(self, compose: Callable[[Dict], Dict], latency: float = 0.0):
+        self.compose = compose
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_batch(self, prompts: List[Dict]) -> List[Dict]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        # Composing can run the budget optimizer, so keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, telemetry.attributed(self._compose_all), prompts)
+
+    def _compose_all(self, prompts: List[Dict]) -> List[Dict]:
+        return [self.compose(prompt) for prompt in prompts]
+
+
+class HTTPInsightProvider(InsightProvider):
+    """Posts ``{"prompts": [...]}`` and expects ``{"insights": [...]}`` back"""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.url = url
+        self.timeout = timeout
+        self.calls = 0
+
+    async def generate_batch(self, prompts: List[Dict]) -> List[Dict]:
+        self.calls += 1
+        body = json.dumps({'prompts': prompts}).encode()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, telemetry.attributed(self._post), body)
+
+    def _post(self, body: bytes) -> List[Dict]:
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            insights = json.load(response)['insights']
+        return insights
+
+
+def serve_mock_backend(compose: Callable[[Dict], Dict], host: str = '127.0.0.1', port: int = 0,
+                       latency: float = 0.0) -> ThreadingHTTPServer:
+    """Run a local HTTP stand-in for the insight model on a background thread
+
+    The server answers ``POST /`` with one composed insight per prompt after
+    ``latency`` seconds. Use ``server.server_address`` for the bound port and
+    ``server.shutdown()`` to stop it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            prompts = json.loads(self.rfile.read(length))['prompts']
+            if latency:
+                time.sleep(latency)
+            body = json.dumps({'insights': [compose(prompt) for prompt in prompts]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='channelpulse-mock-model', daemon=True).start()
+    return server
+
+
+def prompt_key(prompt: Dict) -> str:
+    """Stable hash of a prompt, i.e. of the performance snapshot it describes"""
+    canonical = json.dumps(prompt, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class InsightEngine:
+    """Cache, coalesce and batch insight requests in front of a provider
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, provider: InsightProvider, max_batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_window: float = DEFAULT_BATCH_WINDOW, cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 cache_size: int = DEFAULT_CACHE_SIZE, clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._clock = clock
+        self._cache: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[Tuple[str, Dict]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'expired': 0,
+            'evictions': 0,
+            'backend_calls': 0,
+            'backend_prompts': 0,
+            'backend_errors': 0,
+        }
+
+    async def get(self, prompt: Dict, refresh: bool = False) -> Dict:
+        """Insight for ``prompt``, calling the backend only if nothing is cached or in flight
+
+        ``refresh`` skips the cache (an explicit regeneration); the new insight
+        replaces the cached one, so later cached reads show it too.
+        """
+        key = prompt_key(prompt)
+        insight = None if refresh else self._cache_get(key)
+        if insight is not None:
+            self._counters['hits'] += 1
+            return dict(insight)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._counters['coalesced'] += 1
+        else:
+            self._counters['misses'] += 1
+            loop = asyncio.get_running_loop()
+            future = self._inflight[key] = loop.create_future()
+            self._pending.append((key, prompt))
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        # Shield so one caller giving up does not cancel the shared request
+        return dict(await asyncio.shield(future))
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[Tuple[str, Dict]]):
+        self._counters['backend_calls'] += 1
+        self._counters['backend_prompts'] += len(batch)
+        try:
+            insights = await self.provider.generate_batch([prompt for _, prompt in batch])
+            if len(insights) != len(batch):
+                raise ValueError(f"Provider returned {len(insights)} insights for {len(batch)} prompts")
+        except Exception as error:
+            self._counters['backend_errors'] += 1
+            for key, _ in batch:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (key, _), insight in zip(batch, insights):
+            self._cache_put(key, insight)
+            future = self._inflight.pop(key)
+            if not future.done():
+                future.set_result(insight)
+
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        item = self._cache.get(key)
+        if item is None:
+            return None
+        expires, insight = item
+        if expires < self._clock():
+            del self._cache[key]
+            self._counters['expired'] += 1
+            return None
+        self._cache.move_to_end(key)
+        return insight
+
+    def _cache_put(self, key: str, insight: Dict):
+        expires = float('inf') if self.cache_ttl is None else self._clock() + self.cache_ttl
+        self._cache[key] = (expires, insight)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        stats = dict(self._counters)
+        stats['cached'] = len(self._cache)
+        stats['in_flight'] = len(self._inflight)
+        return stats
@@ -0,0 +1,248 @@
+"""Voice narration: scripts from structured insights, cached synthesis, streamed audio
+
+``narration_script`` writes the spoken script straight from an insight dict
+(title, content, dynamic data, impact) as a list of short segments, one
+sentence each, instead of re-parsing the rendered Markdown card.
+
+``Narrator`` synthesizes segment by segment and yields each one as soon as
+it is ready, so the first sentence plays while the rest is still being
+produced. Every segment's audio is stored in an ``AudioCache`` on disk under
+a hash of its text and voice; a repeated narration, or a sentence shared by
+many (the greeting, the closing question), is read back instead of being
+synthesized again. The cache is bounded in bytes and evicts least recently
+used files. Background preparation runs on a small fixed pool, and a segment
+already being synthesized is awaited rather than synthesized twice.
+
+``ToneSynthesizer`` is the offline text-to-speech stand-in: it renders
+deterministic tones shaped by the text, at a configurable real-time factor
+to mimic a model's synthesis time. Anything with the same ``synthesize`` /
+``voice`` interface can replace it.
+"""
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16_000
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_PREPARE_WORKERS = 2
+# Seconds of audio per character for the stand-in voice
+SECONDS_PER_CHAR = 0.045
+GREETING = "Hello! I'm Jatin, your AI assistant."
+CLOSING = "Would you like me to implement this recommendation?"
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_LEADING_SYMBOLS = re.compile(r'^[^\w$]+')
+
+
+def narration_script(insight: Dict) -> List[str]:
+    """Spoken segments for an insight, one sentence each"""
+    segments = [GREETING]
+    title = _LEADING_SYMBOLS.sub('', insight.get('title', '')).strip()
+    if title:
+        segments.append(f"Here's your AI-powered insight: {title}.")
+    segments.extend(part for part in _SENTENCE_END.split(insight.get('content', '').strip()) if part)
+
+    data = insight.get('dynamic_data') or {}
+    if 'best_channel' in data:
+        segments.append(f"{data['best_channel']} has the best return on spend right now, "
+                        f"and {data['worst_channel']} the weakest.")
+    if 'rising_channel' in data:
+        direction = 'up' if data['rising_trend'] >= 0 else 'down'
+        segments.append(f"{data['rising_channel']} revenue is trending {direction} "
+                        f"{abs(data['rising_trend']):.1f} percent a day.")
+    if insight.get('impact'):
+        segments.append(f"The projected impact is {insight['impact']}.")
+    segments.append(CLOSING)
+    return segments
+
+
+def wav_bytes(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """16-bit mono WAV file holding ``samples``"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+        out.writeframes(np.ascontiguousarray(samples, dtype='<i2').tobytes())
+    return buffer.getvalue()
+
+
+class ToneSynthesizer:
+    """Offline text-to-speech stand-in producing 16-bit mono PCM"""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, realtime_factor: float = 0.0):
+        self.sample_rate = sample_rate
+        # Simulated synthesis time as a fraction of the audio's duration
+        self.realtime_factor = realtime_factor
+        self.voice = f'tone-{sample_rate}'
+
+    def synthesize(self, text: str) -> np.ndarray:
+        codes = np.frombuffer(text.encode('utf-8'), dtype=np.uint8).astype(np.float64)
+        per_char = int(self.sample_rate * SECONDS_PER_CHAR)
+        # One pitch per character, each with a soft attack and release
+        pitch = np.repeat(110 + (codes % 32) * 12, per_char)
+        phase = np.cumsum(2 * np.pi * pitch / self.sample_rate)
+        envelope = np.tile(np.sin(np.linspace(0, np.pi, per_char)), len(codes))
+        samples = (np.sin(phase) * envelope * 0.3 * 32767).astype(np.int16)
+        if self.realtime_factor:
+            time.sleep(len(samples) / self.sample_rate * self.realtime_factor)
+        return samples
+
+
+class AudioCache:
+    """Disk cache of synthesized PCM segments, LRU-bounded by total bytes"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_CACHE_BYTES):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.directory = directory or tempfile.mkdtemp(prefix='channelpulse-audio-')
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # Files left by an earlier run, least recently used first
+        found = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.pcm'):
+                stat = os.stat(os.path.join(self.directory, name))
+                found.append((stat.st_mtime, name[:-4], stat.st_size))
+        self._entries: 'OrderedDict[str, int]' = OrderedDict((key, size) for _, key, size in sorted(found))
+        self._bytes = sum(self._entries.values())
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def key(voice: str, text: str) -> str:
+        return hashlib.sha256(f'{voice}\0{text}'.encode()).hexdigest()[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.pcm')
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            if key not in self._entries:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+        try:
+            samples = np.fromfile(self._path(key), dtype='<i2')
+            os.utime(self._path(key))
+        except OSError:  # removed behind our back
+            with self._lock:
+                self._bytes -= self._entries.pop(key, 0)
+            return None
+        return samples
+
+    def put(self, key: str, samples: np.ndarray):
+        data = np.ascontiguousarray(samples, dtype='<i2').tobytes()
+        if len(data) > self.max_bytes:
+            return
+        # Write then rename, so readers never see a partial file
+        fd, scratch = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(scratch, self._path(key))
+        with self._lock:
+            self._bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._counters['evictions'] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+            stats['max_bytes'] = self.max_bytes
+        return stats
+
+
+class Narrator:
+    """Turns insights into streamed, cached speech"""
+
+    def __init__(self, synthesizer: Optional[ToneSynthesizer] = None, cache: Optional[AudioCache] = None,
+                 max_workers: int = DEFAULT_PREPARE_WORKERS):
+        self.synthesizer = synthesizer or ToneSynthesizer()
+        self.cache = cache or AudioCache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='narration-prepare')
+        self._lock = threading.Lock()
+        # Segment cache key -> synthesis in progress, shared by every request for it
+        self._inflight: Dict[str, Future] = {}
+        self._counters = {'synthesized': 0, 'coalesced': 0, 'prepared': 0}
+
+    @property
+    def sample_rate(self) -> int:
+        return self.synthesizer.sample_rate
+
+    def segment_audio(self, text: str) -> np.ndarray:
+        """One segment's samples, from the cache or freshly synthesized (and then cached)
+
+        A segment another request is already synthesizing is waited for, not
+        synthesized again.
+        """
+        key = AudioCache.key(self.synthesizer.voice, text)
+        samples = self.cache.get(key)
+        if samples is not None:
+            return samples
+
+        with self._lock:
+            shared = self._inflight.get(key)
+            if shared is None:
+                future = self._inflight[key] = Future()
+            else:
+                self._counters['coalesced'] += 1
+        if shared is not None:
+            return shared.result()
+
+        try:
+            samples = self.synthesizer.synthesize(text)
+            self.cache.put(key, samples)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(samples)
+            with self._lock:
+                self._counters['synthesized'] += 1
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return samples
+
+    def stream(self, insight: Dict) -> Iterator[np.ndarray]:
+        """Each segment's samples as soon as it is available"""
+        for segment in narration_script(insight):
+            yield self.segment_audio(segment)
+
+    def prepare(self, insight: Dict) -> Future:
+        """Synthesize an insight's narration in the background so a later request is served from cache"""
+        with self._lock:
+            self._counters['prepared'] += 1
+        return self._executor.submit(lambda: list(self.stream(insight)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = len(self._inflight)
+        return stats
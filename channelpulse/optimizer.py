@@ -0,0 +1,213 @@
+"""Budget reallocation across channels from fitted spend -> revenue curves
+
+Each paid channel's daily revenue is modelled as ``r(s) = scale * s **
+elasticity`` (diminishing returns for 0 < elasticity < 1). The elasticity is
+the log-log regression slope of revenue on spend over the trailing window,
+shrunk towards a prior when spend barely varied, and the scale puts the
+curve through the channel's current average spend and revenue. All channels
+are fitted in a few NumPy passes over a (channels, days) matrix.
+
+With concave curves the revenue-maximizing split of a fixed budget gives
+every channel not held at a bound the same marginal ROI ``r'(s)``.
+``allocate`` finds that common marginal ROI by bisection, evaluating all
+channels' spend at once per step, so thousands of channels solve in about
+a millisecond. Channels without spend (organic) are left out of the budget.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_FIT_WINDOW = 90
+DEFAULT_MAX_CHANGE = 0.5
+DEFAULT_ELASTICITY = 0.6
+ELASTICITY_BOUNDS = (0.05, 0.95)
+# Information (days x variance of log spend) at which the data and the prior weigh equally
+PRIOR_STRENGTH = 2.0
+BISECTION_STEPS = 100
+DAYS_PER_MONTH = 30
+
+
+def fit_response_curves(cost: np.ndarray, revenue: np.ndarray,
+                        prior_elasticity: float = DEFAULT_ELASTICITY):
+    """Per-row ``(scale, elasticity, spend, revenue)`` from (channels, days) matrices
+
+    ``spend`` and ``revenue`` are the mean daily values the curve passes
+    through; rows with no spend get scale 0.
+    """
+    valid = (cost > 0) & (revenue > 0)
+    n = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = np.where(valid, np.log(cost), 0.0)
+        y = np.where(valid, np.log(revenue), 0.0)
+        mean_x = x.sum(axis=1) / n
+        mean_y = y.sum(axis=1) / n
+        dx = np.where(valid, x - mean_x[:, None], 0.0)
+        dy = np.where(valid, y - mean_y[:, None], 0.0)
+        information = (dx * dx).sum(axis=1)
+        slope = (dx * dy).sum(axis=1) / information
+
+    # Shrink towards the prior in proportion to how much spend actually moved
+    weight = np.where(n > 2, information / (information + PRIOR_STRENGTH), 0.0)
+    slope = np.where(np.isfinite(slope), slope, prior_elasticity)
+    elasticity = np.clip(weight * slope + (1 - weight) * prior_elasticity, *ELASTICITY_BOUNDS)
+
+    spend = np.nan_to_num(np.nanmean(cost, axis=1))
+    mean_revenue = np.nan_to_num(np.nanmean(revenue, axis=1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(spend > 0, mean_revenue / spend ** elasticity, 0.0)
+    return scale, elasticity, spend, mean_revenue
+
+
+def response(scale: np.ndarray, elasticity: np.ndarray, spend: np.ndarray) -> np.ndarray:
+    """Modelled daily revenue at ``spend``"""
+    return scale * np.power(spend, elasticity)
+
+
+def marginal_roi(scale: np.ndarray, elasticity: np.ndarray, spend: np.ndarray) -> np.ndarray:
+    """Revenue per extra unit of spend at ``spend`` (infinite at zero spend)"""
+    with np.errstate(divide='ignore'):
+        return scale * elasticity * np.power(spend, elasticity - 1)
+
+
+def allocate(scale: np.ndarray, elasticity: np.ndarray, budget: float,
+             lower: np.ndarray, upper: np.ndarray):
+    """Revenue-maximizing spend within ``[lower, upper]`` summing to ``budget``
+
+    Returns ``(spend, marginal)`` where ``marginal`` is the common marginal
+    ROI of the channels not held at a bound.
+    """
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    if budget < lower.sum() - 1e-9 or budget > upper.sum() + 1e-9:
+        raise ValueError(f"budget {budget:,.2f} is outside the bounds' range "
+                         f"[{lower.sum():,.2f}, {upper.sum():,.2f}]")
+
+    coefficient = scale * elasticity
+    exponent = 1.0 / (elasticity - 1.0)
+
+    def spend_at(log_marginal):
+        # Inverse of the marginal curve: s = (m / (scale * elasticity)) ** (1 / (elasticity - 1))
+        with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            spend = np.exp((log_marginal - np.log(coefficient)) * exponent)
+        return np.clip(np.nan_to_num(spend, nan=0.0), lower, upper)
+
+    with np.errstate(divide='ignore'):
+        at_upper = np.log(marginal_roi(scale, elasticity, np.maximum(upper, 1e-12)))
+        at_lower = np.log(marginal_roi(scale, elasticity, np.maximum(lower, 1e-12)))
+    at_upper, at_lower = at_upper[np.isfinite(at_upper)], at_lower[np.isfinite(at_lower)]
+    if not len(at_upper) or not len(at_lower):
+        raise ValueError("no channel has a fittable response curve")
+    low, high = at_upper.min(), at_lower.max()
+    # Total spend falls as the marginal ROI threshold rises
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        if spend_at(middle).sum() > budget:
+            low = middle
+        else:
+            high = middle
+        if high - low < 1e-12:
+            break
+    spend = spend_at(high)
+    # Hand the bisection's leftover to the channels with room, pro rata
+    room = np.where(spend < upper, upper - spend, 0.0)
+    if room.sum() > 0:
+        spend = spend + (budget - spend.sum()) * room / room.sum()
+    return np.clip(spend, lower, upper), float(np.exp(high))
+
+
+class BudgetPlan(NamedTuple):
+    """Current and recommended daily spend per paid channel"""
+    channels: List[str]
+    current: np.ndarray
+    recommended: np.ndarray
+    current_revenue: np.ndarray
+    projected_revenue: np.ndarray
+    conversions_delta: np.ndarray
+    elasticity: np.ndarray
+    marginal_roi: float
+    organic: List[str]
+    note: str = ''
+
+    @property
+    def daily_uplift(self) -> float:
+        return float(self.projected_revenue.sum() - self.current_revenue.sum())
+
+    @property
+    def monthly_uplift(self) -> float:
+        return self.daily_uplift * DAYS_PER_MONTH
+
+    def moves(self, limit: Optional[int] = None) -> List[Dict]:
+        """Largest spend changes first"""
+        change = self.recommended - self.current
+        order = np.argsort(-np.abs(change), kind='stable')[:limit]
+        return [{
+            'channel': self.channels[i],
+            'current': round(float(self.current[i]), 2),
+            'recommended': round(float(self.recommended[i]), 2),
+            'change_pct': round(float(change[i] / self.current[i] * 100), 1) if self.current[i] else 0.0,
+            'revenue_delta': round(float(self.projected_revenue[i] - self.current_revenue[i]), 2),
+            'conversions_delta': round(float(self.conversions_delta[i]), 1),
+        } for i in order]
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict:
+        return {
+            'budget': round(float(self.recommended.sum()), 2),
+            'daily_uplift': round(self.daily_uplift, 2),
+            'monthly_uplift': round(self.monthly_uplift, 2),
+            'marginal_roi': round(self.marginal_roi, 4),
+            'moves': self.moves(limit),
+            'organic': list(self.organic),
+            'note': self.note,
+        }
+
+
+def plan_budget(channels: Sequence[str], matrices: Dict[str, np.ndarray], conversion_rate: np.ndarray,
+                cost_per_click: np.ndarray, budget: Optional[float] = None,
+                max_change: float = DEFAULT_MAX_CHANGE) -> BudgetPlan:
+    """Reallocate daily spend across paid channels, each within ``max_change`` of its current spend
+
+    ``matrices`` holds (channels, days) ``cost``, ``revenue``, ``traffic``
+    and ``conversions``. ``budget`` defaults to today's total, i.e. a
+    budget-neutral reshuffle. ``conversion_rate`` and ``cost_per_click``
+    turn spend changes into expected conversions; where they are 0
+    (unknown) the channel's observed rates are used instead.
+    """
+    scale, elasticity, spend, _ = fit_response_curves(matrices['cost'], matrices['revenue'])
+    paid = spend > 0
+    current = spend[paid]
+    if budget is None:
+        budget = float(current.sum())
+    note = ''
+    if not paid.any():
+        if budget > 0:
+            raise ValueError("no channel has spend to reallocate")
+        recommended, marginal = current, 0.0
+    elif not (scale[paid] > 0).any():
+        # Without revenue there is no curve to trade spend along
+        recommended, marginal = current, 0.0
+        note = "no paid channel has revenue to fit a response curve; spend is left unchanged"
+    else:
+        recommended, marginal = allocate(scale[paid], elasticity[paid], budget,
+                                         current * (1 - max_change), current * (1 + max_change))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        traffic = np.nanmean(matrices['traffic'][paid], axis=1)
+        observed_cpc = current / traffic
+        observed_rate = np.nanmean(matrices['conversions'][paid], axis=1) / traffic
+        cpc = np.where(cost_per_click[paid] > 0, cost_per_click[paid], observed_cpc)
+        rate = np.where(conversion_rate[paid] > 0, conversion_rate[paid], observed_rate)
+        conversions_delta = np.nan_to_num((recommended - current) / cpc * rate)
+
+    return BudgetPlan(
+        channels=[channels[i] for i in np.flatnonzero(paid)],
+        current=current,
+        recommended=recommended,
+        current_revenue=response(scale[paid], elasticity[paid], current),
+        projected_revenue=response(scale[paid], elasticity[paid], recommended),
+        conversions_delta=conversions_delta,
+        elasticity=elasticity[paid],
+        marginal_roi=marginal,
+        organic=[channels[i] for i in np.flatnonzero(~paid)],
+        note=note,
+    )
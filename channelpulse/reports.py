@@ -0,0 +1,240 @@
+"""Batch rendering of channel reports to Markdown, CSV and PDF
+
+``BatchReportEngine`` renders one report per ``ReportJob`` on a process pool.
+Jobs point at a metrics snapshot rather than carrying data, so each worker
+memory-maps the tenant's snapshot once, computes every channel's summary for
+the window in one vectorized pass, and reuses both for all of that tenant's
+reports. Workers write their files straight to disk and hand back only the
+byte count; the parent keeps a bounded number of jobs in flight and streams a
+manifest row per finished report, so memory stays flat however long the job
+iterator is.
+"""
+
+import csv
+import hashlib
+import os
+import re
+import textwrap
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from channelpulse.snapshot import META_FILE, load_snapshot, resolve_snapshot
+from channelpulse.store import COLUMNS
+
+FORMATS = ('md', 'csv', 'pdf')
+MAX_OPEN_SNAPSHOTS = 4
+_UNSAFE_FILE_CHARS = re.compile(r'[^\w.-]')
+
+
+class ReportJob(NamedTuple):
+    source: str             # snapshot directory with the tenant's metrics
+    channel: str
+    channel_name: str
+    insight: Dict
+    output_stem: str        # output path without extension
+    formats: Tuple[str, ...] = ('md',)
+    window: int = 7
+    generated_at: str = ''
+
+
+def report_stem(output_dir: str, key: str) -> str:
+    """Output path without extension for ``key``, always a file directly inside ``output_dir``
+
+    Channel keys come from ingested events, so anything outside ``[\\w.-]`` and
+    a leading dot are replaced; a changed key gets a hash suffix, so two keys
+    never share a file.
+    """
+    name = _UNSAFE_FILE_CHARS.sub('_', key)[:100]
+    if name.startswith('.'):
+        name = '_' + name[1:]
+    if name != key:
+        name = f"{name}-{hashlib.sha1(key.encode('utf-8', 'surrogatepass')).hexdigest()[:8]}"
+    return os.path.join(output_dir, name)
+
+
+def render_markdown(channel_name: str, summary: Dict, insight: Dict, generated_at: str) -> str:
+    """The executive report for one channel"""
+    current = summary.get('current') or dict.fromkeys(COLUMNS, 0)
+    return f"""
+# ChannelPulse AI Report
+**Generated on:** {generated_at}
+**Primary Channel:** {channel_name}
+
+## Executive Summary
+{insight['content']}
+
+## Performance Metrics
+- **Traffic:** {current['traffic']:,} visitors
+- **Conversions:** {current['conversions']:,}
+- **Revenue:** ${current['revenue']:,}
+- **ROI:** {current['roi']}x
+
+## Recommendations
+1. **Action:** {insight['action']}
+2. **Expected Impact:** {insight['impact']}
+3. **Implementation Timeline:** 2-4 weeks
+
+## Next Steps
+- Implement cross-channel retargeting
+- Optimize budget allocation
+- Monitor performance metrics
+- Schedule monthly review
+
+---
+*Generated by ChannelPulse AI - Dynamic Multi-Channel Insights*
+    """
+
+
+def write_csv(path: str, job: ReportJob, summary: Dict):
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['channel', 'metric', f'last_{job.window}_days', 'change_pct'])
+        for column in COLUMNS:
+            current = summary['current'][column] if summary else 0
+            change = summary['changes'][column] if summary else 0.0
+            writer.writerow([job.channel, column, current, change])
+        writer.writerow([job.channel, 'recommended_action', job.insight['action'], ''])
+
+
+def _pdf_text(line: str) -> str:
+    line = line.replace('**', '').lstrip('#').strip()
+    line = line.encode('latin-1', 'ignore').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: str, markdown: str, lines_per_page: int = 48, width: int = 90):
+    """Plain-text PDF (Helvetica, US Letter) written without third-party libraries"""
+    lines = []
+    for raw in markdown.strip().splitlines():
+        lines.extend(textwrap.wrap(_pdf_text(raw), width) or [''])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /Name /F1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>']
+    kids = []
+    for page in pages:
+        body = ['BT /F1 11 Tf 14 TL 56 740 Td']
+        body += [f'({line}) Tj T*' for line in page]
+        body.append('ET')
+        stream = '\n'.join(body).encode('latin-1')
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        kids.append(f'{page_id} 0 R')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>'.encode())
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(pages)} >>'.encode()
+
+    with open(path, 'wb') as handle:
+        handle.write(b'%PDF-1.4\n')
+        offsets = []
+        for number, obj in enumerate(objects, start=1):
+            offsets.append(handle.tell())
+            handle.write(b'%d 0 obj\n' % number + obj + b'\nendobj\n')
+        xref = handle.tell()
+        handle.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for offset in offsets:
+            handle.write(b'%010d 00000 n \n' % offset)
+        handle.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+
+
+# Per-process cache of opened snapshots and their per-window summaries
+_sources: 'OrderedDict[tuple, Tuple[object, Dict[int, Dict[str, Dict]]]]' = OrderedDict()
+
+
+def _summary(source: str, channel: str, window: int) -> Dict:
+    # Each save publishes a new version directory, so it keys the cache (mtime covers unversioned ones)
+    directory = resolve_snapshot(source) or source
+    key = (directory, os.stat(os.path.join(directory, META_FILE)).st_mtime_ns)
+    entry = _sources.get(key)
+    if entry is None:
+        entry = _sources[key] = (load_snapshot(source), {})
+        while len(_sources) > MAX_OPEN_SNAPSHOTS:
+            _sources.popitem(last=False)
+    _sources.move_to_end(key)
+
+    store, by_window = entry
+    summaries = by_window.get(window)
+    if summaries is None:
+        batch = store.summaries(window)
+        summaries = by_window[window] = {
+            name: {
+                'current': {column: batch['current'][column][i].item() for column in COLUMNS},
+                'changes': {column: batch['changes'][column][i].item() for column in COLUMNS},
+            }
+            for i, name in enumerate(batch['channels']) if store.has_data(name)
+        }
+    return summaries.get(channel, {})
+
+
+def render_report(job: ReportJob) -> Tuple[str, int]:
+    """Write one report in every requested format; returns (stem, bytes written)"""
+    summary = _summary(job.source, job.channel, job.window)
+    markdown = render_markdown(job.channel_name, summary, job.insight, job.generated_at)
+
+    directory = os.path.dirname(job.output_stem)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    written = 0
+    for fmt in job.formats:
+        path = f'{job.output_stem}.{fmt}'
+        if fmt == 'md':
+            with open(path, 'w') as handle:
+                handle.write(markdown)
+        elif fmt == 'csv':
+            write_csv(path, job, summary)
+        elif fmt == 'pdf':
+            write_pdf(path, markdown)
+        else:
+            raise ValueError(f"Unknown report format: {fmt}")
+        written += os.path.getsize(path)
+    return job.output_stem, written
+
+
+class BatchReportEngine:
+    """Render report jobs on a process pool with bounded memory"""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        # workers=0 renders in the calling process
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(self.workers, 1) * 4
+
+    def run(self, jobs: Iterable[ReportJob], manifest_path: Optional[str] = None) -> Dict:
+        """Render every job; returns counts and throughput in reports/sec"""
+        started = time.perf_counter()
+        stats = {'reports': 0, 'bytes': 0}
+        manifest = open(manifest_path, 'w', newline='') if manifest_path else None
+        writer = csv.writer(manifest) if manifest else None
+        if writer:
+            writer.writerow(['output', 'bytes'])
+
+        def record(stem: str, size: int):
+            stats['reports'] += 1
+            stats['bytes'] += size
+            if writer:
+                writer.writerow([stem, size])
+
+        try:
+            if self.workers == 0:
+                for job in jobs:
+                    record(*render_report(job))
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    pending = set()
+                    for job in jobs:
+                        if len(pending) >= self.max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                record(*future.result())
+                        pending.add(pool.submit(render_report, job))
+                    for future in wait(pending).done:
+                        record(*future.result())
+        finally:
+            if manifest:
+                manifest.close()
+
+        stats['seconds'] = time.perf_counter() - started
+        stats['reports_per_second'] = stats['reports'] / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
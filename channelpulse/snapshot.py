@@ -0,0 +1,159 @@
+"""On-disk MetricsStore snapshots opened through memory mapping
+
+A snapshot is a directory holding one raw ``.npy`` file per backing array plus
+``meta.json`` (channel dictionary, start date, rolling windows). Loading maps
+the column files copy-on-write instead of reading them, so start-up cost does
+not grow with history length and every worker process that opens the same
+snapshot shares one copy of the pages in the OS page cache. A worker that
+later writes (e.g. via ingestion) only copies the pages it touches.
+
+Each save writes a new version directory inside the snapshot path and then
+publishes it by atomically replacing the ``CURRENT`` pointer file, so a reader
+always finds either the previous snapshot or the new one, never a gap. The
+version a save replaces is kept for readers that resolved it just before the
+swap; older ones are removed. Snapshots from before versioning, with their
+files directly under the path, are still read.
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from channelpulse.catalog import ChannelIds
+from channelpulse.store import MetricsStore
+
+SNAPSHOT_VERSION = 1
+META_FILE = 'meta.json'
+POINTER_FILE = 'CURRENT'
+VERSION_PREFIX = 'v-'
+# Re-resolutions when saves retire a version while it is being opened
+LOAD_ATTEMPTS = 5
+ARRAYS = ('values', 'roi', 'first', 'last', 'rolling_current', 'rolling_previous')
+
+
+def resolve_snapshot(path: str) -> Optional[str]:
+    """Directory holding the snapshot currently published at ``path``, None if there is none"""
+    try:
+        with open(os.path.join(path, POINTER_FILE)) as handle:
+            return os.path.join(path, handle.read().strip())
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    # Unversioned snapshot: files directly under ``path``
+    return path if os.path.isfile(os.path.join(path, META_FILE)) else None
+
+
+def snapshot_exists(path: str) -> bool:
+    return resolve_snapshot(path) is not None
+
+
+def snapshot_channels(path: str) -> List[str]:
+    """Channel keys of the snapshot at ``path`` in row order, read without opening its arrays"""
+    directory = resolve_snapshot(path)
+    if directory is None:
+        raise FileNotFoundError(f"No snapshot at {path}")
+    with open(os.path.join(directory, META_FILE)) as handle:
+        return json.load(handle)['channels']
+
+
+def save_snapshot(store: MetricsStore, path: str, replace: bool = True) -> bool:
+    """Write the store to ``path`` and publish it atomically
+
+    With ``replace=False`` an existing snapshot is left alone: nothing is
+    published and False is returned, also when another writer creates one
+    first.
+    """
+    if not replace and snapshot_exists(path):
+        return False
+    meta, arrays = store.export_state()
+    meta['version'] = SNAPSHOT_VERSION
+
+    os.makedirs(path, exist_ok=True)
+    version = f'{VERSION_PREFIX}{time.time_ns():016x}-{os.getpid()}'
+    directory = os.path.join(path, version)
+    os.makedirs(directory)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(array))
+    with open(os.path.join(directory, META_FILE), 'w') as handle:
+        json.dump(meta, handle)
+
+    previous = resolve_snapshot(path)
+    staged_pointer = os.path.join(path, f'{POINTER_FILE}.{version}')
+    with open(staged_pointer, 'w') as handle:
+        handle.write(version)
+    try:
+        if replace:
+            os.replace(staged_pointer, os.path.join(path, POINTER_FILE))
+        else:
+            # Hard-linking fails if the pointer exists, so a racing first save cannot be overwritten
+            os.link(staged_pointer, os.path.join(path, POINTER_FILE))
+    except FileExistsError:
+        shutil.rmtree(directory, ignore_errors=True)
+        return False
+    finally:
+        if os.path.exists(staged_pointer):
+            os.remove(staged_pointer)
+
+    _remove_retired(path, keep={version, os.path.basename(previous or '')}, legacy=previous == path)
+    return True
+
+
+def _remove_retired(path: str, keep: set, legacy: bool):
+    """Delete version directories older than the ones in ``keep``, and unversioned files if ``legacy``"""
+    oldest = min(name for name in keep if name.startswith(VERSION_PREFIX))
+    for name in os.listdir(path):
+        if name.startswith(VERSION_PREFIX) and name < oldest:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+    if legacy:
+        for name in (META_FILE,) + tuple(f'{array}.npy' for array in ARRAYS):
+            try:
+                os.remove(os.path.join(path, name))
+            except FileNotFoundError:
+                pass
+
+
+def _load_array(path: str, mmap_mode):
+    try:
+        return np.load(path, mmap_mode=mmap_mode)
+    except ValueError:
+        # Zero-length arrays cannot be mapped
+        return np.load(path)
+
+
+def load_snapshot(path: str, mmap_mode='c', windows=None, ids: Optional[ChannelIds] = None) -> MetricsStore:
+    """Open a snapshot as a MetricsStore
+
+    ``mmap_mode='c'`` maps columns copy-on-write, ``'r'`` maps them read-only
+    and ``None`` reads them fully into memory. ``ids`` is the channel id
+    dictionary to number the store's channels with (a new one if None).
+    """
+    for attempt in range(LOAD_ATTEMPTS):
+        directory = resolve_snapshot(path)
+        if directory is None:
+            raise FileNotFoundError(f"No snapshot at {path}")
+        try:
+            meta, arrays = _read_version(directory, mmap_mode)
+        except FileNotFoundError:
+            meta = None
+        # Newer saves may retire the version while it is being opened; then open the current one
+        if meta is not None and os.path.isfile(os.path.join(directory, META_FILE)):
+            break
+        if attempt == LOAD_ATTEMPTS - 1:
+            raise FileNotFoundError(f"Snapshot at {path} kept changing while being opened")
+    if meta.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {meta.get('version')!r} in {path}")
+    return MetricsStore.from_state(meta, arrays, windows=windows, ids=ids)
+
+
+def _read_version(directory: str, mmap_mode):
+    with open(os.path.join(directory, META_FILE)) as handle:
+        meta = json.load(handle)
+    arrays = {}
+    for name in ARRAYS:
+        file_path = os.path.join(directory, f'{name}.npy')
+        if os.path.exists(file_path):
+            arrays[name] = _load_array(file_path, mmap_mode)
+    return meta, arrays
@@ -0,0 +1,580 @@
+"""Columnar multi-channel metrics store
+
+Every channel lives in one table keyed by (channel_id, date). Channel keys are
+dictionary-encoded to dense integer ids (by a ``ChannelIds`` that a workspace
+shares with its catalog and story index) and each metric is a contiguous
+NumPy block of shape (channels, days), so summaries, comparisons and ROI rankings
+are one vectorized pass over all channels instead of a pandas call per channel.
+Trailing-window sums for the configured summary windows are maintained
+incrementally by ``RollingAggregates`` as rows are written, and weekly and
+4-weekly bucket sums for long-range charts by ``ResolutionTiers``.
+
+pandas is only imported by the methods that build or parse DataFrames, so
+opening a snapshot and serving summaries needs NumPy alone.
+"""
+
+import threading
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from channelpulse.aggregates import SUMMARY_WINDOWS, ResolutionTiers, RollingAggregates
+from channelpulse.catalog import ChannelIds
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+METRICS = ('traffic', 'conversions', 'revenue', 'cost')
+COLUMNS = METRICS + ('roi',)
+# Counters reported by MetricsStore.stats()
+STORE_OPS = ('bulk_loads', 'appends', 'rolling_reads', 'gathered_reads')
+
+
+def compute_roi(revenue, cost):
+    """ROI as used across the dashboard: revenue per unit of (non-zero) cost"""
+    return np.round(np.asarray(revenue, dtype=np.float64) / np.maximum(cost, 1), 2)
+
+
+class MetricsStore:
+    """Daily channel metrics stored as dense (channel_id, day) columns"""
+
+    def __init__(self, start_date=None, channel_capacity: int = 8, day_capacity: int = 64,
+                 windows=SUMMARY_WINDOWS, ids: Optional[ChannelIds] = None):
+        # Key <-> id dictionary, possibly shared: it may hold ids with no row here yet
+        self.channel_ids = ChannelIds() if ids is None else ids
+        self._codes, self._keys = self.channel_ids.codes, self.channel_ids.keys
+        self._start = None if start_date is None else np.datetime64(start_date, 'D')
+        self._values = np.zeros((len(METRICS), channel_capacity, day_capacity), dtype=np.int64)
+        self._roi = np.zeros((channel_capacity, day_capacity), dtype=np.float64)
+        # Inclusive day range holding data for each channel, -1 when empty
+        self._first = np.full(channel_capacity, -1, dtype=np.int64)
+        self._last = np.full(channel_capacity, -1, dtype=np.int64)
+        # Bumped on every write so caches can tell when data changed
+        self._versions = np.zeros(channel_capacity, dtype=np.int64)
+        # Store version of each channel's latest write, for change feeds
+        self._touched = np.zeros(channel_capacity, dtype=np.int64)
+        self.version = 0
+        self._ops = dict.fromkeys(STORE_OPS, 0)
+        self.rolling = RollingAggregates(self, windows)
+        self.tiers = ResolutionTiers(self)
+        # Held by writers (e.g. the ingestion pipeline) and by multi-step reads
+        self.lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Channel dictionary
+    # ------------------------------------------------------------------
+    @property
+    def channels(self) -> List[str]:
+        """Keys of the channels holding data, in channel_id order"""
+        return [self._keys[i] for i in self._ids()]
+
+    @property
+    def channel_capacity(self) -> int:
+        return self._values.shape[1]
+
+    @property
+    def day_capacity(self) -> int:
+        return self._values.shape[2]
+
+    @property
+    def start_date(self) -> Optional[np.datetime64]:
+        """Date of day offset 0, None before the first write"""
+        return self._start
+
+    @property
+    def end_date(self) -> Optional[np.datetime64]:
+        """Latest date holding data in any channel, None while empty"""
+        last = self._last[:self._size()]
+        if self._start is None or not (last >= 0).any():
+            return None
+        return self._start + int(last.max())
+
+    @property
+    def n_columns(self) -> int:
+        return len(COLUMNS)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays and rolling aggregates"""
+        return (self._values.nbytes + self._roi.nbytes + self._first.nbytes + self._last.nbytes
+                + self._versions.nbytes + self._touched.nbytes + self.rolling.nbytes + self.tiers.nbytes)
+
+    def __len__(self) -> int:
+        return len(self._ids())
+
+    def __contains__(self, channel) -> bool:
+        return self.has_data(channel)
+
+    def channel_id(self, channel: str) -> int:
+        """Integer id of a channel key, raising KeyError if unknown"""
+        return self._codes[channel]
+
+    def add_channel(self, channel: str) -> int:
+        """Register a channel key, make room for its row and return its integer id"""
+        code = self.channel_ids.intern(channel)
+        self._reserve(code + 1, self._values.shape[2])
+        return code
+
+    def _row(self, channel: str) -> Optional[int]:
+        """Id of a channel with a row in the backing arrays, None otherwise"""
+        code = self._codes.get(channel)
+        return code if code is not None and code < len(self._first) else None
+
+    def _size(self) -> int:
+        """Number of ids with a row (ids past it have no data)"""
+        return min(len(self._keys), len(self._first))
+
+    def channel_version(self, channel: str) -> int:
+        """Write counter for one channel, 0 if it has never been written"""
+        code = self._row(channel)
+        return 0 if code is None else int(self._versions[code])
+
+    def changed_since(self, version: int) -> List[str]:
+        """Channels written after store version ``version``"""
+        with self.lock:
+            return [self._keys[i] for i in np.flatnonzero(self._touched[:self._size()] > version)]
+
+    def _touch(self, code: int):
+        self._versions[code] += 1
+        self.version += 1
+        self._touched[code] = self.version
+
+    def has_data(self, channel: str) -> bool:
+        code = self._row(channel)
+        return code is not None and self._first[code] >= 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def load_series(self, channel: str, dates, traffic, conversions, revenue, cost, roi=None):
+        """Bulk write one channel's daily rows, overwriting existing days"""
+        import pandas as pd
+
+        dates = pd.DatetimeIndex(dates).values.astype('datetime64[D]')
+        with self.lock:
+            code = self.add_channel(channel)
+            if len(dates) == 0:
+                return
+            days = self._day_index(dates)
+            self._reserve(code + 1, int(days.max()) + 1)
+
+            for i, column in enumerate((traffic, conversions, revenue, cost)):
+                self._values[i, code, days] = np.asarray(column, dtype=np.int64)
+            self._roi[code, days] = compute_roi(revenue, cost) if roi is None else np.asarray(roi, dtype=np.float64)
+            self._extend_range(code, int(days.min()), int(days.max()))
+            self.rolling.rebuild(code)
+            self.tiers.mark_stale(code)
+            self._ops['bulk_loads'] += 1
+            self._touch(code)
+
+    def append(self, channel: str, date, traffic: int = 0, conversions: int = 0,
+               revenue: int = 0, cost: int = 0, roi: Optional[float] = None):
+        """Write a single (channel, date) row, overwriting any existing value"""
+        with self.lock:
+            code = self.add_channel(channel)
+            day = int(self._day_index(np.array([np.datetime64(date, 'D')]))[0])
+            self._reserve(code + 1, day + 1)
+            first, last = int(self._first[code]), int(self._last[code])
+            before = self.row_values(code, np.array([day]), first)
+
+            self._values[:, code, day] = (traffic, conversions, revenue, cost)
+            self._roi[code, day] = compute_roi(revenue, cost) if roi is None else roi
+            self._extend_range(code, day, day)
+
+            after = self.row_values(code, np.array([day]), 0)
+            self.rolling.on_write(code, day, (after - before)[0], first, last)
+            self.tiers.on_write(code, day, (after - before)[0])
+            self._ops['appends'] += 1
+            self._touch(code)
+
+    def lookup(self, channel: str, date) -> np.ndarray:
+        """Stored METRICS values for one (channel, date), zeros if absent"""
+        with self.lock:
+            code = self._row(channel)
+            if code is None or self._start is None:
+                return np.zeros(len(METRICS), dtype=np.int64)
+            day = int((np.datetime64(date, 'D') - self._start).astype(np.int64))
+            if day < self._first[code] or day > self._last[code]:
+                return np.zeros(len(METRICS), dtype=np.int64)
+            return self._values[:, code, day].copy()
+
+    def _extend_range(self, code: int, first: int, last: int):
+        if self._first[code] < 0:
+            self._first[code], self._last[code] = first, last
+        else:
+            self._first[code] = min(self._first[code], first)
+            self._last[code] = max(self._last[code], last)
+
+    def _day_index(self, dates: np.ndarray) -> np.ndarray:
+        """Map datetime64[D] values to day offsets, shifting the origin back if needed"""
+        if self._start is None:
+            self._start = dates.min()
+            self.tiers.realign()
+        shift = int((self._start - dates.min()).astype(np.int64))
+        if shift > 0:
+            # Dates before the current origin: prepend room for them
+            self._values = np.concatenate(
+                [np.zeros(self._values.shape[:2] + (shift,), dtype=np.int64), self._values], axis=2)
+            self._roi = np.concatenate([np.zeros((self._roi.shape[0], shift)), self._roi], axis=1)
+            has_data = self._first >= 0
+            self._first[has_data] += shift
+            self._last[has_data] += shift
+            self._start = self._start - shift
+            self.tiers.realign()
+        return (dates - self._start).astype(np.int64)
+
+    def _reserve(self, channels: int, days: int):
+        """Grow the backing arrays geometrically to hold the requested shape"""
+        n_metrics, channel_cap, day_cap = self._values.shape
+        if channels <= channel_cap and days <= day_cap:
+            return
+        new_channels = max(channel_cap, 1)
+        while new_channels < channels:
+            new_channels *= 2
+        new_days = max(day_cap, 1)
+        while new_days < days:
+            new_days *= 2
+
+        values = np.zeros((n_metrics, new_channels, new_days), dtype=np.int64)
+        values[:, :channel_cap, :day_cap] = self._values
+        roi = np.zeros((new_channels, new_days), dtype=np.float64)
+        roi[:channel_cap, :day_cap] = self._roi
+        self._values, self._roi = values, roi
+        self.tiers.reserve(new_channels, new_days)
+
+        if new_channels > channel_cap:
+            pad = np.full(new_channels - channel_cap, -1, dtype=np.int64)
+            self._first = np.concatenate([self._first, pad])
+            self._last = np.concatenate([self._last, pad])
+            self._versions = np.concatenate([self._versions, np.zeros_like(pad)])
+            self._touched = np.concatenate([self._touched, np.zeros_like(pad)])
+            self.rolling.reserve(new_channels)
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+    def day_range(self, code: int) -> Tuple[int, int]:
+        """Inclusive day offsets holding data for a channel id, (-1, -1) when empty"""
+        if code >= len(self._first):
+            return -1, -1
+        return int(self._first[code]), int(self._last[code])
+
+    def dates(self, channel: str) -> np.ndarray:
+        first, last = self.day_range(self._codes[channel])
+        if first < 0:
+            return np.array([], dtype='datetime64[D]')
+        return self._start + np.arange(first, last + 1)
+
+    def series(self, channel: str, column: str) -> np.ndarray:
+        """One channel's full history of a single column (read-only view)"""
+        code = self._codes[channel]
+        first, last = self.day_range(code)
+        if first < 0:
+            return np.array([], dtype=np.float64 if column == 'roi' else np.int64)
+        if column == 'roi':
+            view = self._roi[code, first:last + 1]
+        else:
+            view = self._values[METRICS.index(column), code, first:last + 1]
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def resolution_series(self, channel: str, column: str, days: Optional[int] = None,
+                          max_points: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, str]:
+        """A channel's trailing ``days`` (all history if None) at the finest fitting resolution
+
+        Daily rows are returned while they number at most ``max_points``,
+        otherwise the first resolution tier that does (or the coarsest), as
+        per-day means of each bucket. Returns ``(dates, values, resolution)``.
+        """
+        with self.lock:
+            code = self._codes[channel]
+            first, last = self.day_range(code)
+            if first < 0:
+                return np.array([], dtype='datetime64[D]'), np.array([]), 'daily'
+            start = first if days is None else max(first, last - days + 1)
+            length = last - start + 1
+
+            if max_points is None or length <= max_points:
+                values = np.array(self.series(channel, column)[start - first:])
+                return self._start + np.arange(start, last + 1), values, 'daily'
+
+            tiers = list(self.tiers.tiers.items())
+            name = next((name for name, bucket_days in tiers if length / bucket_days <= max_points), tiers[-1][0])
+            offsets, values = self.tiers.series(code, name, COLUMNS.index(column), start, last)
+            return self._start + offsets, values, name
+
+    def frame(self, channel: str) -> 'pd.DataFrame':
+        """One channel's history in the dashboard's per-channel DataFrame shape"""
+        import pandas as pd
+
+        with self.lock:
+            if not self.has_data(channel):
+                raise KeyError(channel)
+            data = {'date': pd.DatetimeIndex(self.dates(channel))}
+            for column in COLUMNS:
+                data[column] = np.array(self.series(channel, column))
+        return pd.DataFrame(data)
+
+    def aligned(self, column: str) -> Tuple[List[str], Optional[np.datetime64], np.ndarray]:
+        """Every channel's history of one column on a shared date axis
+
+        Returns ``(channels, start_date, matrix)`` where ``matrix`` is float64
+        (channels, days) with NaN outside each channel's own date range.
+        """
+        with self.lock:
+            ids = self._ids()
+            if len(ids) == 0:
+                return [], self._start, np.empty((0, 0))
+            n_days = int(self._last[ids].max()) + 1
+            if column == 'roi':
+                matrix = self._roi[ids, :n_days].astype(np.float64)
+            else:
+                matrix = self._values[METRICS.index(column)][ids, :n_days].astype(np.float64)
+            days = np.arange(n_days)
+            outside = (days < self._first[ids][:, None]) | (days > self._last[ids][:, None])
+            matrix[outside] = np.nan
+            return [self._keys[i] for i in ids], self._start, matrix
+
+    def trailing(self, column: str, window: int) -> Tuple[List[str], np.ndarray]:
+        """Every channel's last ``window`` days of one column, aligned on each channel's latest day
+
+        Returns ``(channels, matrix)`` with a float64 (channels, window)
+        matrix, NaN where a channel has less history than the window.
+        """
+        with self.lock:
+            ids = self._ids()
+            days = self._last[ids][:, None] - np.arange(window)[::-1]
+            valid = days >= self._first[ids][:, None]
+            days = np.where(valid, days, 0)
+            if column == 'roi':
+                matrix = self._roi[ids[:, None], days]
+            else:
+                matrix = self._values[METRICS.index(column)][ids[:, None], days].astype(np.float64)
+            matrix[~valid] = np.nan
+            return [self._keys[i] for i in ids], matrix
+
+    def to_frame(self) -> 'pd.DataFrame':
+        """All rows as one long table with a dictionary-encoded channel column"""
+        import pandas as pd
+
+        frames = []
+        with self.lock:
+            for channel in self._keys:
+                if self.has_data(channel):
+                    frame = self.frame(channel)
+                    frame.insert(0, 'channel_id', self._codes[channel])
+                    frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=['channel', 'channel_id', 'date', *COLUMNS])
+        table = pd.concat(frames, ignore_index=True)
+        table.insert(0, 'channel', pd.Categorical.from_codes(table['channel_id'], categories=self._keys))
+        return table
+
+    # ------------------------------------------------------------------
+    # State export, used by channelpulse.snapshot
+    # ------------------------------------------------------------------
+    def export_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """JSON-able metadata and the used region of every backing array"""
+        with self.lock:
+            n_channels = self._size()
+            last = self._last[:n_channels]
+            n_days = int(last.max()) + 1 if n_channels and (last >= 0).any() else 0
+            meta = {
+                'channels': self._keys[:n_channels],
+                'start_date': None if self._start is None else str(self._start),
+                'windows': list(self.rolling.windows),
+            }
+            arrays = {
+                'values': self._values[:, :n_channels, :n_days],
+                'roi': self._roi[:n_channels, :n_days],
+                'first': self._first[:n_channels],
+                'last': last,
+            }
+            current, previous = self.rolling.export_state(n_channels)
+            arrays['rolling_current'] = current
+            arrays['rolling_previous'] = previous
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta: Dict, arrays: Dict[str, np.ndarray],
+                   windows=None, ids: Optional[ChannelIds] = None) -> 'MetricsStore':
+        """Rebuild a store around existing (possibly memory-mapped) arrays
+
+        The arrays are used as-is rather than copied, so a copy-on-write
+        memory map stays shared with other processes until it is written to.
+        With a shared ``ids`` dictionary that numbers the saved channels
+        differently, rows are copied into its order and the rolling sums
+        rebuilt, which gives up the sharing; number the snapshot's channels
+        first (see ``snapshot.snapshot_channels``) to avoid it.
+        """
+        store = cls.__new__(cls)
+        store.channel_ids = ChannelIds() if ids is None else ids
+        store._codes, store._keys = store.channel_ids.codes, store.channel_ids.keys
+        codes = np.array([store.channel_ids.intern(key) for key in meta['channels']], dtype=np.int64)
+        in_order = np.array_equal(codes, np.arange(len(codes)))
+        if not in_order:
+            arrays = dict(arrays)
+            for name, fill in (('values', 0), ('roi', 0), ('first', -1), ('last', -1)):
+                saved = np.asarray(arrays[name])
+                axis = 1 if name == 'values' else 0  # the channel axis
+                shape = list(saved.shape)
+                shape[axis] = int(codes.max()) + 1
+                moved = np.full(shape, fill, dtype=saved.dtype)
+                moved[(slice(None),) * axis + (codes,)] = saved
+                arrays[name] = moved
+        store._start = None if meta['start_date'] is None else np.datetime64(meta['start_date'], 'D')
+        store._values = arrays['values']
+        store._roi = arrays['roi']
+        store._first = np.array(arrays['first'], dtype=np.int64)
+        store._last = np.array(arrays['last'], dtype=np.int64)
+        store._versions = np.zeros(len(store._first), dtype=np.int64)
+        store._touched = np.zeros(len(store._first), dtype=np.int64)
+        store.version = 0
+        store._ops = dict.fromkeys(STORE_OPS, 0)
+        store.lock = threading.RLock()
+
+        saved_windows = tuple(meta['windows'])
+        store.rolling = RollingAggregates(store, saved_windows if windows is None else windows)
+        store.tiers = ResolutionTiers(store)
+        if in_order and store.rolling.windows == saved_windows and 'rolling_current' in arrays:
+            store.rolling.restore(arrays['rolling_current'], arrays['rolling_previous'])
+        else:
+            for code in range(store._size()):
+                if store._first[code] >= 0:
+                    store.rolling.rebuild(code)
+        return store
+
+    # ------------------------------------------------------------------
+    # Vectorized group-bys
+    # ------------------------------------------------------------------
+    def _ids(self, channels: Optional[Sequence[str]] = None) -> np.ndarray:
+        if channels is None:
+            ids = np.arange(self._size())
+        else:
+            ids = np.array([self._codes[ch] for ch in channels], dtype=np.int64)
+            ids = ids[ids < len(self._first)]
+        return ids[self._first[ids] >= 0]
+
+    def row_values(self, code: int, days: np.ndarray, first: int) -> np.ndarray:
+        """Raw rows (len(days), n_columns) for one channel id, zero before ``first``"""
+        valid = (days >= max(first, 0)) & (days < self._values.shape[2])
+        safe = np.where(valid, days, 0)
+        rows = np.empty((len(days), len(COLUMNS)), dtype=np.float64)
+        rows[:, :len(METRICS)] = self._values[:, code, safe].T
+        rows[:, -1] = self._roi[code, safe]
+        rows[~valid] = 0
+        return rows
+
+    def window_sums(self, window: int, offset: int, ids: np.ndarray):
+        """Column sums (n_columns, n) and row counts (n,) over trailing windows
+
+        ``offset`` shifts the window back by that many days from the channel's
+        latest row, so ``offset=window`` is the window before the current one.
+        """
+        ends = self._last[ids] - offset
+        days = ends[:, None] - np.arange(window)[::-1]
+        valid = days >= self._first[ids][:, None]
+        days = np.where(valid, days, 0)
+
+        sums = np.empty((len(COLUMNS), len(ids)), dtype=np.float64)
+        sums[:len(METRICS)] = (self._values[:, ids[:, None], days] * valid).sum(axis=2)
+        sums[-1] = (self._roi[ids[:, None], days] * valid).sum(axis=1)
+        return sums, valid.sum(axis=1)
+
+    def window_counts(self, window: int, offset: int, ids: np.ndarray) -> np.ndarray:
+        """Number of rows each channel has inside a trailing window"""
+        length = self._last[ids] - self._first[ids] + 1
+        return np.clip(length - offset, 0, window)
+
+    def window_totals(self, window: int = 7, offset: int = 0, ids: Optional[np.ndarray] = None):
+        """Sum metrics and average ROI over each channel's trailing window
+
+        Served from the rolling aggregates when ``window`` is maintained and
+        ``offset`` is 0 or ``window``, otherwise gathered from the columns.
+        Returns ``(sums, roi_mean)`` with shapes (len(METRICS), n) and (n,).
+        """
+        if ids is None:
+            ids = self._ids()
+        if window in self.rolling and offset in (0, window):
+            sums = self.rolling.totals(window, ids)[0 if offset == 0 else 1]
+            counts = self.window_counts(window, offset, ids)
+            self._ops['rolling_reads'] += 1
+        else:
+            sums, counts = self.window_sums(window, offset, ids)
+            self._ops['gathered_reads'] += 1
+
+        roi_mean = np.divide(sums[-1], counts, out=np.zeros(len(ids)), where=counts > 0)
+        return np.rint(sums[:len(METRICS)]).astype(np.int64), roi_mean
+
+    def summaries(self, window: int = 7, channels: Optional[Sequence[str]] = None) -> Dict:
+        """Current window, previous window and % change for many channels at once"""
+        with self.lock:
+            ids = self._ids(channels)
+            current_sums, current_roi = self.window_totals(window, 0, ids)
+            previous_sums, previous_roi = self.window_totals(window, window, ids)
+            keys = [self._keys[i] for i in ids]
+
+        current = {metric: current_sums[i] for i, metric in enumerate(METRICS)}
+        previous = {metric: previous_sums[i] for i, metric in enumerate(METRICS)}
+        current['roi'] = np.round(current_roi, 2)
+        previous['roi'] = np.round(previous_roi, 2)
+
+        changes = {}
+        for column in COLUMNS:
+            prev = previous[column].astype(np.float64)
+            change = np.divide(current[column] - prev, prev, out=np.zeros(len(ids)), where=prev != 0)
+            changes[column] = np.round(change * 100, 1)
+
+        return {
+            'channels': keys,
+            'current': current,
+            'previous': previous,
+            'changes': changes,
+        }
+
+    def summary(self, channel: str, window: int = 7) -> Dict:
+        """Single-channel summary with plain Python numbers, {} if no data"""
+        if not self.has_data(channel):
+            return {}
+        batch = self.summaries(window, [channel])
+        current = {column: batch['current'][column][0].item() for column in COLUMNS}
+        changes = {column: batch['changes'][column][0].item() for column in COLUMNS}
+        return {'current': current, 'changes': changes}
+
+    def stats(self) -> Dict[str, int]:
+        """Operation counters plus current size"""
+        stats = dict(self._ops)
+        stats['channels'] = len(self)
+        stats['version'] = self.version
+        return stats
+
+    def roi_ranking(self, window: int = 7) -> List[tuple]:
+        """(channel, ROI) pairs for the trailing window, best first"""
+        with self.lock:
+            ids = self._ids()
+            _, roi = self.window_totals(window, 0, ids)
+            keys = [self._keys[i] for i in ids]
+        roi = np.round(roi, 2)
+        order = np.argsort(-roi, kind='stable')
+        return [(keys[i], roi[i].item()) for i in order]
+
+
+class ChannelFrames(Mapping):
+    """Read-only ``{channel: DataFrame}`` view over a MetricsStore"""
+
+    def __init__(self, store: MetricsStore):
+        self._store = store
+
+    def __getitem__(self, channel: str) -> 'pd.DataFrame':
+        return self._store.frame(channel)
+
+    def __contains__(self, channel) -> bool:
+        return self._store.has_data(channel)
+
+    def __iter__(self) -> Iterator[str]:
+        return (ch for ch in self._store.channels if self._store.has_data(ch))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
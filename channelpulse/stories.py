@@ -0,0 +1,175 @@
+"""Inverted index from channels to insight story templates
+
+Each template lists the channels it talks about. ``StoryIndex`` maps every
+channel to its templates, and keeps a Walker alias table per channel so
+picking a relevance-weighted template is O(1) regardless of how many exist.
+Adding a template appends to the postings of the channels it mentions and
+drops only their alias tables, which are rebuilt on their next lookup.
+
+A template's relevance to a channel is its ``weight`` (default 1.0) divided
+by the number of channels it covers: a story about one channel is a stronger
+match for it than a story spread over several.
+
+Templates are stored column-wise rather than as one dict each: text fields
+in lists, weights in a packed array and the channels of every template as
+integer ids (from a ``ChannelIds`` shared with the catalog) in one flat
+array; each channel's postings are two packed arrays (template ids and
+relevance weights). Lookups return a fresh dict the caller may modify.
+"""
+
+import random
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from channelpulse.catalog import ChannelIds
+
+
+TEXT_FIELDS = ('title', 'content', 'action', 'impact')
+
+ALL_CHANNELS = None
+
+
+class _AliasTable:
+    """Walker/Vose alias table for O(1) sampling from fixed weights"""
+
+    __slots__ = ('items', 'probability', 'alias')
+
+    def __init__(self, items: List[int], weights: List[float]):
+        n = len(items)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights] if total > 0 else [1.0] * n
+        self.items = items
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+
+    def sample(self, rng) -> int:
+        column = int(rng.random() * len(self.items))
+        if rng.random() < self.probability[column]:
+            return self.items[column]
+        return self.items[self.alias[column]]
+
+
+class StoryIndex:
+    """Channel -> story template index with O(1) weighted selection"""
+
+    def __init__(self, stories: Iterable[Dict] = (), ids: Optional[ChannelIds] = None):
+        # Channel keys dictionary-encoded to ids, shared with the catalog and store when given
+        self.channel_ids = ChannelIds() if ids is None else ids
+        # Template columns; channels of template i are _channel_ids[_offsets[i]:_offsets[i + 1]]
+        self._text: Dict[str, List[str]] = {field: [] for field in TEXT_FIELDS}
+        self._weights = array('d')
+        self._offsets = array('q', [0])
+        self._channel_ids = array('i')
+        # Fields other than the standard ones, for the few templates that have them
+        self._extra: Dict[int, Dict] = {}
+        # Channel code -> (template ids, relevance weights) of the templates mentioning it
+        self._postings: Dict[int, Tuple[array, array]] = {}
+        self._tables: Dict[Optional[int], _AliasTable] = {}
+        # Bumped on every add; the ``stories`` list is rebuilt only when it changes
+        self._version = 0
+        self._stories: Tuple[int, List[Dict]] = (0, [])
+        self._lock = threading.Lock()
+        self.extend(stories)
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def add(self, story: Dict) -> int:
+        """Index a new template and return its id"""
+        with self._lock:
+            story_id = len(self._weights)
+            for field in TEXT_FIELDS:
+                self._text[field].append(story.get(field, ''))
+            self._weights.append(float(story.get('weight', 1.0)))
+            extra = {key: value for key, value in story.items()
+                     if key not in TEXT_FIELDS and key not in ('channels', 'weight')}
+            if extra:
+                self._extra[story_id] = extra
+
+            self._tables.pop(ALL_CHANNELS, None)
+            channels = list(dict.fromkeys(story.get('channels', [])))
+            relevance = self._weights[story_id] / len(channels) if channels else 0.0
+            for channel in channels:
+                code = self.channel_ids.intern(channel)
+                self._channel_ids.append(code)
+                ids, weights = self._postings.setdefault(code, (array('q'), array('d')))
+                ids.append(story_id)
+                weights.append(relevance)
+                self._tables.pop(code, None)
+            self._offsets.append(len(self._channel_ids))
+            self._version += 1
+            return story_id
+
+    def extend(self, stories: Iterable[Dict]):
+        for story in stories:
+            self.add(story)
+
+    def story(self, story_id: int) -> Dict:
+        """Template ``story_id`` as a new dict"""
+        story = {field: self._text[field][story_id] for field in TEXT_FIELDS}
+        story['channels'] = [self.channel_ids.keys[code] for code in
+                             self._channel_ids[self._offsets[story_id]:self._offsets[story_id + 1]]]
+        story.update(self._extra.get(story_id, ()))
+        return story
+
+    @property
+    def stories(self) -> List[Dict]:
+        """Every template, in id order (built once per change and shared; do not modify)"""
+        version, stories = self._stories
+        if version != self._version:
+            with self._lock:
+                version = self._version
+                stories = [self.story(i) for i in range(len(self))]
+                self._stories = (version, stories)
+        return stories
+
+    def channels(self) -> List[str]:
+        """Channels mentioned by at least one template, in id order"""
+        keys = self.channel_ids.keys
+        return [keys[code] for code in sorted(self._postings)]
+
+    def for_channel(self, channel: Optional[str]) -> List[Dict]:
+        """Every template mentioning ``channel`` (all templates for None), as new dicts"""
+        if channel is ALL_CHANNELS:
+            return [self.story(i) for i in range(len(self))]
+        with self._lock:
+            postings = self._postings.get(self.channel_ids.get(channel))
+            if postings is None:
+                return []
+            ids = postings[0].tolist()
+        return [self.story(i) for i in ids]
+
+    def _table(self, code: Optional[int]) -> Optional[_AliasTable]:
+        table = self._tables.get(code)
+        if table is None:
+            with self._lock:
+                if code is ALL_CHANNELS:
+                    ids, weights = list(range(len(self._weights))), self._weights.tolist()
+                elif code in self._postings:
+                    ids, weights = (column.tolist() for column in self._postings[code])
+                else:
+                    return None
+                if not ids:
+                    return None
+                table = self._tables[code] = _AliasTable(ids, weights)
+        return table
+
+    def choose(self, channel: Optional[str] = None, rng=random) -> Optional[Dict]:
+        """Relevance-weighted template for ``channel``, any template if it has none"""
+        code = self.channel_ids.get(channel) if channel is not None else None
+        table = self._table(code) if code is not None else None
+        if table is None:
+            table = self._table(ALL_CHANNELS)
+        if table is None:
+            return None
+        return self.story(table.sample(rng))
@@ -0,0 +1,372 @@
+"""Built-in instrumentation: stage timers, handler histograms and counters
+
+Everything is recorded in a process-wide ``Registry`` and rendered in the
+Prometheus text exposition format, either through ``render()`` or the small
+``/metrics`` HTTP server started by ``serve_metrics``. Values that other
+components already count (cache hits, store writes) are pulled at scrape time
+through collectors rather than duplicated.
+
+``SlowRequestProfiler`` is opt-in: while an instrumented handler runs it
+samples the stacks of the threads serving it (the handler's own thread and
+pool workers running ``attributed`` calls on its behalf), skipping threads
+parked in an idle wait. If the request turns out slower than the threshold
+it writes the samples as collapsed stacks (``thread;frame;frame count``),
+which flamegraph.pl, speedscope and inferno read directly.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Innermost frames (file, function) of a thread that is waiting, not working
+IDLE_FRAMES = frozenset({('selectors.py', 'select'), ('threading.py', 'wait'), ('queue.py', 'get'),
+                         ('socketserver.py', 'serve_forever'), ('thread.py', '_worker')})
+
+# (name, type, help, labels, value) rows produced by collectors at scrape time
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for key, value in sorted(labels.items()))
+    return '{' + ','.join(escaped) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, one series per label set"""
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total, value_sum) in sorted(self._series.items()):
+                labels = dict(key)
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": repr(bound)})} {count}')
+                lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": "+Inf"})} {total}')
+                lines.append(f'{self.name}_sum{_format_labels(labels)} {value_sum}')
+                lines.append(f'{self.name}_count{_format_labels(labels)} {total}')
+        return lines
+
+
+class CounterMetric:
+    """Monotonic counter, one series per label set"""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(dict(key))} {value}')
+        return lines
+
+
+class Registry:
+    """Named metrics plus scrape-time collectors"""
+
+    def __init__(self):
+        self.stage_seconds = Histogram(
+            'channelpulse_stage_seconds', 'Time spent in each dashboard stage')
+        self.handler_seconds = Histogram(
+            'channelpulse_handler_seconds', 'Gradio handler latency')
+        self.handler_errors = CounterMetric(
+            'channelpulse_handler_errors_total', 'Gradio handler calls that raised')
+        self.component_updates = CounterMetric(
+            'channelpulse_component_updates_total', 'Dashboard components re-sent (pushed) or left as shown (skipped)')
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = (self.stage_seconds.render() + self.handler_seconds.render() + self.handler_errors.render()
+                 + self.component_updates.render())
+
+        # The exposition format wants each metric's samples together, under one HELP/TYPE header
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector in self._collectors:
+            for name, kind, help, labels, value in collector():
+                family = families.setdefault(name, (kind, help, []))
+                family[2].append(f'{name}{_format_labels(labels)} {value}')
+        for name, (kind, help, samples) in families.items():
+            lines += [f'# HELP {name} {help}', f'# TYPE {name} {kind}'] + samples
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# stats() keys that describe current state rather than counting events
+GAUGE_KEYS = frozenset({'entries', 'max_entries', 'cached', 'in_flight', 'channels', 'queue_depth',
+                        'open_cells', 'events_per_second', 'resident', 'resident_bytes', 'memory_budget',
+                        'sessions', 'bytes', 'max_bytes'})
+
+
+def stats_samples(prefix: str, help: str, stats: Dict, labels: Optional[Dict[str, str]] = None) -> List[Sample]:
+    """Turn a component's ``stats()`` dict into samples; running totals become counters"""
+    samples = []
+    for key, value in stats.items():
+        if key in GAUGE_KEYS:
+            samples.append((f'{prefix}_{key}', 'gauge', f'{help} {key}', labels or {}, value))
+        else:
+            samples.append((f'{prefix}_{key}_total', 'counter', f'{help} {key}', labels or {}, value))
+    return samples
+
+
+@contextmanager
+def stage(name: str, registry: Registry = REGISTRY):
+    """Time a block as one dashboard stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.stage_seconds.observe(time.perf_counter() - started, stage=name)
+
+
+def timed_stage(name: str, func: Callable, registry: Registry = REGISTRY) -> Callable:
+    """Wrap ``func`` so each call is recorded as stage ``name``"""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with stage(name, registry):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with stage(name, registry):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# Profiler token of the request the current context serves
+_request_token: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar('request_token', default=None)
+
+
+class SlowRequestProfiler:
+    """Sample the serving threads' stacks during requests and keep the ones slower than a threshold"""
+
+    def __init__(self, threshold_seconds: float, output_dir: str = 'profiles',
+                 interval: float = 0.005):
+        self.threshold_seconds = threshold_seconds
+        self.output_dir = output_dir
+        self.interval = interval
+        # token -> (handler name, stack samples, ids of the threads serving it)
+        self._active: Dict[int, Tuple[str, Counter, Counter]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._next_token = 0
+        self.dumps = 0
+        threading.Thread(target=self._run, name='channelpulse-profiler', daemon=True).start()
+
+    def begin(self, name: str) -> int:
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._active[token] = (name, Counter(), Counter([threading.get_ident()]))
+            self._wake.set()
+        return token
+
+    def add_thread(self, token: int, thread_id: int):
+        with self._lock:
+            if token in self._active:
+                self._active[token][2][thread_id] += 1
+
+    def remove_thread(self, token: int, thread_id: int):
+        with self._lock:
+            if token in self._active:
+                self._active[token][2].subtract([thread_id])
+
+    def end(self, token: int, elapsed: float) -> Optional[str]:
+        """Finish a request; returns the dump path if it was slow"""
+        with self._lock:
+            name, samples, _ = self._active.pop(token)
+            if not self._active:
+                self._wake.clear()
+        if elapsed < self.threshold_seconds or not samples:
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f'{name}-{int(time.time() * 1000)}-{token}.folded')
+        with open(path, 'w') as handle:
+            for stack, count in samples.most_common():
+                handle.write(f'{stack} {count}\n')
+        self.dumps += 1
+        return path
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                serving = {token: [ident for ident, n in threads.items() if n > 0]
+                           for token, (_, _, threads) in self._active.items()}
+            frames = sys._current_frames()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = {}
+            for ident in {ident for idents in serving.values() for ident in idents}:
+                frame = frames.get(ident)
+                if frame is None or (os.path.basename(frame.f_code.co_filename),
+                                     frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                stacks[ident] = ';'.join(reversed(parts))
+            with self._lock:
+                for token, idents in serving.items():
+                    if token in self._active:
+                        self._active[token][1].update(stacks[ident] for ident in idents if ident in stacks)
+            time.sleep(self.interval)
+
+
+_profiler: Optional[SlowRequestProfiler] = None
+
+
+def enable_profiler(threshold_seconds: float, output_dir: str = 'profiles',
+                    interval: float = 0.005) -> SlowRequestProfiler:
+    """Turn on slow-request stack dumps for every instrumented handler"""
+    global _profiler
+    _profiler = SlowRequestProfiler(threshold_seconds, output_dir, interval)
+    return _profiler
+
+
+def attributed(func: Callable) -> Callable:
+    """Wrap ``func`` so a pool thread running it is profiled as serving the calling request"""
+    token = _request_token.get()
+    if _profiler is None or token is None:
+        return func
+    profiler = _profiler
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        ident = threading.get_ident()
+        profiler.add_thread(token, ident)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.remove_thread(token, ident)
+    return wrapper
+
+
+def instrument_handler(name: str, registry: Registry = REGISTRY) -> Callable:
+    """Decorator recording latency (and optional profiles) for a handler"""
+
+    def finish(token, started, failed):
+        elapsed = time.perf_counter() - started
+        registry.handler_seconds.observe(elapsed, handler=name)
+        if failed:
+            registry.handler_errors.inc(handler=name)
+        if token is not None:
+            _profiler.end(token, elapsed)
+
+    def decorator(func):
+        if inspect.isasyncgenfunction(func):
+            # Streaming handlers: time the whole stream (a profile cannot span the yields)
+            @functools.wraps(func)
+            async def stream_wrapper(*args, **kwargs):
+                started, failed = time.perf_counter(), True
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                    failed = False
+                finally:
+                    finish(None, started, failed)
+            return stream_wrapper
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                token = _profiler.begin(name) if _profiler else None
+                reset = _request_token.set(token)
+                started, failed = time.perf_counter(), True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    _request_token.reset(reset)
+                    finish(token, started, failed)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _profiler.begin(name) if _profiler else None
+            reset = _request_token.set(token)
+            started, failed = time.perf_counter(), True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _request_token.reset(reset)
+                finish(token, started, failed)
+        return wrapper
+
+    return decorator
+
+
+def serve_metrics(host: str = '0.0.0.0', port: int = 9464,
+                  registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Expose ``registry`` at ``http://host:port/metrics`` on a background thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='channelpulse-metrics', daemon=True).start()
+    return server
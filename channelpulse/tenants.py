@@ -0,0 +1,211 @@
+"""Per-account workspaces created on first use and evicted under a memory budget
+
+``TenantRegistry`` maps a tenant id to a workspace (in the app, one
+ChannelPulseAI per client account) that ``factory(tenant)`` creates or loads
+the first time it is needed. Resident workspaces are kept in LRU order; when
+their combined size passes ``memory_budget`` the least recently used ones are
+handed to ``on_evict`` (e.g. to persist a snapshot) and dropped, so memory
+follows the set of active tenants rather than every account on the
+deployment. ``start_maintenance`` re-measures resident workspaces (they grow
+with ingestion) and drops idle ones on a background thread, so the budget
+holds between loads too. Sessions are bound to a tenant once and then
+resolved with two dict lookups.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List, Optional
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+TENANT_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$')
+
+
+def validate_tenant(tenant: str) -> str:
+    """Reject ids that are not safe to use as a file name"""
+    if not isinstance(tenant, str) or not TENANT_ID.match(tenant) or '..' in tenant:
+        raise ValueError(f"Invalid tenant id: {tenant!r}")
+    return tenant
+
+
+class _Resident:
+    __slots__ = ('workspace', 'nbytes', 'last_used')
+
+    def __init__(self, workspace, nbytes: int):
+        self.workspace = workspace
+        self.nbytes = nbytes
+        self.last_used = time.monotonic()
+
+
+class TenantRegistry:
+    """Lazily loaded tenant workspaces with LRU eviction under a byte budget"""
+
+    def __init__(self, factory: Callable[[str], object], memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 sizeof: Optional[Callable[[object], int]] = None,
+                 on_evict: Optional[Callable[[str, object], None]] = None):
+        self.factory = factory
+        self.memory_budget = memory_budget
+        self.sizeof = sizeof or (lambda workspace: workspace.memory_usage())
+        self.on_evict = on_evict
+        self._residents: 'OrderedDict[str, _Resident]' = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._sessions: Dict[Hashable, str] = {}
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'loads': 0, 'evictions': 0, 'load_errors': 0, 'maintenance_errors': 0}
+        self._maintenance: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def __contains__(self, tenant) -> bool:
+        return tenant in self._residents
+
+    def __len__(self) -> int:
+        return len(self._residents)
+
+    # ------------------------------------------------------------------
+    # Tenants
+    # ------------------------------------------------------------------
+    def get(self, tenant: str):
+        """Workspace for ``tenant``, creating or loading it on first access"""
+        with self._lock:
+            resident = self._residents.get(tenant)
+            if resident is not None:
+                self._residents.move_to_end(tenant)
+                resident.last_used = time.monotonic()
+                self._counters['hits'] += 1
+                return resident.workspace
+            pending = self._loading.get(tenant)
+            owner = pending is None
+            if owner:
+                validate_tenant(tenant)
+                pending = self._loading[tenant] = Future()
+
+        if not owner:
+            return pending.result()
+
+        # Load outside the lock so one slow tenant does not block the others
+        try:
+            workspace = self.factory(tenant)
+            nbytes = int(self.sizeof(workspace))
+        except BaseException as error:
+            with self._lock:
+                del self._loading[tenant]
+                self._counters['load_errors'] += 1
+            pending.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._loading[tenant]
+            self._residents[tenant] = _Resident(workspace, nbytes)
+            self._resident_bytes += nbytes
+            self._counters['loads'] += 1
+            evicted = self._shrink(keep=tenant)
+        pending.set_result(workspace)
+        self._release(evicted)
+        return workspace
+
+    def _shrink(self, keep: Optional[str] = None) -> List[tuple]:
+        """Pop least recently used tenants until within budget (lock held)"""
+        evicted = []
+        for tenant in list(self._residents):
+            if self._resident_bytes <= self.memory_budget:
+                break
+            if tenant == keep:
+                continue
+            evicted.append((tenant, self._pop(tenant)))
+        return evicted
+
+    def _pop(self, tenant: str):
+        resident = self._residents.pop(tenant)
+        self._resident_bytes -= resident.nbytes
+        self._counters['evictions'] += 1
+        return resident.workspace
+
+    def _release(self, evicted: List[tuple]):
+        if self.on_evict is not None:
+            for tenant, workspace in evicted:
+                self.on_evict(tenant, workspace)
+
+    def evict(self, tenant: str) -> bool:
+        """Drop one tenant from memory; it is reloaded on next access"""
+        with self._lock:
+            if tenant not in self._residents:
+                return False
+            evicted = [(tenant, self._pop(tenant))]
+        self._release(evicted)
+        return True
+
+    def evict_idle(self, idle_seconds: float) -> List[str]:
+        """Drop every tenant not accessed for ``idle_seconds``"""
+        cutoff = time.monotonic() - idle_seconds
+        with self._lock:
+            evicted = [(tenant, self._pop(tenant)) for tenant, resident in list(self._residents.items())
+                       if resident.last_used < cutoff]
+        self._release(evicted)
+        return [tenant for tenant, _ in evicted]
+
+    def refresh_sizes(self):
+        """Re-measure resident workspaces (they grow with ingestion) and re-apply the budget"""
+        with self._lock:
+            residents = list(self._residents.items())
+        sizes = {tenant: int(self.sizeof(resident.workspace)) for tenant, resident in residents}
+        with self._lock:
+            for tenant, nbytes in sizes.items():
+                resident = self._residents.get(tenant)
+                if resident is not None:
+                    self._resident_bytes += nbytes - resident.nbytes
+                    resident.nbytes = nbytes
+            evicted = self._shrink()
+        self._release(evicted)
+
+    def start_maintenance(self, interval: float, idle_seconds: Optional[float] = None) -> 'TenantRegistry':
+        """Every ``interval`` seconds re-apply the budget to current sizes and drop tenants idle that long"""
+        if self._maintenance is None:
+            self._stop.clear()
+            self._maintenance = threading.Thread(target=self._maintain, args=(interval, idle_seconds),
+                                                 name='channelpulse-tenants', daemon=True)
+            self._maintenance.start()
+        return self
+
+    def stop_maintenance(self):
+        if self._maintenance is not None:
+            self._stop.set()
+            self._maintenance.join()
+            self._maintenance = None
+
+    def _maintain(self, interval: float, idle_seconds: Optional[float]):
+        while not self._stop.wait(interval):
+            try:
+                if idle_seconds is not None:
+                    self.evict_idle(idle_seconds)
+                self.refresh_sizes()
+            except Exception:
+                # e.g. a failed snapshot save in on_evict; try again next round
+                self._counters['maintenance_errors'] += 1
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+    def bind(self, session: Hashable, tenant: str):
+        self._sessions[session] = validate_tenant(tenant)
+
+    def unbind(self, session: Hashable):
+        self._sessions.pop(session, None)
+
+    def tenant_for(self, session: Hashable) -> Optional[str]:
+        return self._sessions.get(session)
+
+    def for_session(self, session: Hashable):
+        """Workspace of the tenant bound to ``session``; KeyError if unbound"""
+        return self.get(self._sessions[session])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['resident'] = len(self._residents)
+            stats['resident_bytes'] = self._resident_bytes
+            stats['memory_budget'] = self.memory_budget
+            stats['sessions'] = len(self._sessions)
+        return stats
@@ -0,0 +1,744 @@
+"""ChannelPulseAI: one account's metrics, charts, insights and reports
+
+A workspace is cheap to construct. Its metrics are loaded (from a snapshot)
+or generated the first time anything reads ``store``, and plotting and
+pandas are imported only by the methods that need them, so a CLI report run
+or a worker process does not pay for data or libraries it never touches.
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from channelpulse import telemetry
+from channelpulse.aggregates import SUMMARY_WINDOWS
+from channelpulse.analytics import ChannelAnalytics
+from channelpulse.audience import AudienceSketches
+from channelpulse.catalog import ChannelCatalog, ChannelIds, ChannelInfo
+from channelpulse.datagen import channel_keys, populate_store
+from channelpulse.downsample import downsample
+from channelpulse.figcache import FigureCache
+from channelpulse.insights import HTTPInsightProvider, InsightEngine, InsightProvider, LocalInsightProvider
+from channelpulse.narration import DEFAULT_CACHE_BYTES, AudioCache, Narrator, ToneSynthesizer, narration_script
+from channelpulse.optimizer import DEFAULT_FIT_WINDOW, DEFAULT_MAX_CHANGE, BudgetPlan, plan_budget
+from channelpulse.reports import BatchReportEngine, ReportJob, report_stem
+from channelpulse.snapshot import load_snapshot, save_snapshot, snapshot_channels, snapshot_exists
+from channelpulse.stories import StoryIndex
+from channelpulse.store import ChannelFrames, MetricsStore
+from channelpulse.telemetry import timed_stage
+from channelpulse.tenants import TenantRegistry, validate_tenant
+
+if TYPE_CHECKING:
+    from channelpulse.ingest import IngestionPipeline
+
+# Seconds between tenant size re-measurements and idle checks
+TENANT_MAINTENANCE_SECONDS = 60.0
+# Simulated model latency for the local insight backend; awaited, so it never holds a worker
+INSIGHT_LATENCY_SECONDS = 2.0
+# Simulated synthesis time of the offline voice, as a fraction of the audio's duration
+NARRATION_REALTIME_FACTOR = 0.3
+
+# Performance chart ranges (days, None for all history) and payload bounds
+CHART_RANGES = {'30d': 30, '90d': 90, '1y': 365, 'all': None}
+CHART_POINTS = 400
+# Resolution tiers are picked so the downsampler reads at most this many points per plotted point
+CHART_TIER_FACTOR = 4
+# Lines with more points than this are drawn without markers
+CHART_MARKER_POINTS = 90
+
+# Sample data generated when there is no snapshot: 2024-01-01 to 2024-05-23
+SAMPLE_START = '2024-01-01'
+SAMPLE_DAYS = 144
+
+# Metadata for the built-in channels; ChannelPulseAI.channels holds it column-wise
+DEFAULT_CHANNELS = {
+    'instagram': {
+        'name': 'Instagram',
+        'icon': '📱',
+        'color': '#E1306C',
+        'primary_metric': 'engagement',
+        'audience': 'Gen Z & Millennials',
+        'conversion_rate': 0.045,
+        'avg_cost_per_click': 1.20
+    },
+    'linkedin': {
+        'name': 'LinkedIn',
+        'icon': '🔗',
+        'color': '#0077B5',
+        'primary_metric': 'b2b_leads',
+        'audience': 'C-Suite & Professionals',
+        'conversion_rate': 0.083,
+        'avg_cost_per_click': 3.50
+    },
+    'blog': {
+        'name': 'Blog/Content',
+        'icon': '📝',
+        'color': '#6366F1',
+        'primary_metric': 'organic_traffic',
+        'audience': 'Industry Experts',
+        'conversion_rate': 0.062,
+        'avg_cost_per_click': 0.00
+    },
+    'google': {
+        'name': 'Google Ads',
+        'icon': '🔍',
+        'color': '#4285F4',
+        'primary_metric': 'search_volume',
+        'audience': 'High-Intent Buyers',
+        'conversion_rate': 0.051,
+        'avg_cost_per_click': 2.80
+    }
+}
+
+# Insight story templates, indexed by the channels they mention
+DEFAULT_STORIES = [
+    {
+        "title": "🚀 Instagram Campaign Breakthrough",
+        "content": ("Your Instagram ads are crushing it! CTR is 300% higher than LinkedIn. I've detected a pattern: "
+                    "posts with sustainability themes get 2x more engagement. Consider shifting 20% of your LinkedIn "
+                    "budget to Instagram."),
+        "action": "Reallocate Budget",
+        "impact": "Higher ROI from the same budget",
+        "channels": ["instagram", "linkedin"]
+    },
+    {
+        "title": "📊 Blog Content Gold Mine",
+        "content": ("Your recent blog post about 'Sustainable Business Practices' has generated 150% more qualified "
+                    "leads than average. The content resonates with C-suite executives who spend 40% more. I "
+                    "recommend creating a follow-up webinar series."),
+        "action": "Create Webinar Series",
+        "impact": "+45% lead quality",
+        "channels": ["blog", "linkedin"]
+    },
+    {
+        "title": "⚡ Cross-Channel Synergy",
+        "content": ("Users who engage with both your blog and Instagram are 4x more likely to convert. Only 15% of "
+                    "your audience overlaps across channels. Implementing cross-channel retargeting could increase "
+                    "conversions by 45%."),
+        "action": "Setup Retargeting",
+        "impact": "+45% conversions",
+        "channels": ["blog", "instagram"]
+    }
+]
+
+
+class ChannelPulseAI:
+    """Dashboard backend for one account"""
+
+    def __init__(self, snapshot_path: str = None, insight_provider: InsightProvider = None,
+                 seed: Optional[int] = None):
+        # Channel metadata and story templates, stored column-wise with integer ids
+        # from one dictionary that the metrics store shares as well. A snapshot's
+        # channels are numbered first, in its row order, so it loads memory-mapped
+        # as saved instead of being copied into the catalog's order.
+        self.channel_ids = ChannelIds()
+        if snapshot_path and snapshot_exists(snapshot_path):
+            for key in snapshot_channels(snapshot_path):
+                self.channel_ids.intern(key)
+        self.channels = ChannelCatalog(DEFAULT_CHANNELS, ids=self.channel_ids)
+        self.story_index = StoryIndex(DEFAULT_STORIES, ids=self.channel_ids)
+        # Story picks follow the workspace seed, so a seeded workspace tells the same stories
+        self.story_rng = random.Random(seed) if seed is not None else random
+
+        # Insight model backend behind a caching, coalescing, batching engine
+        self.insight_provider = insight_provider or LocalInsightProvider(
+            self.compose_insight, latency=INSIGHT_LATENCY_SECONDS
+        )
+        self.insight_engine = InsightEngine(self.insight_provider)
+
+        # Built figures shared across refreshes and sessions, keyed by data version
+        self.figure_cache = FigureCache(max_entries=256)
+        # (data version, window, cross-channel prompt part) of the last insight prompt
+        self._prompt_cache: Optional[Tuple[Tuple[int, int], int, Dict]] = None
+        self.pipelines: List['IngestionPipeline'] = []
+        # Per-channel user sketches, fed by ingested events that carry a user id
+        self.audience = AudienceSketches()
+        # Store version last written to or read from disk, None if never persisted
+        self.saved_version = None
+
+        # Metrics are loaded on first access to ``store``; sample data is random unless seeded
+        self.snapshot_path = snapshot_path
+        self.seed = seed
+        self._store: Optional[MetricsStore] = None
+        # Bumped whenever a different store is attached (its version restarts at 0)
+        self.generation = 0
+        self._data_lock = threading.Lock()
+
+    @property
+    def store(self) -> MetricsStore:
+        self._ensure_loaded()
+        return self._store
+
+    @property
+    def data(self) -> ChannelFrames:
+        self._ensure_loaded()
+        return self._data
+
+    @property
+    def analytics(self) -> ChannelAnalytics:
+        self._ensure_loaded()
+        return self._analytics
+
+    @property
+    def ai_stories(self) -> List[Dict]:
+        return self.story_index.stories
+
+    @property
+    def loaded(self) -> bool:
+        return self._store is not None
+
+    def _ensure_loaded(self):
+        if self._store is not None:
+            return
+        with self._data_lock:
+            if self._store is not None:
+                return
+            # Reuse an on-disk snapshot when one exists; otherwise build and save one,
+            # unless another process publishes one first (then that one is served)
+            if self.snapshot_path and snapshot_exists(self.snapshot_path):
+                self.load_snapshot(self.snapshot_path)
+            else:
+                self.generate_sample_data()
+                if self.snapshot_path and not self.save_snapshot(self.snapshot_path, replace=False):
+                    self.load_snapshot(self.snapshot_path)
+
+    def load_snapshot(self, path: str):
+        """Serve metrics from a memory-mapped snapshot instead of regenerating them"""
+        self._attach_store(load_snapshot(path, ids=self.channel_ids))
+        self.saved_version = self.store.version
+
+    def _attach_store(self, store: MetricsStore):
+        """Serve everything from ``store`` and drop state derived from the old one"""
+        self._data = ChannelFrames(store)
+        self._analytics = ChannelAnalytics(store)
+        self._store = store
+        self.generation += 1
+        self.figure_cache.clear()
+
+    def clear_caches(self):
+        """Drop figures, insights, prompts and analytics reports; the data is untouched"""
+        self.figure_cache.clear()
+        self.insight_engine.clear()
+        self._prompt_cache = None
+        if self._store is not None:
+            self._analytics.clear()
+
+    def save_snapshot(self, path: str, replace: bool = True) -> bool:
+        """Persist the current metrics store for fast start-up
+
+        Only a write to the workspace's own ``snapshot_path`` counts as saved;
+        a copy elsewhere leaves newer data marked as unsaved. With
+        ``replace=False`` an existing snapshot is kept and False returned.
+        """
+        version = self.store.version
+        if not save_snapshot(self.store, path, replace=replace):
+            return False
+        if self.snapshot_path and os.path.abspath(path) == os.path.abspath(self.snapshot_path):
+            self.saved_version = version
+        return True
+
+    def data_version(self) -> Tuple[int, int]:
+        """Token for the data a render is computed from; take it before reading"""
+        store = self.store  # loading first may attach a new store
+        return (self.generation, store.version)
+
+    def changes_since(self, token: Optional[Tuple[int, int]]) -> Optional[List[str]]:
+        """Channels written since ``token`` (from ``data_version``), or None if anything may have changed"""
+        store = self.store
+        if token is None or token[0] != self.generation:
+            return None
+        return store.changed_since(token[1])
+
+    def memory_usage(self) -> int:
+        """Approximate resident bytes, dominated by the metrics store (0 until loaded)"""
+        return self._store.nbytes if self.loaded else 0
+
+    def generate_sample_data(self, seed: Optional[int] = None, days: int = SAMPLE_DAYS,
+                             n_channels: Optional[int] = None):
+        """Generate realistic sample data for the dashboard (reproducible for a given seed)
+
+        ``n_channels`` beyond the catalog adds synthetic ``channel_<i>``
+        channels with generated economics, e.g. to benchmark large accounts.
+        """
+        channels = self.channels
+        keys = list(channels)
+        n_channels = len(keys) if n_channels is None else n_channels
+        extra = max(n_channels - len(keys), 0)
+        keys = keys[:n_channels] + channel_keys(n_channels)[len(keys):]
+        padding = np.full(extra, np.nan)
+        store = MetricsStore(start_date=SAMPLE_START, windows=SUMMARY_WINDOWS, ids=self.channel_ids,
+                             channel_capacity=max(n_channels, 1), day_capacity=max(days, 1))
+        populate_store(n_channels, days, keys=keys, store=store, start=SAMPLE_START,
+                       seed=self.seed if seed is None else seed,
+                       conversion_rate=np.concatenate([channels.column('conversion_rate'), padding])[:n_channels],
+                       cost_per_click=np.concatenate([channels.column('avg_cost_per_click'), padding])[:n_channels])
+        self._attach_store(store)
+
+    def add_story(self, story: Dict) -> int:
+        """Register a new insight story template"""
+        return self.story_index.add(story)
+
+    def get_channel_info(self, channel: str) -> ChannelInfo:
+        """Channel metadata, with neutral defaults for channels first seen in ingested events"""
+        return self.channels.info(channel)
+
+    def start_ingestion(self, path: str = None, port: int = None, **options) -> 'IngestionPipeline':
+        """Stream real channel events into the live store
+
+        Replays a CSV/JSONL event file and/or listens for JSON-lines events on
+        a local TCP port. The dashboard reads the same store, so new numbers
+        appear on the next refresh without a restart.
+        """
+        from channelpulse.ingest import IngestionPipeline
+
+        options.setdefault('audience', self.audience)
+        pipeline = IngestionPipeline(self.store, **options).start()
+        if port is not None:
+            pipeline.serve_socket(port=port)
+        if path:
+            pipeline.ingest_file(path)
+        self.pipelines.append(pipeline)
+        return pipeline
+
+    def telemetry_samples(self) -> List[telemetry.Sample]:
+        """Cache, insight, store and ingestion counters for the metrics endpoint"""
+        samples = (telemetry.stats_samples('channelpulse_figure_cache', 'Figure cache', self.figure_cache.stats())
+                   + telemetry.stats_samples('channelpulse_insight_engine', 'Insight engine',
+                                             self.insight_engine.stats()))
+        if self.loaded:
+            samples += telemetry.stats_samples('channelpulse_store', 'Metrics store', self.store.stats())
+        samples += telemetry.stats_samples('channelpulse_audience', 'Audience sketches', self.audience.stats())
+        for i, pipeline in enumerate(self.pipelines):
+            samples += telemetry.stats_samples('channelpulse_ingest', 'Ingestion pipeline', pipeline.stats(),
+                                               {'pipeline': str(i)})
+        return samples
+
+    def get_channel_summary(self, channel: str, window: int = 7) -> Dict:
+        """Get summary metrics for a specific channel
+
+        Reads come from the store's rolling aggregates, so windows listed in
+        SUMMARY_WINDOWS (7/14/28/90 days) cost the same for any history length.
+        """
+        summary = self.store.summary(channel, window=window)
+        if not summary:
+            return {}
+
+        summary['channel_info'] = self.channels.info(channel).to_dict()
+        return summary
+
+    def chart_series(self, channel: str, metric: str = 'revenue', days: Optional[int] = 30,
+                     max_points: Optional[int] = CHART_POINTS, method: str = 'lttb'):
+        """Dates and values to plot for a range, at most ``max_points`` of them
+
+        Reads the finest resolution tier holding at most ``CHART_TIER_FACTOR``
+        times ``max_points`` rows, then downsamples, so the cost and size of a
+        chart do not grow with the selected range. Returns ``(dates, values,
+        resolution)``.
+        """
+        dates, values, resolution = self.store.resolution_series(
+            channel, metric, days, None if max_points is None else max_points * CHART_TIER_FACTOR)
+        keep = downsample(values, max_points, method)
+        return dates[keep], values[keep], resolution
+
+    def create_performance_chart(self, channel: str, metric: str = 'revenue', days: Optional[int] = 30,
+                                 as_json: bool = False, max_points: Optional[int] = CHART_POINTS,
+                                 method: str = 'lttb'):
+        """Create performance chart for a specific channel (serialized once if ``as_json``)
+
+        ``days`` is the trailing range to show, None for all history.
+        """
+        if channel not in self.data:
+            import plotly.graph_objects as go
+            return go.Figure().to_json() if as_json else go.Figure()
+
+        get = self.figure_cache.get_json if as_json else self.figure_cache.get
+        return get(
+            ('performance', channel, metric, days, max_points, method),
+            self.store.channel_version(channel),
+            lambda: timed_stage('performance_chart_build', self._build_performance_chart)(
+                channel, metric, days, max_points, method)
+        )
+
+    def _build_performance_chart(self, channel: str, metric: str, days: Optional[int],
+                                 max_points: Optional[int], method: str):
+        import plotly.graph_objects as go
+
+        dates, values, resolution = self.chart_series(channel, metric, days, max_points, method)
+        info = self.get_channel_info(channel)
+        title = f'{info.label} - {metric.title()} Trend'
+        if resolution != 'daily':
+            title += f' ({resolution} average per day)'
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=dates.astype(str),
+            y=values,
+            mode='lines+markers' if len(values) <= CHART_MARKER_POINTS else 'lines',
+            name=f'{info.name} {metric.title()}',
+            line=dict(color=info.color, width=3 if len(values) <= CHART_MARKER_POINTS else 2),
+            marker=dict(size=6)
+        ))
+
+        fig.update_layout(
+            title=title,
+            xaxis_title='Date',
+            yaxis_title=metric.title(),
+            template='plotly_white',
+            height=400,
+            showlegend=False
+        )
+
+        return fig
+
+    def create_channel_comparison_chart(self, window: int = 7, as_json: bool = False):
+        """Create comparison chart across all channels (serialized once if ``as_json``)"""
+        get = self.figure_cache.get_json if as_json else self.figure_cache.get
+        return get(
+            ('comparison', window),
+            self.store.version,
+            lambda: timed_stage('comparison_chart_build', self._build_channel_comparison_chart)(window)
+        )
+
+    def _build_channel_comparison_chart(self, window: int):
+        import pandas as pd
+        import plotly.graph_objects as go
+
+        # One vectorized pass over every channel in the store
+        batch = self.store.summaries(window=window)
+        metrics = {
+            'Channel': self.channels.labels(batch['channels']),
+            'Revenue': batch['current']['revenue'],
+            'Conversions': batch['current']['conversions'],
+            'ROI': batch['current']['roi'],
+            'Traffic': batch['current']['traffic']
+        }
+
+        df = pd.DataFrame(metrics)
+
+        fig = go.Figure()
+
+        # Revenue bars
+        fig.add_trace(go.Bar(
+            name='Revenue ($)',
+            x=df['Channel'],
+            y=df['Revenue'],
+            yaxis='y',
+            offsetgroup=1,
+            marker_color='#667eea'
+        ))
+
+        # ROI line
+        fig.add_trace(go.Scatter(
+            name='ROI',
+            x=df['Channel'],
+            y=df['ROI'],
+            yaxis='y2',
+            mode='lines+markers',
+            marker_color='#f093fb',
+            line=dict(width=3)
+        ))
+
+        fig.update_layout(
+            title='📊 Cross-Channel Performance Comparison',
+            xaxis_title='Channel',
+            yaxis=dict(title='Revenue ($)', side='left'),
+            yaxis2=dict(title='ROI', side='right', overlaying='y'),
+            template='plotly_white',
+            height=500,
+            hovermode='x unified'
+        )
+
+        return fig
+
+    def optimize_budget(self, budget: Optional[float] = None, window: int = DEFAULT_FIT_WINDOW,
+                        max_change: float = DEFAULT_MAX_CHANGE) -> BudgetPlan:
+        """Recommended daily spend per paid channel from the trailing ``window`` days
+
+        ``budget`` defaults to the current total daily spend; each channel
+        moves at most ``max_change`` (a fraction) from its current spend.
+        """
+        store = self.store
+        channels, cost = store.trailing('cost', window)
+        matrices = {'cost': cost}
+        for column in ('revenue', 'traffic', 'conversions'):
+            matrices[column] = store.trailing(column, window)[1]
+
+        # Catalog rates by channel id; 0 (observed rates) for channels it does not know
+        ids = np.array([-1 if code is None else code for code in self.channels.ids(channels)], dtype=np.int64)
+        known = ids >= 0
+        rates = {}
+        for field in ('conversion_rate', 'avg_cost_per_click'):
+            column = np.asarray(self.channels.column(field), dtype=np.float64)
+            rates[field] = np.where(known, column[ids] if len(column) else 0.0, 0.0)
+        return plan_budget(channels, matrices, rates['conversion_rate'], rates['avg_cost_per_click'],
+                           budget=budget, max_change=max_change)
+
+    def audience_overlap(self, channels: Optional[List[str]] = None) -> Dict:
+        """Estimated unique reach of each channel and the users every pair shares
+
+        Empty until events with a ``user`` id have been ingested.
+        """
+        keys, matrix = self.audience.overlap_matrix(channels)
+        reach = np.diag(matrix)
+        union = reach[:, None] + reach[None, :] - matrix
+        share = np.divide(matrix, union, out=np.zeros_like(matrix), where=union > 0)
+        rows, cols = np.triu_indices(len(keys), 1)
+        order = np.argsort(-matrix[rows, cols], kind='stable')
+        return {
+            'channels': keys,
+            'reach': reach.tolist(),
+            'overlap': matrix.tolist(),
+            # Every pair, most shared users first
+            'pairs': [{'channels': [keys[i], keys[j]], 'overlap': float(matrix[i, j]),
+                       'overlap_share': float(share[i, j])} for i, j in zip(rows[order], cols[order])],
+        }
+
+    def build_insight_prompt(self, user_source: str = None, window: int = 7) -> Dict:
+        """Snapshot of channel performance to send to the insight model
+
+        The cross-channel part only changes with the data, so it is built once
+        per data version and window and shared by every source channel.
+        """
+        version = self.data_version()
+        cached = self._prompt_cache
+        if cached is None or cached[:2] != (version, window):
+            cached = (version, window, self._build_base_prompt(window))
+            self._prompt_cache = cached
+        return dict(cached[2], source=user_source)
+
+    def _build_base_prompt(self, window: int) -> Dict:
+        batch = self.store.summaries(window=window)
+        columns = ('traffic', 'conversions', 'revenue', 'cost', 'roi')
+        prompt = {
+            'window': window,
+            'performance': {
+                channel: {column: batch['current'][column][i].item() for column in columns}
+                for i, channel in enumerate(batch['channels'])
+            }
+        }
+
+        # Find best and worst performing channels in one vectorized pass, among
+        # channels with spend or revenue (not e.g. click-only ingested channels)
+        current = batch['current']
+        ranked = np.flatnonzero((current['cost'] > 0) | (current['revenue'] > 0))
+        if len(ranked):
+            roi = current['roi'][ranked]
+            best, worst = ranked[np.argmax(roi)], ranked[np.argmin(roi)]
+            prompt['best'] = [batch['channels'][best], current['roi'][best].item()]
+            prompt['worst'] = [batch['channels'][worst], current['roi'][worst].item()]
+
+        # Trend, anomaly and correlation signals over the full history
+        prompt['signals'] = self.analytics.signals('revenue')
+
+        return prompt
+
+    def compose_insight(self, prompt: Dict) -> Dict:
+        """Turn a performance prompt into an insight story (the local model stand-in)"""
+        user_source = prompt.get('source')
+
+        if prompt.get('best'):
+            best_channel, best_roi = prompt['best']
+            worst_channel, worst_roi = prompt['worst']
+
+            # Generate contextual insight, preferring stories about the user's channel
+            # (a fresh dict, so it can carry this prompt's data)
+            story = self.story_index.choose(user_source, self.story_rng)
+
+            # Add dynamic data (no improvement figure against a channel returning nothing)
+            improvement_potential = round((best_roi - worst_roi) / worst_roi * 100, 1) if worst_roi > 0 else None
+
+            story['dynamic_data'] = {
+                'best_channel': self.channels.name(best_channel),
+                'best_roi': best_roi,
+                'worst_channel': self.channels.name(worst_channel),
+                'improvement_potential': improvement_potential
+            }
+
+            signals = prompt.get('signals')
+            if signals:
+                story['dynamic_data'].update({
+                    'rising_channel': self.channels.name(signals['rising'][0]),
+                    'rising_trend': signals['rising'][1],
+                    'falling_channel': self.channels.name(signals['falling'][0]),
+                    'falling_trend': signals['falling'][1],
+                    'anomalies': signals['anomalies'],
+                    'top_correlation': signals['top_correlation']
+                })
+
+            # Budget stories quote the optimizer's projection; templates carry no figure of their own
+            if story.get('action') == 'Reallocate Budget':
+                plan = self.optimize_budget()
+                if plan.channels and not plan.note:
+                    sign = '+' if plan.monthly_uplift >= 0 else '-'
+                    story['impact'] = f"{sign}${abs(plan.monthly_uplift):,.0f}/month"
+                    story['content'] += (f" The budget optimizer projects {story['impact'].replace('/month', '')} "
+                                         f"in monthly revenue from reallocating today's spend.")
+
+            return story
+
+        return self.story_index.choose(user_source, self.story_rng)
+
+    def generate_ai_insight(self, user_source: str = None) -> Dict:
+        """Generate AI-powered insights based on data analysis"""
+        return self.compose_insight(self.build_insight_prompt(user_source))
+
+    async def generate_ai_insight_async(self, user_source: str = None, refresh: bool = False) -> Dict:
+        """Generate an insight through the model backend
+
+        Unchanged data maps to the same prompt, so it is answered from the
+        engine's cache; concurrent identical requests share one model call.
+        The prompt is built on the thread pool, off the event loop. ``refresh``
+        asks the backend for a new insight even if one is cached.
+        """
+        loop = asyncio.get_running_loop()
+        prompt = await loop.run_in_executor(None, telemetry.attributed(self.build_insight_prompt), user_source)
+        return await self.insight_engine.get(prompt, refresh=refresh)
+
+    def report_jobs(self, source: str, output_dir: str, channels: List[str] = None,
+                    formats: Tuple[str, ...] = ('md',), window: int = 7):
+        """Lazily yield one ReportJob per channel, rendered from the snapshot at ``source``
+
+        The insight prompt's cross-channel part is built once and only its
+        source channel changes per report.
+        """
+        base_prompt = self.build_insight_prompt(None, window=window)
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for channel in self.store.channels if channels is None else channels:
+            yield ReportJob(
+                source=source,
+                channel=channel,
+                channel_name=self.channels.name(channel),
+                insight=self.compose_insight(dict(base_prompt, source=channel)),
+                output_stem=report_stem(output_dir, channel),
+                formats=tuple(formats),
+                window=window,
+                generated_at=generated_at,
+            )
+
+    def export_reports(self, output_dir: str, channels: List[str] = None,
+                       formats: Tuple[str, ...] = ('md', 'csv', 'pdf'), workers: int = None) -> Dict:
+        """Write a report per channel to ``output_dir`` on a process pool
+
+        Workers share one memory-mapped snapshot of the current store.
+        Returns the engine's stats, including reports_per_second.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=output_dir) as scratch:
+            source = os.path.join(scratch, 'snapshot')
+            # A scratch copy for the workers, not a save of this workspace's data
+            save_snapshot(self.store, source)
+            return BatchReportEngine(workers).run(
+                self.report_jobs(source, output_dir, channels, formats),
+                manifest_path=os.path.join(output_dir, 'manifest.csv')
+            )
+
+    def get_voice_script(self, insight: Dict) -> str:
+        """Generate voice script for the insight"""
+        return ' '.join(narration_script(insight))
+
+
+def insight_provider_from_env() -> Optional[InsightProvider]:
+    """HTTP insight backend at CHANNELPULSE_INSIGHT_URL, or None for the local stand-in"""
+    url = os.environ.get('CHANNELPULSE_INSIGHT_URL')
+    return HTTPInsightProvider(url) if url else None
+
+
+def narrator_from_env() -> Narrator:
+    """Narrator caching audio under CHANNELPULSE_AUDIO_CACHE (a temporary directory if unset)
+
+    CHANNELPULSE_AUDIO_CACHE_MB bounds the cache (64 MB by default).
+    """
+    max_bytes = int(float(os.environ.get('CHANNELPULSE_AUDIO_CACHE_MB', DEFAULT_CACHE_BYTES / 2 ** 20)) * 2 ** 20)
+    return Narrator(ToneSynthesizer(realtime_factor=NARRATION_REALTIME_FACTOR),
+                    AudioCache(os.environ.get('CHANNELPULSE_AUDIO_CACHE'), max_bytes))
+
+
+def tenant_registry(root: str, memory_budget: int, insight_provider: InsightProvider = None,
+                    allowed: Optional[List[str]] = None, idle_seconds: Optional[float] = None,
+                    maintenance_interval: float = TENANT_MAINTENANCE_SECONDS) -> TenantRegistry:
+    """Registry of ChannelPulseAI workspaces persisted as snapshots under ``root/<tenant>``
+
+    Only tenants with a snapshot under ``root`` or listed in ``allowed`` are
+    served (the latter get sample data on first use); any other id raises
+    LookupError rather than creating a tenant. An HTTP insight provider is
+    shared by every tenant; otherwise each tenant gets its own local stand-in
+    bound to its data. Every ``maintenance_interval`` seconds sizes are
+    re-measured against the budget and tenants idle for ``idle_seconds`` are
+    dropped.
+    """
+    shared = insight_provider if isinstance(insight_provider, HTTPInsightProvider) else None
+    allowed = frozenset(allowed or ())
+
+    def load(tenant: str) -> ChannelPulseAI:
+        path = os.path.join(root, validate_tenant(tenant))
+        if tenant not in allowed and not snapshot_exists(path):
+            raise LookupError(f"Unknown tenant: {tenant!r}")
+        workspace = ChannelPulseAI(snapshot_path=path, insight_provider=shared)
+        workspace.store  # load now, inside the registry's load, rather than on the first request
+        return workspace
+
+    def persist(tenant: str, workspace: ChannelPulseAI):
+        # Save new data (e.g. ingested events) before the workspace is dropped
+        if workspace.saved_version != workspace.store.version:
+            workspace.save_snapshot(os.path.join(root, tenant))
+
+    registry = TenantRegistry(load, memory_budget=memory_budget, on_evict=persist)
+    registry.start_maintenance(maintenance_interval, idle_seconds)
+    telemetry.REGISTRY.register_collector(
+        lambda: telemetry.stats_samples('channelpulse_tenants', 'Tenant registry', registry.stats()))
+    return registry
+
+
+def tenant_report_jobs(root: str, output_dir: str, tenants: Optional[List[str]] = None,
+                       channels: Optional[List[str]] = None, formats: Tuple[str, ...] = ('md',), window: int = 7):
+    """Lazily yield report jobs for every tenant snapshot under ``root`` (or the given tenants)
+
+    Each tenant's reports go to ``output_dir/<tenant>`` and are rendered from
+    its own snapshot; one workspace is open at a time.
+    """
+    if tenants is None:
+        tenants = sorted(name for name in os.listdir(root) if snapshot_exists(os.path.join(root, name)))
+    for tenant in tenants:
+        path = os.path.join(root, validate_tenant(tenant))
+        if not snapshot_exists(path):
+            raise FileNotFoundError(f"No snapshot for tenant {tenant!r} under {root}")
+        workspace = ChannelPulseAI(snapshot_path=path)
+        yield from workspace.report_jobs(path, os.path.join(output_dir, tenant), channels, formats, window)
+
+
+def export_tenant_reports(root: str, output_dir: str, tenants: Optional[List[str]] = None,
+                          channels: Optional[List[str]] = None, formats: Tuple[str, ...] = ('md', 'csv', 'pdf'),
+                          workers: int = None) -> Dict:
+    """Write every tenant's reports on one process pool; returns the engine's stats
+
+    The workers memory-map each tenant's saved snapshot, so reports reflect
+    what is on disk under ``root``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    return BatchReportEngine(workers).run(
+        tenant_report_jobs(root, output_dir, tenants, channels, formats),
+        manifest_path=os.path.join(output_dir, 'manifest.csv')
+    )
+
+
+def tenant_registry_from_env(insight_provider: InsightProvider = None) -> Optional[TenantRegistry]:
+    """Tenant registry from CHANNELPULSE_TENANT_ROOT / CHANNELPULSE_TENANT_MEMORY_MB, None if unset
+
+    CHANNELPULSE_TENANTS lists (comma-separated) tenants that may be created
+    without a snapshot; CHANNELPULSE_TENANT_IDLE_MINUTES (30 by default, 0 to
+    keep idle tenants) drops tenants nobody has used for that long.
+    """
+    root = os.environ.get('CHANNELPULSE_TENANT_ROOT')
+    if not root:
+        return None
+    memory_budget = int(float(os.environ.get('CHANNELPULSE_TENANT_MEMORY_MB', 512)) * 1024 * 1024)
+    allowed = [tenant for tenant in os.environ.get('CHANNELPULSE_TENANTS', '').split(',') if tenant]
+    idle_minutes = float(os.environ.get('CHANNELPULSE_TENANT_IDLE_MINUTES', 30))
+    return tenant_registry(root, memory_budget, insight_provider, allowed,
+                           idle_minutes * 60 if idle_minutes > 0 else None)
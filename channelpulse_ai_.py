@@ -9,553 +9,19 @@ Original file is located at
 
 # ChannelPulse AI - Complete Application for Google Colab with Gradio
 # Run this code in Google Colab to deploy the full ChannelPulse AI dashboard
-!pip install gradio plotly pandas numpy
-import gradio as gr
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-import random
-import json
-import time
-from typing import Dict, List, Tuple
-import warnings
-warnings.filterwarnings('ignore')
-
 # Install required packages (uncomment if running in Colab)
+# !pip install gradio plotly pandas numpy
 
-
-class ChannelPulseAI:
-    def __init__(self):
-        self.channels = {
-            'instagram': {
-                'name': 'Instagram',
-                'icon': '📱',
-                'color': '#E1306C',
-                'primary_metric': 'engagement',
-                'audience': 'Gen Z & Millennials',
-                'conversion_rate': 0.045,
-                'avg_cost_per_click': 1.20
-            },
-            'linkedin': {
-                'name': 'LinkedIn',
-                'icon': '🔗',
-                'color': '#0077B5',
-                'primary_metric': 'b2b_leads',
-                'audience': 'C-Suite & Professionals',
-                'conversion_rate': 0.083,
-                'avg_cost_per_click': 3.50
-            },
-            'blog': {
-                'name': 'Blog/Content',
-                'icon': '📝',
-                'color': '#6366F1',
-                'primary_metric': 'organic_traffic',
-                'audience': 'Industry Experts',
-                'conversion_rate': 0.062,
-                'avg_cost_per_click': 0.00
-            },
-            'google': {
-                'name': 'Google Ads',
-                'icon': '🔍',
-                'color': '#4285F4',
-                'primary_metric': 'search_volume',
-                'audience': 'High-Intent Buyers',
-                'conversion_rate': 0.051,
-                'avg_cost_per_click': 2.80
-            }
-        }
-
-        self.ai_stories = [
-            {
-                "title": "🚀 Instagram Campaign Breakthrough",
-                "content": "Your Instagram ads are crushing it! CTR is 300% higher than LinkedIn. I've detected a pattern: posts with sustainability themes get 2x more engagement. Consider shifting 20% of your LinkedIn budget to Instagram for a projected $8,000 monthly revenue increase.",
-                "action": "Reallocate Budget",
-                "impact": "+$8,000/month",
-                "channels": ["instagram", "linkedin"]
-            },
-            {
-                "title": "📊 Blog Content Gold Mine",
-                "content": "Your recent blog post about 'Sustainable Business Practices' has generated 150% more qualified leads than average. The content resonates with C-suite executives who spend 40% more. I recommend creating a follow-up webinar series.",
-                "action": "Create Webinar Series",
-                "impact": "+45% lead quality",
-                "channels": ["blog", "linkedin"]
-            },
-            {
-                "title": "⚡ Cross-Channel Synergy",
-                "content": "Users who engage with both your blog and Instagram are 4x more likely to convert. Only 15% of your audience overlaps across channels. Implementing cross-channel retargeting could increase conversions by 45%.",
-                "action": "Setup Retargeting",
-                "impact": "+45% conversions",
-                "channels": ["blog", "instagram"]
-            }
-        ]
-
-        self.generate_sample_data()
-
-    def generate_sample_data(self):
-        """Generate realistic sample data for the dashboard"""
-        dates = pd.date_range(start='2024-01-01', end='2024-05-23', freq='D')
-
-        self.data = {}
-        for channel, info in self.channels.items():
-            # Generate realistic metrics
-            base_traffic = random.randint(1000, 5000)
-            daily_variation = np.random.normal(0, 0.1, len(dates))
-            trend = np.linspace(0, 0.3, len(dates))  # Growing trend
-
-            traffic = base_traffic * (1 + daily_variation + trend)
-            traffic = np.maximum(traffic, 100)  # Ensure positive values
-
-            conversions = traffic * info['conversion_rate'] * np.random.uniform(0.8, 1.2, len(dates))
-            revenue = conversions * random.randint(50, 200)
-            cost = traffic * info['avg_cost_per_click'] * np.random.uniform(0.9, 1.1, len(dates))
-
-            self.data[channel] = pd.DataFrame({
-                'date': dates,
-                'traffic': traffic.astype(int),
-                'conversions': conversions.astype(int),
-                'revenue': revenue.astype(int),
-                'cost': cost.astype(int),
-                'roi': (revenue / np.maximum(cost, 1)).round(2)
-            })
-
-    def get_channel_summary(self, channel: str) -> Dict:
-        """Get summary metrics for a specific channel"""
-        if channel not in self.data:
-            return {}
-
-        df = self.data[channel]
-        latest_week = df.tail(7)
-        previous_week = df.tail(14).head(7)
-
-        def calculate_change(current, previous):
-            if previous == 0:
-                return 0
-            return ((current - previous) / previous * 100)
-
-        current_metrics = {
-            'traffic': int(latest_week['traffic'].sum()),
-            'conversions': int(latest_week['conversions'].sum()),
-            'revenue': int(latest_week['revenue'].sum()),
-            'cost': int(latest_week['cost'].sum()),
-            'roi': round(latest_week['roi'].mean(), 2)
-        }
-
-        previous_metrics = {
-            'traffic': int(previous_week['traffic'].sum()),
-            'conversions': int(previous_week['conversions'].sum()),
-            'revenue': int(previous_week['revenue'].sum()),
-            'cost': int(previous_week['cost'].sum()),
-            'roi': round(previous_week['roi'].mean(), 2)
-        }
-
-        changes = {
-            key: round(calculate_change(current_metrics[key], previous_metrics[key]), 1)
-            for key in current_metrics.keys()
-        }
-
-        return {
-            'current': current_metrics,
-            'changes': changes,
-            'channel_info': self.channels[channel]
-        }
-
-    def create_performance_chart(self, channel: str, metric: str = 'revenue'):
-        """Create performance chart for a specific channel"""
-        if channel not in self.data:
-            return go.Figure()
-
-        df = self.data[channel].tail(30)  # Last 30 days
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=df[metric],
-            mode='lines+markers',
-            name=f'{self.channels[channel]["name"]} {metric.title()}',
-            line=dict(color=self.channels[channel]['color'], width=3),
-            marker=dict(size=6)
-        ))
-
-        fig.update_layout(
-            title=f'{self.channels[channel]["icon"]} {self.channels[channel]["name"]} - {metric.title()} Trend',
-            xaxis_title='Date',
-            yaxis_title=metric.title(),
-            template='plotly_white',
-            height=400,
-            showlegend=False
-        )
-
-        return fig
-
-    def create_channel_comparison_chart(self):
-        """Create comparison chart across all channels"""
-        metrics = []
-        for channel, info in self.channels.items():
-            summary = self.get_channel_summary(channel)
-            if summary:
-                metrics.append({
-                    'Channel': f"{info['icon']} {info['name']}",
-                    'Revenue': summary['current']['revenue'],
-                    'Conversions': summary['current']['conversions'],
-                    'ROI': summary['current']['roi'],
-                    'Traffic': summary['current']['traffic']
-                })
-
-        df = pd.DataFrame(metrics)
-
-        fig = go.Figure()
-
-        # Revenue bars
-        fig.add_trace(go.Bar(
-            name='Revenue ($)',
-            x=df['Channel'],
-            y=df['Revenue'],
-            yaxis='y',
-            offsetgroup=1,
-            marker_color='#667eea'
-        ))
-
-        # ROI line
-        fig.add_trace(go.Scatter(
-            name='ROI',
-            x=df['Channel'],
-            y=df['ROI'],
-            yaxis='y2',
-            mode='lines+markers',
-            marker_color='#f093fb',
-            line=dict(width=3)
-        ))
-
-        fig.update_layout(
-            title='📊 Cross-Channel Performance Comparison',
-            xaxis_title='Channel',
-            yaxis=dict(title='Revenue ($)', side='left'),
-            yaxis2=dict(title='ROI', side='right', overlaying='y'),
-            template='plotly_white',
-            height=500,
-            hovermode='x unified'
-        )
-
-        return fig
-
-    def generate_ai_insight(self, user_source: str = None) -> Dict:
-        """Generate AI-powered insights based on data analysis"""
-        # Analyze performance across channels
-        performance_data = {}
-        for channel in self.channels.keys():
-            summary = self.get_channel_summary(channel)
-            if summary:
-                performance_data[channel] = summary
-
-        # Find best and worst performing channels
-        if performance_data:
-            roi_performance = {ch: data['current']['roi'] for ch, data in performance_data.items()}
-            best_channel = max(roi_performance, key=roi_performance.get)
-            worst_channel = min(roi_performance, key=roi_performance.get)
-
-            # Generate contextual insight
-            if user_source and user_source in self.ai_stories:
-                story = random.choice([s for s in self.ai_stories if user_source in s.get('channels', [])])
-            else:
-                story = random.choice(self.ai_stories)
-
-            # Add dynamic data
-            best_roi = roi_performance[best_channel]
-            worst_roi = roi_performance[worst_channel]
-            improvement_potential = round((best_roi - worst_roi) / worst_roi * 100, 1)
-
-            enhanced_story = story.copy()
-            enhanced_story['dynamic_data'] = {
-                'best_channel': self.channels[best_channel]['name'],
-                'best_roi': best_roi,
-                'worst_channel': self.channels[worst_channel]['name'],
-                'improvement_potential': improvement_potential
-            }
-
-            return enhanced_story
-
-        return random.choice(self.ai_stories)
-
-    def get_voice_script(self, insight: Dict) -> str:
-        """Generate voice script for the insight"""
-        script = f"Here's your AI-powered insight: {insight['title']}. "
-        script += insight['content']
-        script += f" The projected impact is {insight['impact']}. "
-        script += "Would you like me to implement this recommendation?"
-        return script
-
-# Initialize the ChannelPulse AI system
-pulse_ai = ChannelPulseAI()
-
-def create_dashboard_interface(source_channel: str = "instagram"):
-    """Create the main dashboard interface"""
-
-    # Get channel summary
-    summary = pulse_ai.get_channel_summary(source_channel)
-    channel_info = pulse_ai.channels[source_channel]
-
-    # Create performance chart
-    performance_chart = pulse_ai.create_performance_chart(source_channel, 'revenue')
-
-    # Create comparison chart
-    comparison_chart = pulse_ai.create_channel_comparison_chart()
-
-    # Generate AI insight
-    ai_insight = pulse_ai.generate_ai_insight(source_channel)
-
-    # Format summary text
-    if summary:
-        summary_text = f"""
-        ## {channel_info['icon']} {channel_info['name']} Performance Summary
-
-        **This Week's Metrics:**
-        - 📈 Traffic: {summary['current']['traffic']:,} ({summary['changes']['traffic']:+.1f}%)
-        - 🎯 Conversions: {summary['current']['conversions']:,} ({summary['changes']['conversions']:+.1f}%)
-        - 💰 Revenue: ${summary['current']['revenue']:,} ({summary['changes']['revenue']:+.1f}%)
-        - 📊 ROI: {summary['current']['roi']}x ({summary['changes']['roi']:+.1f}%)
-
-        **Target Audience:** {channel_info['audience']}
-        **Conversion Rate:** {channel_info['conversion_rate']*100:.1f}%
-        """
-    else:
-        summary_text = "No data available for this channel."
-
-    # Format AI insight
-    insight_text = f"""
-    ## {ai_insight['title']}
-
-    {ai_insight['content']}
-
-    **💡 Recommended Action:** {ai_insight['action']}
-    **📈 Projected Impact:** {ai_insight['impact']}
-    """
-
-    return summary_text, performance_chart, comparison_chart, insight_text
-
-def generate_new_insight(source_channel: str):
-    """Generate a new AI insight"""
-    time.sleep(2)  # Simulate AI processing time
-    ai_insight = pulse_ai.generate_ai_insight(source_channel)
-
-    insight_text = f"""
-    ## {ai_insight['title']}
-
-    {ai_insight['content']}
-
-    **💡 Recommended Action:** {ai_insight['action']}
-    **📈 Projected Impact:** {ai_insight['impact']}
-    """
-
-    return insight_text
-
-def implement_recommendation(insight_text: str):
-    """Simulate implementing a recommendation"""
-    return "🚀 **Recommendation Implemented Successfully!**\n\nIntegration with advertising platforms initiated. You'll receive a confirmation email with detailed implementation steps and projected timeline."
-
-def create_voice_narration(insight_text: str):
-    """Create voice narration script"""
-    # Extract key points from insight text
-    lines = insight_text.split('\n')
-    title = lines[1] if len(lines) > 1 else "AI Insight"
-
-    script = f"""
-    🎤 **Voice Assistant - Jatin AI:**
-
-    "Hello! I'm Jatin, your AI assistant. {title}
-
-    Based on my analysis of your multi-channel data, I've identified several optimization opportunities.
-    The insights I've generated can help you increase your ROI significantly.
-
-    Would you like me to implement these recommendations or schedule a follow-up analysis?"
-
-    *[Voice synthesis would be activated here in a production environment]*
-    """
-
-    return script
-
-def export_report(source_channel: str):
-    """Generate and export a comprehensive report"""
-    summary = pulse_ai.get_channel_summary(source_channel)
-    ai_insight = pulse_ai.generate_ai_insight(source_channel)
-
-    report = f"""
-# ChannelPulse AI Report
-**Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Primary Channel:** {pulse_ai.channels[source_channel]['name']}
-
-## Executive Summary
-{ai_insight['content']}
-
-## Performance Metrics
-- **Traffic:** {summary['current']['traffic']:,} visitors
-- **Conversions:** {summary['current']['conversions']:,}
-- **Revenue:** ${summary['current']['revenue']:,}
-- **ROI:** {summary['current']['roi']}x
-
-## Recommendations
-1. **Action:** {ai_insight['action']}
-2. **Expected Impact:** {ai_insight['impact']}
-3. **Implementation Timeline:** 2-4 weeks
-
-## Next Steps
-- Implement cross-channel retargeting
-- Optimize budget allocation
-- Monitor performance metrics
-- Schedule monthly review
-
----
-*Generated by ChannelPulse AI - Dynamic Multi-Channel Insights*
-    """
-
-    return report
-
-# Create the Gradio interface
-def create_gradio_app():
-    with gr.Blocks(
-        theme=gr.themes.Soft(),
-        title="ChannelPulse AI - Dynamic Multi-Channel Insights",
-        css="""
-        .gradio-container {
-            max-width: 1200px !important;
-        }
-        .plot-container {
-            height: 500px !important;
-        }
-        """
-    ) as app:
-
-        gr.HTML("""
-        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; margin-bottom: 20px;">
-            <h1 style="color: white; margin: 0; font-size: 2.5em;">🚀 ChannelPulse AI</h1>
-            <p style="color: white; margin: 10px 0; font-size: 1.2em;">Dynamic Multi-Channel Insights with AI-Driven Storytelling</p>
-        </div>
-        """)
-
-        with gr.Row():
-            with gr.Column(scale=1):
-                source_selector = gr.Dropdown(
-                    choices=[
-                        ("📱 Instagram", "instagram"),
-                        ("🔗 LinkedIn", "linkedin"),
-                        ("📝 Blog/Content", "blog"),
-                        ("🔍 Google Ads", "google")
-                    ],
-                    value="instagram",
-                    label="🎯 Select Traffic Source",
-                    info="Choose your primary traffic source to see customized insights"
-                )
-
-                refresh_btn = gr.Button("🔄 Refresh Dashboard", variant="primary")
-                generate_insight_btn = gr.Button("🤖 Generate New AI Insight", variant="secondary")
-                implement_btn = gr.Button("⚡ Implement Recommendation", variant="stop")
-                voice_btn = gr.Button("🎤 Voice Assistant", variant="huggingface")
-                export_btn = gr.Button("📊 Export Report")
-
-        with gr.Row():
-            with gr.Column(scale=2):
-                summary_display = gr.Markdown("Loading dashboard...")
-
-            with gr.Column(scale=1):
-                ai_insight_display = gr.Markdown("Generating AI insights...")
-
-        with gr.Row():
-            performance_plot = gr.Plot(label="📈 Channel Performance Trend")
-            comparison_plot = gr.Plot(label="📊 Cross-Channel Comparison")
-
-        with gr.Row():
-            with gr.Column():
-                voice_output = gr.Markdown(visible=False)
-                implementation_output = gr.Markdown(visible=False)
-                report_output = gr.Markdown(visible=False)
-
-        # Event handlers
-        def update_dashboard(source):
-            summary, perf_chart, comp_chart, insight = create_dashboard_interface(source)
-            return summary, perf_chart, comp_chart, insight
-
-        def show_voice_output(insight):
-            script = create_voice_narration(insight)
-            return gr.update(value=script, visible=True)
-
-        def show_implementation(insight):
-            result = implement_recommendation(insight)
-            return gr.update(value=result, visible=True)
-
-        def show_report(source):
-            report = export_report(source)
-            return gr.update(value=report, visible=True)
-
-        # Connect events
-        source_selector.change(
-            update_dashboard,
-            inputs=[source_selector],
-            outputs=[summary_display, performance_plot, comparison_plot, ai_insight_display]
-        )
-
-        refresh_btn.click(
-            update_dashboard,
-            inputs=[source_selector],
-            outputs=[summary_display, performance_plot, comparison_plot, ai_insight_display]
-        )
-
-        generate_insight_btn.click(
-            generate_new_insight,
-            inputs=[source_selector],
-            outputs=[ai_insight_display]
-        )
-
-        voice_btn.click(
-            show_voice_output,
-            inputs=[ai_insight_display],
-            outputs=[voice_output]
-        )
-
-        implement_btn.click(
-            show_implementation,
-            inputs=[ai_insight_display],
-            outputs=[implementation_output]
-        )
-
-        export_btn.click(
-            show_report,
-            inputs=[source_selector],
-            outputs=[report_output]
-        )
-
-        # Initialize dashboard on load
-        app.load(
-            update_dashboard,
-            inputs=[source_selector],
-            outputs=[summary_display, performance_plot, comparison_plot, ai_insight_display]
-        )
-
-        gr.HTML("""
-        <div style="text-align: center; padding: 20px; margin-top: 30px; border-top: 1px solid #e0e0e0;">
-            <h3>🌟 ChannelPulse AI Features</h3>
-            <p><strong>✅ Source-Driven UI Adaptation</strong> | <strong>✅ AI-Powered Insights</strong> | <strong>✅ Voice Assistant</strong> | <strong>✅ Real-time Analytics</strong></p>
-            <p style="font-size: 0.9em; color: #666;">Powered by Advanced AI • Real-world Actionable Insights • Cross-Channel Optimization</p>
-        </div>
-        """)
-
-    return app
+# The application lives in the installable ``channelpulse`` package
+# (pip install ".[ui]", then run ``channelpulse serve``); this module keeps the
+# notebook entry point and its names working.
+from channelpulse.dashboard import *  # noqa: F401,F403
+from channelpulse.dashboard import _run_blocking  # noqa: F401
+from channelpulse.workspace import INSIGHT_LATENCY_SECONDS  # noqa: F401
 
 # Main execution
 if __name__ == "__main__":
-    print("🚀 Initializing ChannelPulse AI...")
-    print("📊 Generating sample data...")
-    print("🤖 Loading AI models...")
-    print("✅ Dashboard ready!")
-
-    # Create and launch the Gradio app
-    app = create_gradio_app()
+    from channelpulse.cli import main
 
     # Launch with public URL for Colab
-    app.launch(
-        share=True,  # Creates public URL for sharing
-        server_name="0.0.0.0",  # Allow external connections
-        server_port=7860,  # Default Gradio port
-        show_error=True,
-        quiet=False
-    )
\ No newline at end of file
+    main(['serve', '--share'])
@@ -0,0 +1,9 @@
+import pytest
+
+from channelpulse.datagen import populate_store
+
+
+@pytest.fixture
+def store():
+    """Six channels with 120 days of generated metrics"""
+    return populate_store(6, 120, seed=7)
@@ -0,0 +1,19 @@
+"""Assertions shared by the tests"""
+
+import numpy as np
+
+from channelpulse.aggregates import SUMMARY_WINDOWS
+
+
+def assert_same_data(actual, expected):
+    """Same channels, rows and rolling sums, whatever the channel ids are"""
+    assert sorted(actual.channels) == sorted(expected.channels)
+    for window in SUMMARY_WINDOWS:
+        a, e = actual.summaries(window), expected.summaries(window)
+        order_a, order_e = np.argsort(a['channels']), np.argsort(e['channels'])
+        for part in ('current', 'previous'):
+            for column, values in e[part].items():
+                np.testing.assert_array_equal(a[part][column][order_a], values[order_e])
+    for channel in expected.channels:
+        for day in ('2024-01-01', '2024-02-15', '2024-04-29'):
+            np.testing.assert_array_equal(actual.lookup(channel, day), expected.lookup(channel, day))
@@ -0,0 +1,67 @@
+"""Rolling window sums kept by MetricsStore against brute-force sums"""
+
+import numpy as np
+import pytest
+
+from channelpulse.aggregates import SUMMARY_WINDOWS
+from channelpulse.store import METRICS, MetricsStore
+
+START = np.datetime64('2024-01-01', 'D')
+
+
+def brute_force(rows, window, offset):
+    """Column sums per channel over the trailing window ending ``offset`` days before its last row"""
+    sums = {}
+    for channel, days in rows.items():
+        end = max(days) - offset
+        sums[channel] = sum((values for day, values in days.items() if end - window < day <= end),
+                            np.zeros(len(METRICS), dtype=np.int64))
+    return sums
+
+
+def check(store, rows):
+    channels = sorted(rows)
+    ids = np.array([store.channel_id(channel) for channel in channels])
+    for window in SUMMARY_WINDOWS:
+        current, previous = store.rolling.totals(window, ids)
+        for cached, offset in ((current, 0), (previous, window)):
+            expected = brute_force(rows, window, offset)
+            for j, channel in enumerate(channels):
+                np.testing.assert_allclose(cached[:len(METRICS), j], expected[channel],
+                                           err_msg=f'{channel} window={window} offset={offset}')
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_writes_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    store = MetricsStore(start_date=START)
+    rows = {}
+    last = {}
+    for _ in range(400):
+        channel = f'channel_{rng.integers(4)}'
+        kind = rng.random()
+        if channel not in last or kind < 0.6:
+            day = last.get(channel, int(rng.integers(0, 30))) + 1    # next day
+        elif kind < 0.75:
+            day = last[channel] + int(rng.integers(2, 200))          # gap, sometimes past every window
+        elif kind < 0.9:
+            day = max(last[channel] - int(rng.integers(0, 60)), 0)   # correction of an earlier day
+        else:
+            day = max(min(rows[channel]) - int(rng.integers(1, 10)), 0)  # back-fill before the first row
+        values = rng.integers(0, 1000, len(METRICS))
+        store.append(channel, START + day, *values.tolist())
+        rows.setdefault(channel, {})[day] = values
+        last[channel] = max(rows[channel])
+    check(store, rows)
+
+
+def test_bulk_load_then_appends():
+    store = MetricsStore(start_date=START)
+    rows = {'a': {}}
+    values = np.arange(100 * len(METRICS)).reshape(len(METRICS), 100)
+    store.load_series('a', START + np.arange(100), *values)
+    rows['a'] = {day: values[:, day] for day in range(100)}
+    for day in (100, 101, 150, 40):
+        store.append('a', START + day, 1, 2, 3, 4)
+        rows['a'][day] = np.array([1, 2, 3, 4])
+    check(store, rows)
@@ -0,0 +1,97 @@
+"""DashboardAPI ETags and conditional requests, driven as a plain ASGI app"""
+
+import asyncio
+import json
+
+import pytest
+
+from channelpulse.api import DashboardAPI
+from channelpulse.workspace import ChannelPulseAI
+
+
+def request(app, path, query='', headers=()):
+    """Status, headers and body of one GET"""
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(),
+             'headers': [(name.encode(), value.encode()) for name, value in headers]}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, body = messages
+    return start['status'], {name.decode(): value.decode() for name, value in start['headers']}, body['body']
+
+
+@pytest.fixture(scope='module')
+def workspace():
+    return ChannelPulseAI()
+
+
+@pytest.fixture
+def app(workspace):
+    return DashboardAPI(workspace)
+
+
+@pytest.fixture
+def channel(workspace):
+    return workspace.store.channels[0]
+
+
+def test_etag_and_not_modified(app, channel):
+    status, headers, body = request(app, f'/v1/summary/{channel}')
+    assert status == 200
+    assert json.loads(body)['channel'] == channel
+    etag = headers['etag']
+
+    status, headers, body = request(app, f'/v1/summary/{channel}', headers=[('if-none-match', etag)])
+    assert status == 304
+    assert body == b''
+    assert headers['etag'] == etag
+    assert headers['content-length'] == '0'
+
+    status, _, _ = request(app, f'/v1/summary/{channel}', headers=[('if-none-match', f'"other", {etag}')])
+    assert status == 304
+    status, _, _ = request(app, f'/v1/summary/{channel}', headers=[('if-none-match', '*')])
+    assert status == 304
+    status, _, body = request(app, f'/v1/summary/{channel}', headers=[('if-none-match', '"other"')])
+    assert status == 200 and body
+
+
+def test_etag_depends_on_query_not_its_order(app, channel):
+    _, week, _ = request(app, f'/v1/series/{channel}', 'metric=revenue&days=7')
+    _, month, _ = request(app, f'/v1/series/{channel}', 'metric=revenue&days=30')
+    _, reordered, _ = request(app, f'/v1/series/{channel}', 'days=30&metric=revenue')
+    assert week['etag'] != month['etag']
+    assert month['etag'] == reordered['etag']
+
+
+def test_write_changes_etag(app, workspace, channel):
+    other = workspace.store.channels[1]
+    _, summary, _ = request(app, f'/v1/summary/{channel}')
+    _, other_summary, _ = request(app, f'/v1/summary/{other}')
+    _, comparison, _ = request(app, '/v1/comparison')
+
+    workspace.store.append(channel, workspace.store.end_date, 1, 1, 1, 1)
+
+    status, headers, body = request(app, f'/v1/summary/{channel}', headers=[('if-none-match', summary['etag'])])
+    assert status == 200 and body
+    assert headers['etag'] != summary['etag']
+    status, _, _ = request(app, '/v1/comparison', headers=[('if-none-match', comparison['etag'])])
+    assert status == 200
+    # Per-channel routes only change with their own channel
+    status, _, _ = request(app, f'/v1/summary/{other}', headers=[('if-none-match', other_summary['etag'])])
+    assert status == 304
+
+
+def test_errors(app):
+    status, _, body = request(app, '/v1/summary/no_such_channel')
+    assert status == 404
+    assert 'error' in json.loads(body)
+    status, _, _ = request(app, '/v1/nothing')
+    assert status == 404
+    status, _, _ = request(app, '/v1/summary/x', headers=[('if-none-match', '*')])
+    assert status == 404
@@ -0,0 +1,71 @@
+"""plan_budget bounds and budget conservation"""
+
+import numpy as np
+import pytest
+
+from channelpulse.optimizer import allocate, plan_budget
+
+
+def matrices(n_channels=8, n_days=60, seed=0):
+    """Spend that wanders around a per-channel level, with diminishing-returns revenue"""
+    rng = np.random.default_rng(seed)
+    level = rng.uniform(50, 2000, (n_channels, 1))
+    cost = level * rng.uniform(0.6, 1.4, (n_channels, n_days))
+    elasticity = rng.uniform(0.3, 0.9, (n_channels, 1))
+    revenue = rng.uniform(2, 8, (n_channels, 1)) * cost ** elasticity * rng.lognormal(0, 0.05, cost.shape)
+    cost[0] = 0  # an organic channel
+    traffic = cost / 1.5 + 100
+    return {'cost': cost, 'revenue': revenue, 'traffic': traffic, 'conversions': traffic * 0.03}
+
+
+def plan(data, **kwargs):
+    n = len(data['cost'])
+    return plan_budget([f'channel_{i}' for i in range(n)], data, np.zeros(n), np.zeros(n), **kwargs)
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('max_change', [0.1, 0.5, 1.0])
+def test_budget_neutral_plan_stays_within_bounds(seed, max_change):
+    result = plan(matrices(seed=seed), max_change=max_change)
+    assert result.organic == ['channel_0']
+    assert len(result.channels) == 7
+    assert result.recommended.sum() == pytest.approx(result.current.sum(), rel=1e-9)
+    tolerance = 1e-9 * result.current
+    assert (result.recommended >= result.current * (1 - max_change) - tolerance).all()
+    assert (result.recommended <= result.current * (1 + max_change) + tolerance).all()
+    # Budget-neutral reallocation never projects less revenue than today
+    assert result.daily_uplift >= -1e-6
+
+
+@pytest.mark.parametrize('factor', [0.6, 0.9, 1.2, 1.4])
+def test_explicit_budget_is_spent_exactly(factor):
+    data = matrices(seed=3)
+    current = plan(data).current
+    result = plan(data, budget=current.sum() * factor, max_change=0.5)
+    assert result.recommended.sum() == pytest.approx(current.sum() * factor, rel=1e-9)
+    assert (result.recommended >= current * 0.5 - 1e-9).all()
+    assert (result.recommended <= current * 1.5 + 1e-9).all()
+
+
+def test_budget_outside_bounds_is_rejected():
+    data = matrices(seed=1)
+    current = plan(data).current
+    with pytest.raises(ValueError):
+        plan(data, budget=current.sum() * 2, max_change=0.5)
+
+
+def test_no_revenue_leaves_spend_unchanged():
+    data = matrices(seed=2)
+    data['revenue'] = np.zeros_like(data['revenue'])
+    result = plan(data)
+    np.testing.assert_array_equal(result.recommended, result.current)
+    assert result.note
+    assert result.daily_uplift == 0
+
+
+def test_allocate_equalizes_marginal_roi_off_bounds():
+    scale = np.array([10.0, 20.0, 5.0])
+    elasticity = np.array([0.5, 0.5, 0.5])
+    spend, marginal = allocate(scale, elasticity, 300.0, np.zeros(3), np.full(3, 1000.0))
+    assert spend.sum() == pytest.approx(300.0)
+    np.testing.assert_allclose(scale * elasticity * spend ** -0.5, marginal, rtol=1e-6)
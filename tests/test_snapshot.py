@@ -0,0 +1,94 @@
+"""Snapshot save/load round trips and the versioned directory layout"""
+
+import os
+
+import numpy as np
+import pytest
+
+from channelpulse.catalog import ChannelIds
+from channelpulse.snapshot import (POINTER_FILE, VERSION_PREFIX, load_snapshot, resolve_snapshot,
+                                   save_snapshot, snapshot_channels, snapshot_exists)
+
+from helpers import assert_same_data
+
+
+def versions(path):
+    return sorted(name for name in os.listdir(path) if name.startswith(VERSION_PREFIX))
+
+
+@pytest.mark.parametrize('mmap_mode', ['c', 'r', None])
+def test_round_trip(store, tmp_path, mmap_mode):
+    assert save_snapshot(store, str(tmp_path))
+    loaded = load_snapshot(str(tmp_path), mmap_mode=mmap_mode)
+    assert loaded.channels == store.channels
+    assert loaded.start_date == store.start_date
+    assert_same_data(loaded, store)
+    if mmap_mode is not None:
+        assert isinstance(loaded._values, np.memmap)
+
+
+def test_round_trip_keeps_accepting_writes(store, tmp_path):
+    save_snapshot(store, str(tmp_path))
+    loaded = load_snapshot(str(tmp_path))
+    for target in (store, loaded):
+        target.append('new_channel', '2024-03-01', 5, 1, 50, 20)
+        target.append(store.channels[0], '2024-05-10', 7, 2, 70, 30)
+    assert_same_data(loaded, store)
+    # Copy-on-write maps never write back to the files
+    assert 'new_channel' not in snapshot_channels(str(tmp_path))
+
+
+def test_shared_ids_numbered_from_snapshot(store, tmp_path):
+    save_snapshot(store, str(tmp_path))
+    ids = ChannelIds(snapshot_channels(str(tmp_path)) + ['catalog_only'])
+    loaded = load_snapshot(str(tmp_path), ids=ids)
+    assert isinstance(loaded._values, np.memmap)
+    assert_same_data(loaded, store)
+
+
+def test_save_publishes_a_new_version(store, tmp_path):
+    path = str(tmp_path)
+    assert not snapshot_exists(path)
+    save_snapshot(store, path)
+    first = resolve_snapshot(path)
+    assert open(os.path.join(path, POINTER_FILE)).read() == os.path.basename(first)
+
+    store.append(store.channels[0], '2024-04-30', 1, 1, 1, 1)
+    save_snapshot(store, path)
+    save_snapshot(store, path)
+    # The current version and the one before it are kept for readers still opening it
+    assert len(versions(path)) == 2
+    assert resolve_snapshot(path) != first
+    assert_same_data(load_snapshot(path), store)
+
+
+def test_save_without_replace_keeps_existing_snapshot(store, tmp_path):
+    path = str(tmp_path)
+    assert save_snapshot(store, path, replace=False)
+    published = resolve_snapshot(path)
+    store.append(store.channels[0], '2024-04-30', 9, 9, 9, 9)
+    assert not save_snapshot(store, path, replace=False)
+    assert resolve_snapshot(path) == published
+    assert versions(path) == [os.path.basename(published)]
+
+
+def test_reads_and_replaces_unversioned_layout(store, tmp_path):
+    path = str(tmp_path)
+    save_snapshot(store, path)
+    # Move the version's files to the top level, as older releases wrote them
+    version = resolve_snapshot(path)
+    for name in os.listdir(version):
+        os.replace(os.path.join(version, name), os.path.join(path, name))
+    os.rmdir(version)
+    os.remove(os.path.join(path, POINTER_FILE))
+
+    assert resolve_snapshot(path) == path
+    assert_same_data(load_snapshot(path), store)
+    save_snapshot(store, path)
+    assert not os.path.exists(os.path.join(path, 'meta.json'))
+    assert_same_data(load_snapshot(path), store)
+
+
+def test_missing_snapshot(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_snapshot(str(tmp_path / 'absent'))
@@ -0,0 +1,53 @@
+"""MetricsStore.from_state with private and shared channel id dictionaries"""
+
+import numpy as np
+
+from channelpulse.catalog import ChannelIds
+from channelpulse.store import METRICS, MetricsStore
+
+from helpers import assert_same_data
+
+
+def copy_state(store):
+    meta, arrays = store.export_state()
+    return meta, {name: np.array(array) for name, array in arrays.items()}
+
+
+def test_from_state_in_order_reuses_arrays(store):
+    meta, arrays = copy_state(store)
+    restored = MetricsStore.from_state(meta, arrays)
+    assert restored._values is arrays['values']
+    assert_same_data(restored, store)
+
+
+def test_from_state_with_shared_ids_in_saved_order(store):
+    meta, arrays = copy_state(store)
+    ids = ChannelIds(meta['channels'] + ['extra'])
+    restored = MetricsStore.from_state(meta, arrays, ids=ids)
+    assert restored.channel_ids is ids
+    assert restored._values is arrays['values']
+    assert_same_data(restored, store)
+
+
+def test_from_state_reorders_to_shared_ids(store):
+    meta, arrays = copy_state(store)
+    # Other components numbered some keys first, and in reverse
+    ids = ChannelIds(['other_a'] + meta['channels'][::-1][:3] + ['other_b'])
+    restored = MetricsStore.from_state(meta, arrays, ids=ids)
+    assert [ids.get(key) for key in restored.channels] == sorted(ids.get(key) for key in meta['channels'])
+    assert_same_data(restored, store)
+
+    # The restored store keeps accepting writes under the shared numbering
+    channel = meta['channels'][0]
+    restored.append(channel, '2024-04-30', 1, 2, 3, 4)
+    store.append(channel, '2024-04-30', 1, 2, 3, 4)
+    assert_same_data(restored, store)
+    assert restored.channel_id(channel) == ids.get(channel)
+
+
+def test_from_state_with_other_windows_rebuilds_rolling_sums(store):
+    meta, arrays = copy_state(store)
+    restored = MetricsStore.from_state(meta, arrays, windows=(3, 7))
+    assert restored.rolling.windows == (3, 7)
+    expected = store.window_totals(3, 0, np.arange(len(store.channels)))[0]
+    np.testing.assert_array_equal(restored.summaries(3)['current']['revenue'], expected[METRICS.index('revenue')])